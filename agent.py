@@ -1,6 +1,21 @@
-from graph import WisdomGraph, SpaceType, WisdomNode
+from threading import Lock
+from graph import WisdomGraph, SpaceType, WisdomNode, support_keywords
+from ingest import PerceptionIngestor, IngestStats
+from workflow import aload_image, resolve
+from vision import (as_image_batch, analyze_batch, concat_analyses, color_histograms,
+                    pattern_statistics, style_features, fold_colors, fold_statistics)
 from env import Env
 
+# Perception nodes refreshed by each image
+VISION_NODES = ("vision_colors", "vision_patterns", "vision_style")
+
+# Classroom observation keys and the perception node each one updates
+LEARNING_METRICS = {
+    "student_metrics": "student_engagement",
+    "environment_metrics": "environment_state",
+    "progress_metrics": "learning_progress",
+}
+
 
 class Agent:
     # core variables
@@ -53,22 +68,61 @@ class Agent:
         self.history_provider = "Suanfamama"
         self.history = 0
 
+    # Frozen template wisdom per (agent class, storage backend)
+    _wisdom_templates = {}
+    _wisdom_templates_lock = Lock()
+
+    @classmethod
+    def base_wisdom(cls, storage: str = "networkx") -> WisdomGraph:
+        """Return the class's default wisdom graph, built once and frozen"""
+        key = (cls, storage)
+        wisdom = Agent._wisdom_templates.get(key)
+        if wisdom is None:
+            with Agent._wisdom_templates_lock:
+                wisdom = Agent._wisdom_templates.get(key)
+                if wisdom is None:
+                    template = cls.__new__(cls)
+                    template.wisdom = WisdomGraph(storage=storage)
+                    template._init_wisdom_spaces()
+                    wisdom = template.wisdom.freeze()
+                    Agent._wisdom_templates[key] = wisdom
+        return wisdom
+
+    def _init_wisdom_spaces(self):
+        """Populate the wisdom graph spaces; subclasses provide the _init_* hooks"""
+        self._init_perception_space()
+        self._init_planning_space()
+        self._init_reasoning_space()
+        self._init_action_space()
+
+    def ingest_perception(self, events, batch_size: int = 256) -> IngestStats:
+        """Apply a stream of PerceptionEvents to the perception space"""
+        return PerceptionIngestor(self.wisdom, batch_size=batch_size).ingest(events)
+
+    async def aingest_perception(self, events, batch_size: int = 256,
+                                 max_pending: int = 4096) -> IngestStats:
+        """Async counterpart of ingest_perception with a bounded event queue"""
+        ingestor = PerceptionIngestor(self.wisdom, batch_size=batch_size,
+                                      max_pending=max_pending)
+        return await ingestor.aingest(events)
+
 
 class FashionAgent(Agent):
-    def __init__(self):
+    def __init__(self, storage: str = "networkx", shared_wisdom: bool = True):
         super().__init__()
-        self.wisdom = WisdomGraph()
         self.core_task = "being_fashion_and_earn_fortune"
 
         # Add team collaboration attributes
         self.team_role = None
         self.current_phase = None
 
-        # Initialize the wisdom graph spaces
-        self._init_perception_space()
-        self._init_planning_space()
-        self._init_reasoning_space()
-        self._init_action_space()
+        # Initialize the wisdom graph spaces, sharing the class template
+        # copy-on-write unless a fully private graph is requested
+        if shared_wisdom:
+            self.wisdom = self.base_wisdom(storage).fork()
+        else:
+            self.wisdom = WisdomGraph(storage=storage)
+            self._init_wisdom_spaces()
 
     def _init_perception_space(self):
         """Initialize perception nodes for fashion vision"""
@@ -120,6 +174,10 @@ class FashionAgent(Agent):
             "customer_analysis", data=customer_node)
         self.wisdom.perception_graph.customer_nodes.append("customer_analysis")
 
+        # Visual perception nodes: running averages over processed images
+        for node_id in ("vision_colors", "vision_patterns", "vision_style"):
+            self.wisdom.add_perception_node(node_id, features={"images": 0}, level=1)
+
     def _init_planning_space(self):
         """Initialize planning hierarchy for fashion tasks"""
         self.wisdom.add_planning_node(
@@ -157,9 +215,9 @@ class FashionAgent(Agent):
         self.wisdom.add_reasoning_node(
             "reason_aesthetic_value",
             variables={
-                "color_harmony": 0.0,
-                "pattern_balance": 0.0,
-                "composition_score": 0.0
+                "color_harmony": None,
+                "pattern_balance": None,
+                "composition_score": None
             },
             probability=0.8,
             level=1
@@ -168,9 +226,9 @@ class FashionAgent(Agent):
         self.wisdom.add_reasoning_node(
             "reason_trend_relevance",
             variables={
-                "trend_alignment": 0.0,
-                "seasonal_fit": 0.0,
-                "audience_appeal": 0.0
+                "trend_alignment": None,
+                "seasonal_fit": None,
+                "audience_appeal": None
             },
             probability=0.7,
             level=2
@@ -179,9 +237,9 @@ class FashionAgent(Agent):
         self.wisdom.add_reasoning_node(
             "reason_sharing_strategy",
             variables={
-                "platform_suitability": 0.0,
-                "timing_optimization": 0.0,
-                "audience_engagement": 0.0
+                "platform_suitability": None,
+                "timing_optimization": None,
+                "audience_engagement": None
             },
             probability=0.9,
             level=3
@@ -227,35 +285,107 @@ class FashionAgent(Agent):
 
         return result
 
+    async def aprocess_fashion_item(self, image_data):
+        """Async perception pass over one fashion item.
+
+        ``image_data`` may also be a path, an awaitable or a loader callable;
+        loading runs off the event loop, while the graph update runs inline
+        so one agent's graph is never touched by two threads. Only the
+        perception stage runs: the planning, reasoning and action stages of
+        process_fashion_item have no implementation yet. Returns the updated
+        vision features.
+        """
+        image_data = await aload_image(image_data)
+        self._update_visual_perception(image_data)
+        return {node_id: dict(self._vision_features(node_id))
+                for node_id in VISION_NODES}
+
     def _update_visual_perception(self, image_data):
         """Update perception nodes with new image data"""
         # Update color perception
-        self.wisdom.perception_graph.nodes["vision_colors"]["data"].features.update(
+        self.wisdom.update_node_features(
+            SpaceType.PERCEPTION, "vision_colors",
             self._analyze_colors(image_data)
         )
 
         # Update pattern perception
-        self.wisdom.perception_graph.nodes["vision_patterns"]["data"].features.update(
+        self.wisdom.update_node_features(
+            SpaceType.PERCEPTION, "vision_patterns",
             self._analyze_patterns(image_data)
         )
 
         # Update style perception
-        self.wisdom.perception_graph.nodes["vision_style"]["data"].features.update(
+        self.wisdom.update_node_features(
+            SpaceType.PERCEPTION, "vision_style",
             self._analyze_style(image_data)
         )
 
+    def process_fashion_items(self, images, chunk_size: int = 1024):
+        """Update visual perception from a stacked batch of images at once.
+
+        ``images`` is an ``(N, H, W, 3)`` array. Features are computed with
+        vectorized passes over chunks of ``chunk_size`` images and folded
+        into the vision nodes with one update per node. Returns the
+        per-image colors, pattern statistics and style features.
+        """
+        batch = as_image_batch(images)
+        if not len(batch):
+            return analyze_batch(batch)
+        analysis = concat_analyses([
+            analyze_batch(batch[start:start + chunk_size])
+            for start in range(0, len(batch), chunk_size)
+        ])
+
+        self.wisdom.update_node_features(
+            SpaceType.PERCEPTION, "vision_colors",
+            fold_colors(self._vision_features("vision_colors"), analysis["colors"])
+        )
+        self.wisdom.update_node_features(
+            SpaceType.PERCEPTION, "vision_patterns",
+            fold_statistics(self._vision_features("vision_patterns"), analysis["patterns"])
+        )
+        self.wisdom.update_node_features(
+            SpaceType.PERCEPTION, "vision_style",
+            fold_statistics(self._vision_features("vision_style"), analysis["style"])
+        )
+        return analysis
+
+    def _vision_features(self, node_id):
+        # Pruning can drop a vision node; its running averages start over
+        if node_id not in self.wisdom.perception_graph:
+            self.wisdom.add_perception_node(node_id, features={"images": 0}, level=1)
+        return self.wisdom.perception_graph.nodes[node_id]["data"].features
+
+    def _analyze_colors(self, image_data):
+        """Color histogram features folded with the images seen so far"""
+        return fold_colors(self._vision_features("vision_colors"),
+                           color_histograms(as_image_batch(image_data)))
+
+    def _analyze_patterns(self, image_data):
+        """Edge and texture statistics folded with the images seen so far"""
+        return fold_statistics(self._vision_features("vision_patterns"),
+                               pattern_statistics(as_image_batch(image_data)))
+
+    def _analyze_style(self, image_data):
+        """Brightness, saturation, contrast and warmth folded with the images seen so far"""
+        return fold_statistics(self._vision_features("vision_style"),
+                               style_features(as_image_batch(image_data)))
+
     def _reason_about_actions(self, composition_plan, style_plan, sharing_plan):
         """Combine different aspects to make final decision"""
         # Update reasoning nodes with new information
-        self.wisdom.reasoning_graph.nodes["reason_aesthetic_value"]["data"].variables.update(
+        self.wisdom.update_node_features(
+            SpaceType.REASONING, "reason_aesthetic_value",
             self._evaluate_aesthetics(composition_plan)
         )
 
-        self.wisdom.reasoning_graph.nodes["reason_trend_relevance"]["data"].variables.update(
+        self.wisdom.update_node_features(
+            SpaceType.REASONING, "reason_trend_relevance",
             self._evaluate_trends(style_plan)
         )
 
-        self.wisdom.reasoning_graph.nodes["reason_sharing_strategy"]["data"].variables.update(
+        self.wisdom.update_node_features(
+            SpaceType.REASONING, "reason_sharing_strategy",
             self._evaluate_sharing(sharing_plan)
         )
 
@@ -316,12 +446,7 @@ class FashionAgent(Agent):
 
     def _get_relevant_planning_nodes(self, task):
         """Get planning nodes relevant to the task"""
-        relevant_nodes = []
-        for node_id in self.wisdom.planning_graph.nodes():
-            node_data = self.wisdom.planning_graph.nodes[node_id]["data"]
-            if task in node_data.features.get("subtasks", []):
-                relevant_nodes.append(node_data)
-        return relevant_nodes
+        return self.wisdom.planning_graph.nodes_for_subtask(task)
 
     def _reason_about_task(self, task, plan_nodes):
         """Use reasoning to develop task strategy"""
@@ -345,13 +470,9 @@ class FashionAgent(Agent):
 
     def _get_support_capabilities(self, task):
         """Identify relevant support capabilities for a task"""
-        capabilities = []
-        # Query wisdom graph for relevant capabilities
-        for node_id in self.wisdom.action_graph.nodes():
-            node_data = self.wisdom.action_graph.nodes[node_id]["data"]
-            if self._is_relevant_for_support(task, node_data):
-                capabilities.append(node_data)
-        return capabilities
+        # Query the action space keyword index for relevant capabilities
+        return self.wisdom.action_graph.nodes_matching_keywords(
+            set(task.split("_")))
 
     def _plan_support_actions(self, task, capabilities):
         """Plan specific support actions"""
@@ -370,8 +491,7 @@ class FashionAgent(Agent):
     def _is_relevant_for_support(self, task, node_data):
         """Check if a capability is relevant for supporting a task"""
         task_keywords = set(task.split("_"))
-        capability_keywords = set(str(node_data.features).split("_"))
-        return bool(task_keywords & capability_keywords)
+        return bool(task_keywords & support_keywords(node_data.features))
 
     def _create_support_action(self, task, capability):
         """Create a specific support action based on capability"""
@@ -401,16 +521,17 @@ class FashionAgent(Agent):
 
 
 class EducationAgent(Agent):
-    def __init__(self):
+    def __init__(self, storage: str = "networkx", shared_wisdom: bool = True):
         super().__init__()
-        self.wisdom = WisdomGraph()
         self.core_task = "being_inspired_and_create_wisdom"
 
-        # Initialize the wisdom graph spaces
-        self._init_perception_space()
-        self._init_planning_space()
-        self._init_reasoning_space()
-        self._init_action_space()
+        # Initialize the wisdom graph spaces, sharing the class template
+        # copy-on-write unless a fully private graph is requested
+        if shared_wisdom:
+            self.wisdom = self.base_wisdom(storage).fork()
+        else:
+            self.wisdom = WisdomGraph(storage=storage)
+            self._init_wisdom_spaces()
 
     def _init_perception_space(self):
         """Initialize perception nodes for education"""
@@ -485,9 +606,9 @@ class EducationAgent(Agent):
         self.wisdom.add_reasoning_node(
             "learning_effectiveness",
             variables={
-                "content_comprehension": 0.0,
-                "skill_application": 0.0,
-                "knowledge_integration": 0.0
+                "content_comprehension": None,
+                "skill_application": None,
+                "knowledge_integration": None
             },
             probability=0.8,
             level=1
@@ -496,9 +617,9 @@ class EducationAgent(Agent):
         self.wisdom.add_reasoning_node(
             "student_needs",
             variables={
-                "learning_style_match": 0.0,
-                "difficulty_adjustment": 0.0,
-                "support_requirements": 0.0
+                "learning_style_match": None,
+                "difficulty_adjustment": None,
+                "support_requirements": None
             },
             probability=0.7,
             level=2
@@ -507,9 +628,9 @@ class EducationAgent(Agent):
         self.wisdom.add_reasoning_node(
             "environmental_optimization",
             variables={
-                "space_configuration": 0.0,
-                "resource_utilization": 0.0,
-                "ambient_conditions": 0.0
+                "space_configuration": None,
+                "resource_utilization": None,
+                "ambient_conditions": None
             },
             probability=0.9,
             level=1
@@ -558,36 +679,74 @@ class EducationAgent(Agent):
 
         return result
 
+    async def afacilitate_learning(self, classroom_data):
+        """Async perception pass over one classroom observation.
+
+        ``classroom_data`` may also be an awaitable or a loader callable,
+        e.g. a classroom environment fetch, which runs off the event loop.
+        Only the perception stage runs: the planning, reasoning and action
+        stages of facilitate_learning have no implementation yet. Returns
+        the features of the perception nodes the observation updated.
+        """
+        classroom_data = await resolve(classroom_data)
+        self._update_learning_perception(classroom_data)
+        graph = self.wisdom.perception_graph
+        return {node_id: dict(graph.nodes[node_id]["data"].features)
+                for metrics, node_id in LEARNING_METRICS.items()
+                if metrics in classroom_data}
+
     def _update_learning_perception(self, classroom_data):
         """Update perception nodes with classroom data"""
         if "student_metrics" in classroom_data:
-            self.wisdom.perception_graph.nodes["student_engagement"]["data"].features.update(
+            self.wisdom.update_node_features(
+                SpaceType.PERCEPTION, "student_engagement",
                 self._analyze_engagement(classroom_data["student_metrics"])
             )
 
         if "environment_metrics" in classroom_data:
-            self.wisdom.perception_graph.nodes["environment_state"]["data"].features.update(
+            self.wisdom.update_node_features(
+                SpaceType.PERCEPTION, "environment_state",
                 self._analyze_environment(
                     classroom_data["environment_metrics"])
             )
 
         if "progress_metrics" in classroom_data:
-            self.wisdom.perception_graph.nodes["learning_progress"]["data"].features.update(
+            self.wisdom.update_node_features(
+                SpaceType.PERCEPTION, "learning_progress",
                 self._analyze_progress(classroom_data["progress_metrics"])
             )
 
+    def _analyze_engagement(self, metrics):
+        """Engagement readings the student_engagement node tracks"""
+        return self._tracked_metrics("student_engagement", metrics)
+
+    def _analyze_environment(self, metrics):
+        """Room readings the environment_state node tracks"""
+        return self._tracked_metrics("environment_state", metrics)
+
+    def _analyze_progress(self, metrics):
+        """Progress readings the learning_progress node tracks"""
+        return self._tracked_metrics("learning_progress", metrics)
+
+    def _tracked_metrics(self, node_id, metrics):
+        features = self.wisdom.perception_graph.nodes[node_id]["data"].features
+        return {key: value for key, value in metrics.items() if key in features}
+
     def _reason_about_actions(self, lesson_plan, engagement_plan, assessment_plan):
         """Combine different aspects to make final decision"""
         # Update reasoning nodes with new information
-        self.wisdom.reasoning_graph.nodes["learning_effectiveness"]["data"].variables.update(
+        self.wisdom.update_node_features(
+            SpaceType.REASONING, "learning_effectiveness",
             self._evaluate_effectiveness(lesson_plan)
         )
 
-        self.wisdom.reasoning_graph.nodes["student_needs"]["data"].variables.update(
+        self.wisdom.update_node_features(
+            SpaceType.REASONING, "student_needs",
             self._evaluate_needs(engagement_plan)
         )
 
-        self.wisdom.reasoning_graph.nodes["environmental_optimization"]["data"].variables.update(
+        self.wisdom.update_node_features(
+            SpaceType.REASONING, "environmental_optimization",
             self._evaluate_environment(assessment_plan)
         )
 
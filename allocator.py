@@ -0,0 +1,129 @@
+"""Capacity-constrained resource allocation for planning tasks.
+
+Every task requests a vector of resources (CPU cores, memory, bandwidth,
+headcount) and is worth a throughput value. ``greedy_knapsack`` admits
+tasks into a shared ``ResourcePool`` in order of value per unit of the
+scarcest resource they use, the classic greedy for the multidimensional
+knapsack. Admission works on whole NumPy arrays: each round admits the
+longest prefix of candidates whose cumulative demand fits, drops the
+candidates that no longer fit at all and repeats, so a planning call
+with thousands of tasks takes a few array passes instead of a Python
+loop per task.
+"""
+from typing import Dict, List, Any, Sequence
+from dataclasses import dataclass, astuple
+import math
+import numpy as np
+
+
+RESOURCES = ("cpu_cores", "memory", "bandwidth", "headcount")
+
+# Relative slack when comparing cumulative demand with capacity
+_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class ResourcePool:
+    """Global capacity shared by the tasks of one plan; inf means unlimited"""
+    cpu_cores: float = math.inf
+    memory: float = math.inf  # GB
+    bandwidth: float = math.inf  # Mbps
+    headcount: float = math.inf
+
+    def __post_init__(self):
+        if any(value < 0 for value in astuple(self)):
+            raise ValueError("Resource capacities must be non-negative")
+
+    def capacity(self) -> np.ndarray:
+        return np.array(astuple(self), dtype=np.float64)
+
+
+def demand_matrix(human_resources: Sequence[Dict[str, float]],
+                  material_resources: Sequence[Dict[str, float]]) -> np.ndarray:
+    """``(N, len(RESOURCES))`` demands from per-task resource estimates"""
+    demands = np.zeros((len(human_resources), len(RESOURCES)), dtype=np.float64)
+    for row, (human, material) in enumerate(zip(human_resources, material_resources)):
+        demands[row] = (material.get("computing_resources", 0),
+                        material.get("memory", 0),
+                        material.get("bandwidth", 0),
+                        sum(human.values()))
+    return demands
+
+
+def greedy_knapsack(demands: np.ndarray, values: np.ndarray,
+                    capacity: np.ndarray) -> np.ndarray:
+    """Boolean mask of tasks admitted within ``capacity``.
+
+    Tasks are ranked by value over their largest share of any finite
+    capacity (ties keep input order) and admitted greedily; a task that
+    does not fit is skipped and smaller ones behind it still get in. The
+    single most valuable task that fits wins if it beats the whole greedy set.
+    """
+    capacity = np.asarray(capacity, dtype=np.float64)
+    demands = np.asarray(demands, dtype=np.float64).reshape(len(values), len(capacity))
+    values = np.asarray(values, dtype=np.float64)
+    count = len(values)
+    admitted = np.zeros(count, dtype=bool)
+    if not count:
+        return admitted
+
+    finite = np.isfinite(capacity)
+    share = np.zeros(demands.shape, dtype=np.float64)
+    np.divide(demands, capacity, out=share, where=finite & (capacity > 0))
+    # Positive demand on an exhausted resource can never be met
+    share[(demands > 0) & finite & (capacity <= 0)] = np.inf
+    size = share.max(axis=1)
+    density = np.divide(values, size, out=np.full(count, np.inf), where=size > 0)
+    order = np.lexsort((np.arange(count), -density))
+
+    slack = _TOLERANCE * np.where(finite, np.maximum(capacity, 1.0), 0.0)
+    remaining = capacity.copy()
+    candidates = order
+    while candidates.size:
+        candidates = candidates[(demands[candidates] <= remaining + slack).all(axis=1)]
+        if not candidates.size:
+            break
+        used = np.cumsum(demands[candidates], axis=0)
+        fits = (used <= remaining + slack).all(axis=1)
+        # The first candidate always fits, so every round admits something
+        stop = len(fits) if fits.all() else int(np.argmin(fits))
+        admitted[candidates[:stop]] = True
+        remaining = remaining - used[stop - 1]
+        candidates = candidates[stop:]
+
+    # Guard against the greedy worst case: one valuable task crowded out by
+    # many dense small ones
+    feasible = (demands <= capacity + slack).all(axis=1)
+    if feasible.any():
+        best = int(np.argmax(np.where(feasible, values, -np.inf)))
+        if values[best] > values[admitted].sum():
+            admitted[:] = False
+            admitted[best] = True
+    return admitted
+
+
+def allocate(demands: np.ndarray, values: np.ndarray,
+             pool: ResourcePool = None) -> Dict[str, Any]:
+    """Admit tasks into ``pool`` and report their allocations and utilization"""
+    demands = np.asarray(demands, dtype=np.float64).reshape(len(values), len(RESOURCES))
+    if pool is None:
+        admitted = np.ones(len(values), dtype=bool)
+        capacity = np.full(len(RESOURCES), np.inf)
+    else:
+        capacity = pool.capacity()
+        admitted = greedy_knapsack(demands, values, capacity)
+    allocations = demands * admitted[:, None]
+    used = allocations.sum(axis=0)
+    return {
+        "admitted": admitted,
+        "allocations": allocations,
+        "throughput": float(np.asarray(values, dtype=np.float64)[admitted].sum()),
+        "utilization": dict(zip(RESOURCES, np.divide(
+            used, capacity, out=np.zeros_like(used),
+            where=np.isfinite(capacity) & (capacity > 0)).tolist())),
+    }
+
+
+def allocation_rows(allocations: np.ndarray) -> List[Dict[str, float]]:
+    """Per-task allocation dicts keyed by resource name"""
+    return [dict(zip(RESOURCES, row)) for row in allocations.tolist()]
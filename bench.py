@@ -0,0 +1,457 @@
+"""Benchmarks for the wisdom graph and the agent pipeline.
+
+Usage::
+
+    python bench.py                                # full sweep, 10 to 1M nodes
+    python bench.py --sizes 10,1000 --output base.json
+    python bench.py --sizes 10,1000 --compare base.json
+
+Each benchmark runs ``--repeat`` times per storage backend and graph size;
+setup (building the graph under test) is excluded from the timings.
+Results are written as JSON together with the commit and library versions
+they were measured with, and ``--compare`` reports the change in median
+time against an earlier results file, exiting with status 1 when any
+benchmark got slower than ``--threshold``.
+"""
+from typing import Dict, List, Tuple, Any, Callable, Optional
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import networkx as nx
+import numpy as np
+
+from agent import FashionAgent, EducationAgent
+from graph import WisdomGraph, SpaceType, STORAGE_BACKENDS
+from inference import BeliefEngine
+
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+EDGES_PER_NODE = 4
+TASKS = ["market_research", "trend_analysis", "supplier_negotiation"]
+# Action fixtures wrap a task in "support_..._team" so the task's words are
+# whole support_keywords tokens and capability lookup finds matches; the
+# rest of support_phase needs the priority, resource and timing helpers,
+# which do not exist yet, so only the lookup is benchmarked
+# plan_phase tasks must not match a planning node's subtasks: evaluating a
+# matched node calls _evaluate_task_approach, which does not exist yet
+PLAN_TASKS = ["market_research", "photo_shooting", "supplier_negotiation"]
+
+# Perception data without trend insights: the trend adaptation of
+# create_strategy calls builders that do not exist yet
+MARKET_PERCEPTION = {
+    "market_insights": {
+        "market_size": 1_000_000,
+        "competition_level": 0.7,
+        "growth_potential": 0.3,
+        "market_trends": ["sustainable", "digital_first"]
+    }
+}
+
+
+# ----------------------------------------------------------------------
+# Graph fixtures
+# ----------------------------------------------------------------------
+def populate(wisdom: WisdomGraph, size: int, seed: int = 0) -> WisdomGraph:
+    """Add ``size`` nodes with random edges to every space of ``wisdom``"""
+    rng = random.Random(seed)
+    kinds = ("market", "trend", "customer")
+    for i in range(size):
+        wisdom.add_perception_node(
+            f"perception_{i}",
+            {"signal": rng.random(), "weight": rng.random()},
+            level=1, registry=kinds[i % 3])
+        wisdom.add_planning_node(
+            f"planning_{i}",
+            {"priority": i % 5, "efficiency": rng.random(),
+             "subtasks": [f"subtask_{rng.randrange(size)}"]},
+            level=1)
+        wisdom.add_reasoning_node(
+            f"reasoning_{i}", {"belief": rng.random()},
+            probability=rng.random(), level=1)
+        wisdom.add_action_node(
+            f"action_{i}", {"capability": f"support_{rng.choice(TASKS)}_team"},
+            reward=rng.random(), level=1)
+    for space_type in SpaceType:
+        prefix = space_type.value
+        for _ in range(size * EDGES_PER_NODE if size > 1 else 0):
+            wisdom.add_edge_within_space(
+                space_type, f"{prefix}_{rng.randrange(size)}",
+                f"{prefix}_{rng.randrange(size)}", weight=rng.random())
+    return wisdom
+
+
+def fashion_agent(storage: str, size: int) -> FashionAgent:
+    agent = FashionAgent(storage=storage, shared_wisdom=False)
+    populate(agent.wisdom, size)
+    return agent
+
+
+# ----------------------------------------------------------------------
+# Benchmarks: each returns (setup, run, operations per run); ``run``
+# receives whatever ``setup`` returned
+# ----------------------------------------------------------------------
+Benchmark = Callable[[str, int], Tuple[Callable[[], Any], Callable[[Any], Any], int]]
+
+
+def bench_fashion_agent(storage, size):
+    return (lambda: None,
+            lambda _: [FashionAgent(storage=storage) for _ in range(size)], size)
+
+
+def bench_fashion_agent_private(storage, size):
+    return (lambda: None,
+            lambda _: [FashionAgent(storage=storage, shared_wisdom=False)
+                       for _ in range(size)], size)
+
+
+def bench_education_agent(storage, size):
+    return (lambda: None,
+            lambda _: [EducationAgent(storage=storage) for _ in range(size)], size)
+
+
+def bench_add_nodes(storage, size):
+    def run(wisdom):
+        for i in range(size):
+            wisdom.add_perception_node(f"p{i}", {"signal": 0.5}, level=1)
+            wisdom.add_planning_node(f"t{i}", {"subtasks": ["s"]}, level=1)
+            wisdom.add_reasoning_node(f"r{i}", {}, probability=0.5, level=1)
+            wisdom.add_action_node(f"a{i}", {"capability": "x"}, reward=0.5, level=1)
+    return lambda: WisdomGraph(storage=storage), run, 4 * size
+
+
+def _bench_prune(method: str, threshold: float):
+    def bench(storage, size):
+        def setup():
+            return populate(WisdomGraph(storage=storage), size)
+        return setup, lambda wisdom: getattr(wisdom, method)(threshold), size
+    return bench
+
+
+def bench_gather_insights_cold(storage, size):
+    def setup():
+        graph = populate(WisdomGraph(storage=storage), size).perception_graph
+        graph._insights.clear()
+        graph._insight_views.clear()
+        return graph
+    return setup, lambda graph: graph.gather_insights(), size
+
+
+def bench_gather_insights_warm(storage, size):
+    def setup():
+        graph = populate(WisdomGraph(storage=storage), size).perception_graph
+        graph.gather_insights()
+        return graph
+    return setup, lambda graph: graph.gather_insights(), 1
+
+
+def bench_create_strategy_cold(storage, size):
+    tasks = [f"task_{i}" for i in range(size)]
+
+    def setup():
+        graph = WisdomGraph(storage=storage).planning_graph
+        graph.strategy_cache.clear()
+        return graph
+    return setup, lambda graph: graph.create_strategy(MARKET_PERCEPTION, tasks).materialize(), size
+
+
+def bench_create_strategy_warm(storage, size):
+    tasks = [f"task_{i}" for i in range(size)]
+
+    def setup():
+        graph = WisdomGraph(storage=storage).planning_graph
+        graph.create_strategy(MARKET_PERCEPTION, tasks).materialize()
+        return graph
+    return setup, lambda graph: graph.create_strategy(MARKET_PERCEPTION, tasks).materialize(), 1
+
+
+def bench_create_strategy_lazy(storage, size):
+    tasks = [f"task_{i}" for i in range(size)]
+
+    def setup():
+        graph = WisdomGraph(storage=storage).planning_graph
+        graph.strategy_cache.clear()
+        return graph
+
+    def run(graph):
+        # Consumer that only reads the pricing strategy
+        strategy = graph.create_strategy(MARKET_PERCEPTION, tasks)
+        return strategy["market_adaptation"]["pricing_strategy"]
+    return setup, run, 1
+
+
+def bench_create_timeline(storage, size):
+    def setup():
+        wisdom = WisdomGraph(storage=storage)
+        rng = random.Random(0)
+        tasks = [f"task_{i}" for i in range(size)]
+        for i in range(1, size):
+            wisdom.add_task_prerequisite(tasks[i], tasks[rng.randrange(i)])
+        return wisdom.planning_graph, tasks
+    return setup, lambda state: state[0]._create_timeline(state[1], workers=8), size
+
+
+def bench_plan_phase(storage, size):
+    return (lambda: fashion_agent(storage, size),
+            lambda agent: agent.plan_phase(PLAN_TASKS), len(PLAN_TASKS))
+
+
+def bench_support_capabilities(storage, size):
+    return (lambda: fashion_agent(storage, size),
+            lambda agent: [agent._get_support_capabilities(task) for task in TASKS],
+            len(TASKS))
+
+
+def bench_update_q_value(storage, size):
+    def setup():
+        wisdom = populate(WisdomGraph(storage=storage), size)
+        rng = random.Random(1)
+        pairs = [(f"action_{rng.randrange(size)}", f"action_{rng.randrange(size)}")
+                 for _ in range(size)]
+        return wisdom, pairs
+
+    def run(state):
+        wisdom, pairs = state
+        for source, target in pairs:
+            wisdom.update_q_value(source, target, 1.0)
+    return setup, run, size
+
+
+def bench_belief_propagation(storage, size):
+    def setup():
+        wisdom = populate(WisdomGraph(storage=storage), size)
+        return wisdom.reasoning_graph
+    return setup, lambda graph: BeliefEngine(graph).run(), size
+
+
+def bench_belief_update(storage, size):
+    def setup():
+        wisdom = populate(WisdomGraph(storage=storage), size)
+        wisdom.belief_engine()
+        return wisdom, random.Random(1)
+
+    def run(state):
+        wisdom, rng = state
+        wisdom.update_node_features(SpaceType.REASONING, f"reasoning_{rng.randrange(size)}",
+                                    {"belief": rng.random()})
+    return setup, run, 1
+
+
+CROSS_SPACE_PATH = [SpaceType.PERCEPTION, SpaceType.PLANNING,
+                    SpaceType.REASONING, SpaceType.ACTION]
+
+
+def _cross_space_graph(storage: str, size: int) -> WisdomGraph:
+    """Random cross-space edges along CROSS_SPACE_PATH, EDGES_PER_NODE per node"""
+    wisdom = WisdomGraph(storage=storage)
+    rng = random.Random(0)
+    for source_space, target_space in zip(CROSS_SPACE_PATH, CROSS_SPACE_PATH[1:]):
+        for _ in range(size * EDGES_PER_NODE):
+            wisdom.add_cross_space_edge(
+                f"{source_space.value}_{rng.randrange(size)}",
+                f"{target_space.value}_{rng.randrange(size)}",
+                source_space, target_space)
+    return wisdom
+
+
+def bench_reachable_cold(storage, size):
+    sources = [f"perception_{i}" for i in range(min(size, 1000))]
+
+    def setup():
+        wisdom = _cross_space_graph(storage, size)
+        wisdom.cross_space_index()
+        return wisdom
+
+    def run(wisdom):
+        wisdom.invalidate_cross_space_index()
+        return wisdom.reachable_many(sources, CROSS_SPACE_PATH)
+    return setup, run, len(sources)
+
+
+def bench_reachable_warm(storage, size):
+    sources = [f"perception_{i}" for i in range(min(size, 1000))]
+
+    def setup():
+        wisdom = _cross_space_graph(storage, size)
+        wisdom.reachable_many(sources, CROSS_SPACE_PATH)
+        return wisdom
+    return setup, lambda wisdom: wisdom.reachable_many(sources, CROSS_SPACE_PATH), len(sources)
+
+
+def bench_q_table_update(storage, size):
+    def setup():
+        wisdom = populate(WisdomGraph(storage=storage), size)
+        table = wisdom.q_table()
+        rng = np.random.default_rng(1)
+        edges = rng.integers(0, table.indices.size, size) if table.indices.size else []
+        sources = np.repeat(np.arange(len(table.node_ids)), np.diff(table.indptr))
+        states = [table.node_ids[row] for row in sources[edges]]
+        actions = [table.node_ids[column] for column in table.indices[edges]]
+        return table, states, actions
+
+    def run(state):
+        table, states, actions = state
+        if states:
+            table.update_q_values(states, actions, np.ones(len(states)))
+    return setup, run, size
+
+
+# Size-independent benchmarks get a fixed operation count instead
+FIXED_SIZE = 100
+
+BENCHMARKS: Dict[str, Tuple[Benchmark, bool]] = {
+    "fashion_agent": (bench_fashion_agent, False),
+    "fashion_agent_private": (bench_fashion_agent_private, False),
+    "education_agent": (bench_education_agent, False),
+    "add_nodes": (bench_add_nodes, True),
+    "prune_perception_space": (_bench_prune("prune_perception_space", 0.5), True),
+    "prune_planning_space": (_bench_prune("prune_planning_space", 0.5), True),
+    "prune_reasoning_space": (_bench_prune("prune_reasoning_space", 0.5), True),
+    "prune_action_space": (_bench_prune("prune_action_space", 0.5), True),
+    "gather_insights_cold": (bench_gather_insights_cold, True),
+    "gather_insights_warm": (bench_gather_insights_warm, True),
+    "create_strategy_cold": (bench_create_strategy_cold, True),
+    "create_strategy_warm": (bench_create_strategy_warm, True),
+    "create_strategy_lazy": (bench_create_strategy_lazy, True),
+    "create_timeline": (bench_create_timeline, True),
+    "plan_phase": (bench_plan_phase, True),
+    "support_capabilities": (bench_support_capabilities, True),
+    "update_q_value": (bench_update_q_value, True),
+    "belief_propagation": (bench_belief_propagation, True),
+    "belief_update": (bench_belief_update, True),
+    "reachable_cold": (bench_reachable_cold, True),
+    "reachable_warm": (bench_reachable_warm, True),
+    "q_table_update": (bench_q_table_update, True),
+}
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+def measure(benchmark: Benchmark, storage: str, size: int, repeat: int) -> Dict[str, Any]:
+    timings = []
+    operations = 0
+    for _ in range(repeat):
+        setup, run, operations = benchmark(storage, size)
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "min": min(timings),
+        "median": median,
+        "mean": statistics.fmean(timings),
+        "operations": operations,
+        "ops_per_second": operations / median if median else None,
+    }
+
+
+def metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+            text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "networkx": nx.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def run_benchmarks(names: List[str], storages: List[str], sizes: List[int],
+                   repeat: int, log=print) -> Dict[str, Any]:
+    results = []
+    for name in names:
+        benchmark, scales = BENCHMARKS[name]
+        for storage in storages:
+            for size in (sizes if scales else [FIXED_SIZE]):
+                result = measure(benchmark, storage, size, repeat)
+                result.update(name=name, storage=storage, size=size)
+                results.append(result)
+                log(f"{name:<24} {storage:<9} {size:>9} "
+                    f"median {result['median'] * 1e3:10.3f} ms  "
+                    f"{result['ops_per_second'] or 0:14.1f} ops/s")
+    return {"meta": metadata(), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float, log=print) -> List[Dict[str, Any]]:
+    """Report median changes against a baseline; returns the regressions"""
+    previous = {(item["name"], item["storage"], item["size"]): item
+                for item in baseline["results"]}
+    regressions = []
+    log(f"\nCompared with {baseline['meta'].get('commit')} "
+        f"({baseline['meta'].get('timestamp')})")
+    for item in current["results"]:
+        before = previous.get((item["name"], item["storage"], item["size"]))
+        if before is None or not before["median"]:
+            continue
+        change = item["median"] / before["median"] - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(dict(item, change=change))
+        log(f"{item['name']:<24} {item['storage']:<9} {item['size']:>9} "
+            f"{change * 100:+8.1f}%{flag}")
+    return regressions
+
+
+def _csv(value: str) -> List[str]:
+    return [item for item in value.split(",") if item]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=_csv,
+                        default=[str(size) for size in DEFAULT_SIZES],
+                        help="comma-separated graph sizes")
+    parser.add_argument("--storage", type=_csv, default=list(STORAGE_BACKENDS),
+                        help="comma-separated storage backends")
+    parser.add_argument("--only", type=_csv, default=list(BENCHMARKS),
+                        help="comma-separated benchmark names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+    for name in args.only:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+    for storage in args.storage:
+        if storage not in STORAGE_BACKENDS:
+            parser.error(f"unknown storage backend: {storage}")
+
+    results = run_benchmarks(args.only, args.storage,
+                             [int(size) for size in args.sizes], args.repeat)
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(results, stream, indent=2)
+    if args.compare:
+        with open(args.compare) as stream:
+            baseline = json.load(stream)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,7 @@
+from typing import Dict, Any, Optional, Sequence, Tuple, Union
+import numpy as np
+
+
 class Env:
     # core variables
     def __init__(self):
@@ -20,6 +24,15 @@ class Env:
         self.history = 0
 
 
+# Reward table shared by the single-room and vectorized fashion room envs
+FASHION_ROOM_REWARDS = {
+    "successful_styling": 10.0,
+    "customer_satisfaction": 8.0,
+    "aesthetic_display": 6.0,
+    "efficient_organization": 4.0
+}
+
+
 class FashionRoomEnv(Env):
     def __init__(self):
         super().__init__()
@@ -49,13 +62,7 @@ class FashionRoomEnv(Env):
 
     def reward(self, action_result):
         """Reward system for fashion house actions"""
-        rewards = {
-            "successful_styling": 10.0,
-            "customer_satisfaction": 8.0,
-            "aesthetic_display": 6.0,
-            "efficient_organization": 4.0
-        }
-        return rewards.get(action_result, 0.0)
+        return FASHION_ROOM_REWARDS.get(action_result, 0.0)
 
     def get_current_state(self):
         """Returns a dictionary containing the current state of the fashion room env."""
@@ -68,6 +75,128 @@ class FashionRoomEnv(Env):
         }
 
 
+class FashionRoomVecEnv(Env):
+    """N fashion rooms held as arrays so reset, step and reward run per batch.
+
+    Lighting is an (N, 3) array ordered like ``LIGHTING``, display areas
+    and stock are kept as item counts, and rewards come from the same table
+    as ``FashionRoomEnv.reward``. Action results can be given as names or as
+    integer codes indexing ``ACTION_RESULTS``; anything else rewards 0.0.
+    """
+
+    ACTION_RESULTS = tuple(FASHION_ROOM_REWARDS)
+    LIGHTING = ("natural", "artificial", "accent")
+    DISPLAY_AREAS = ("window", "mannequins", "racks")
+    DEFAULT_LIGHTING = (0.7, 0.5, 0.3)
+    DEFAULT_TEMPERATURE = 22.0
+
+    def __init__(self, num_rooms: int):
+        super().__init__()
+        self.provider = "Suanfamama"
+        self.sub_class = "fashion_house"
+        self.geo_location_region = "fashion_district"
+        self.complex_level = 3
+
+        self.num_rooms = num_rooms
+        # Last slot is the reward for unknown results
+        self._reward_table = np.array(
+            [FASHION_ROOM_REWARDS[name] for name in self.ACTION_RESULTS] + [0.0])
+        self._result_codes = {name: code for code, name
+                              in enumerate(self.ACTION_RESULTS)}
+
+        self.inventory = np.zeros(num_rooms, dtype=np.int64)
+        self.customers = np.zeros(num_rooms, dtype=np.int64)
+        self.display_areas = np.zeros((num_rooms, len(self.DISPLAY_AREAS)),
+                                      dtype=np.int64)
+        self.lighting = np.zeros((num_rooms, len(self.LIGHTING)))
+        self.temperature = np.zeros(num_rooms)
+        self.music = np.full(num_rooms, None, dtype=object)
+        self.scent = np.full(num_rooms, None, dtype=object)
+        self.steps = np.zeros(num_rooms, dtype=np.int64)
+        self.returns = np.zeros(num_rooms)
+        self.reset()
+
+    def reset(self, rooms: Optional[Union[Sequence[int], np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """Reset all rooms, or only the given room indices / boolean mask"""
+        selection = slice(None) if rooms is None else rooms
+        self.inventory[selection] = 0
+        self.customers[selection] = 0
+        self.display_areas[selection] = 0
+        self.lighting[selection] = self.DEFAULT_LIGHTING
+        self.temperature[selection] = self.DEFAULT_TEMPERATURE
+        self.music[selection] = None
+        self.scent[selection] = None
+        self.steps[selection] = 0
+        self.returns[selection] = 0.0
+        return self.get_current_state()
+
+    def encode_results(self, action_results) -> np.ndarray:
+        """Convert result names or codes into indices of the reward table"""
+        results = np.asarray(action_results)
+        unknown = len(self.ACTION_RESULTS)
+        if results.dtype.kind in "iu":
+            codes = results.astype(np.int64)
+            return np.where((codes >= 0) & (codes < unknown), codes, unknown)
+        names, inverse = np.unique(results.astype(str), return_inverse=True)
+        lookup = np.array([self._result_codes.get(name, unknown)
+                           for name in names], dtype=np.int64)
+        return lookup[inverse.reshape(results.shape)]
+
+    def reward(self, action_results) -> np.ndarray:
+        """Vectorized FashionRoomEnv.reward over one result per room"""
+        return self._reward_table[self.encode_results(action_results)]
+
+    def step(self, action_results, lighting: Optional[np.ndarray] = None) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Advance every room by one action result and return (state, rewards)"""
+        rewards = self.reward(action_results)
+        if lighting is not None:
+            self.lighting[:] = np.clip(lighting, 0.0, 1.0)
+        self.returns += rewards
+        self.steps += 1
+        self.time += 1
+        return self.get_current_state(), rewards
+
+    def get_current_state(self) -> Dict[str, np.ndarray]:
+        """Returns the batched state arrays of all rooms."""
+        return {
+            "inventory": self.inventory,
+            "customers": self.customers,
+            "display_areas": self.display_areas,
+            "lighting": self.lighting,
+            "temperature": self.temperature,
+            "music": self.music,
+            "scent": self.scent
+        }
+
+
+EDUCATION_ROOM_REWARDS = {
+    "concept_mastery": 10.0,
+    "skill_acquisition": 8.0,
+    "active_participation": 6.0,
+    "peer_collaboration": 5.0,
+    "creative_application": 7.0
+}
+
+# Environment presets per learning activity
+ACTIVITY_SETTINGS = {
+    "lecture": {
+        "lighting": {"brightness": 0.7, "color_temperature": 4500},
+        "acoustics": {"noise_level": 0.1},
+        "layout": "theater_style"
+    },
+    "workshop": {
+        "lighting": {"brightness": 0.9, "color_temperature": 5500},
+        "acoustics": {"noise_level": 0.3},
+        "layout": "workshop_style"
+    },
+    "discussion": {
+        "lighting": {"brightness": 0.8, "color_temperature": 5000},
+        "acoustics": {"noise_level": 0.2},
+        "layout": "group_style"
+    }
+}
+
+
 class EducationRoom(Env):
     def __init__(self):
         super().__init__()
@@ -135,37 +264,12 @@ class EducationRoom(Env):
 
     def reward(self, learning_outcome):
         """Reward system for educational achievements"""
-        rewards = {
-            "concept_mastery": 10.0,
-            "skill_acquisition": 8.0,
-            "active_participation": 6.0,
-            "peer_collaboration": 5.0,
-            "creative_application": 7.0
-        }
-        return rewards.get(learning_outcome, 0.0)
+        return EDUCATION_ROOM_REWARDS.get(learning_outcome, 0.0)
 
     def adjust_environment(self, activity_type):
         """Adjust room environment based on learning activity"""
-        settings = {
-            "lecture": {
-                "lighting": {"brightness": 0.7, "color_temperature": 4500},
-                "acoustics": {"noise_level": 0.1},
-                "layout": "theater_style"
-            },
-            "workshop": {
-                "lighting": {"brightness": 0.9, "color_temperature": 5500},
-                "acoustics": {"noise_level": 0.3},
-                "layout": "workshop_style"
-            },
-            "discussion": {
-                "lighting": {"brightness": 0.8, "color_temperature": 5000},
-                "acoustics": {"noise_level": 0.2},
-                "layout": "group_style"
-            }
-        }
-
-        if activity_type in settings:
-            self._apply_settings(settings[activity_type])
+        if activity_type in ACTIVITY_SETTINGS:
+            self._apply_settings(ACTIVITY_SETTINGS[activity_type])
 
     def _apply_settings(self, settings):
         """Apply the specified environmental settings"""
@@ -200,3 +304,134 @@ class EducationRoom(Env):
                 "participation", 0.0)
             self.metrics["knowledge_retention"] = student_data.get(
                 "retention", 0.0)
+
+
+class EducationRoomVecEnv(Env):
+    """M education rooms held in structured NumPy arrays.
+
+    ``metrics`` and ``environment`` are structured arrays with one record
+    per room and the same field names as ``EducationRoom.metrics`` and
+    ``EducationRoom.environment`` (e.g. ``environment["lighting"]["brightness"]``).
+    ``layouts`` is an (M, 3) array of indices into ``LAYOUTS``, one column
+    per entry of ``SPACES``. Activity presets, metric updates and rewards
+    are applied to whole batches of rooms at once.
+    """
+
+    SPACES = ("lecture_area", "practice_area", "collaboration_area")
+    LAYOUTS = ("theater_style", "workshop_style", "group_style")
+    ACTIVITIES = tuple(ACTIVITY_SETTINGS)
+    OUTCOMES = tuple(EDUCATION_ROOM_REWARDS)
+    METRICS_DTYPE = np.dtype([
+        ("engagement_level", np.float64),
+        ("comprehension_rate", np.float64),
+        ("participation_score", np.float64),
+        ("knowledge_retention", np.float64)
+    ])
+    ENVIRONMENT_DTYPE = np.dtype([
+        ("lighting", [("brightness", np.float64),
+                      ("color_temperature", np.float64)]),
+        ("acoustics", [("noise_level", np.float64),
+                       ("sound_absorption", np.float64)]),
+        ("climate", [("temperature", np.float64),
+                     ("humidity", np.float64)])
+    ])
+    # student_data key -> metrics field, as read by EducationRoom.update_metrics
+    STUDENT_FIELDS = {
+        "engagement": "engagement_level",
+        "comprehension": "comprehension_rate",
+        "participation": "participation_score",
+        "retention": "knowledge_retention"
+    }
+
+    def __init__(self, num_rooms: int):
+        super().__init__()
+        self.provider = "Suanfamama"
+        self.sub_class = "education_room"
+        self.geo_location_region = "learning_district"
+        self.complex_level = 2
+
+        self.num_rooms = num_rooms
+        self.metrics = np.zeros(num_rooms, dtype=self.METRICS_DTYPE)
+        self.environment = np.zeros(num_rooms, dtype=self.ENVIRONMENT_DTYPE)
+        self.layouts = np.zeros((num_rooms, len(self.SPACES)), dtype=np.int8)
+        self.capacity = np.tile(np.array([30, 15, 20], dtype=np.int64),
+                                (num_rooms, 1))
+        self._reward_table = np.array(
+            [EDUCATION_ROOM_REWARDS[name] for name in self.OUTCOMES] + [0.0])
+        self._outcome_codes = {name: code for code, name
+                               in enumerate(self.OUTCOMES)}
+        self._activity_codes = {name: code for code, name
+                                in enumerate(self.ACTIVITIES)}
+        self.reset()
+
+    def reset(self, rooms=None) -> None:
+        """Restore EducationRoom defaults for all rooms or the given subset"""
+        selection = slice(None) if rooms is None else rooms
+        self.metrics[selection] = 0.0
+        self.environment[selection] = ((0.8, 5000.0), (0.2, 0.7), (22.0, 45.0))
+        self.layouts[selection] = [self.LAYOUTS.index("theater_style"),
+                                   self.LAYOUTS.index("workshop_style"),
+                                   self.LAYOUTS.index("group_style")]
+
+    def _encode(self, values, codes: Dict[str, int]) -> np.ndarray:
+        values = np.asarray(values)
+        unknown = len(codes)
+        if values.dtype.kind in "iu":
+            values = values.astype(np.int64)
+            return np.where((values >= 0) & (values < unknown), values, unknown)
+        names, inverse = np.unique(values.astype(str), return_inverse=True)
+        lookup = np.array([codes.get(name, unknown) for name in names],
+                          dtype=np.int64)
+        return lookup[inverse.reshape(values.shape)]
+
+    def _rooms(self, rooms) -> np.ndarray:
+        if rooms is None:
+            return np.arange(self.num_rooms)
+        rooms = np.asarray(rooms)
+        return np.flatnonzero(rooms) if rooms.dtype == bool else rooms
+
+    def reward(self, learning_outcomes) -> np.ndarray:
+        """Vectorized EducationRoom.reward, one outcome per room"""
+        return self._reward_table[self._encode(learning_outcomes, self._outcome_codes)]
+
+    def adjust_environment(self, activity_types, rooms=None) -> None:
+        """Apply lecture/workshop/discussion presets to a batch of rooms.
+
+        ``activity_types`` is one activity for every selected room or one
+        per selected room; unknown activities leave a room unchanged. As in
+        EducationRoom, presets set lighting, acoustics and climate but leave
+        the space layouts as they are.
+        """
+        rooms = self._rooms(rooms)
+        codes = np.broadcast_to(
+            self._encode(activity_types, self._activity_codes), rooms.shape)
+        for code, activity in enumerate(self.ACTIVITIES):
+            targets = rooms[codes == code]
+            if targets.size:
+                self._apply_settings(ACTIVITY_SETTINGS[activity], targets)
+
+    def _apply_settings(self, settings: Dict, rooms: np.ndarray) -> None:
+        """Batched EducationRoom._apply_settings for one preset.
+
+        The preset's layout is not applied: EducationRoom only reconfigures
+        spaces that already have that layout, which leaves every layout as
+        it was, so ``layouts`` is unchanged here as well.
+        """
+        for category, values in settings.items():
+            if category in self.ENVIRONMENT_DTYPE.names:
+                block = self.environment[category]
+                for field, value in values.items():
+                    block[field][rooms] = value
+
+    def update_metrics(self, student_data: Dict[str, Any], rooms=None) -> None:
+        """Batched EducationRoom.update_metrics.
+
+        ``student_data`` maps ``engagement``/``comprehension``/
+        ``participation``/``retention`` to scalars or per-room arrays; as in
+        the single-room version, missing keys reset the metric to 0.0.
+        """
+        if not student_data:
+            return
+        rooms = self._rooms(rooms)
+        for key, field in self.STUDENT_FIELDS.items():
+            self.metrics[field][rooms] = student_data.get(key, 0.0)
@@ -1,8 +1,18 @@
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Callable, Hashable, Optional
 import networkx as nx
 import numpy as np
-from dataclasses import dataclass
+from copy import deepcopy
+from dataclasses import dataclass, replace
 from enum import Enum
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from itertools import chain
+from threading import Lock
+from storage import CompactSpace
+from qlearning import QTable
+from scheduler import schedule
+from allocator import ResourcePool, allocate, allocation_rows, demand_matrix
+from traversal import CrossSpaceIndex
 
 
 class SpaceType(Enum):
@@ -22,12 +32,237 @@ class WisdomNode:
     probability: float = 1.0
 
 
-class PerceptionGraph(nx.DiGraph):
-    def __init__(self):
-        super().__init__()
-        self.market_nodes = []
-        self.trend_nodes = []
-        self.customer_nodes = []
+class FrozenWisdomNode(WisdomNode):
+    """WisdomNode of a frozen graph; its attributes and features are read-only.
+
+    Templates shared through ``WisdomGraph.fork`` hold these, so a direct
+    write fails instead of leaking into every fork. Forks change nodes
+    through ``update_node_features``, which works on a ``thaw``-ed copy.
+    """
+
+    def __setattr__(self, name, value):
+        raise TypeError("nodes of a frozen graph are read-only; "
+                        "use WisdomGraph.update_node_features")
+
+    def __delattr__(self, name):
+        raise TypeError("nodes of a frozen graph are read-only; "
+                        "use WisdomGraph.update_node_features")
+
+    @classmethod
+    def of(cls, node: WisdomNode) -> "FrozenWisdomNode":
+        frozen = cls.__new__(cls)
+        frozen.__dict__.update(vars(node), features=freeze_value(node.features))
+        return frozen
+
+    def thaw(self) -> WisdomNode:
+        """Mutable deep copy of this node"""
+        return WisdomNode(**{**vars(self), "features": thaw_value(self.features)})
+
+
+class NodeRegistry(Sequence):
+    """Insertion-ordered set of node ids that reports its changes to the owning graph.
+
+    Membership, append and removal are O(1). Positional access reads a
+    cached list of the ids: appends and removing the last id keep it, so
+    indexing and the default ``pop()`` are O(1); removing any other id
+    drops it and the next positional access rebuilds it in O(n). Ids must
+    name nodes of the owning graph, and the graph drops them when it
+    removes the node, so readers can rely on every registered id being
+    present.
+    """
+
+    def __init__(self, owner, kind: str, node_ids=()):
+        self._owner = owner
+        self.kind = kind
+        self._ids = dict.fromkeys(node_ids)
+        # Ids in order for positional access; None until the next index
+        self._positions: Optional[List[str]] = None
+
+    def __contains__(self, node_id) -> bool:
+        try:
+            return node_id in self._ids
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __reversed__(self):
+        return reversed(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if self._positions is None:
+            self._positions = list(self._ids)
+        return self._positions[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (NodeRegistry, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"NodeRegistry({self.kind!r}, {list(self._ids)!r})"
+
+    def __reduce__(self):
+        # Rebuild from the plain id list so unpickling never replays appends
+        return (self.__class__, (None, self.kind, list(self)),
+                {"_owner": self._owner})
+
+    def append(self, node_id) -> None:
+        self._check_mutable()
+        if node_id in self._ids:
+            return
+        if self._owner is not None and node_id not in self._owner:
+            raise ValueError(f"Node {node_id!r} is not in the graph")
+        self._ids[node_id] = None
+        if self._positions is not None:
+            self._positions.append(node_id)
+        if self._owner is not None:
+            self._owner._registry_appended(self.kind, node_id)
+
+    def extend(self, node_ids) -> None:
+        for node_id in node_ids:
+            self.append(node_id)
+
+    def __iadd__(self, node_ids):
+        self.extend(node_ids)
+        return self
+
+    def remove(self, node_id) -> None:
+        if node_id not in self._ids:
+            raise ValueError(f"Node {node_id!r} is not registered")
+        self.discard(node_id)
+
+    def discard(self, node_id) -> None:
+        if node_id not in self._ids:
+            return
+        self._check_mutable()
+        del self._ids[node_id]
+        if self._positions and self._positions[-1] == node_id:
+            self._positions.pop()
+        else:
+            self._positions = None
+        self._changed()
+
+    def pop(self, index=-1):
+        node_id = self[index]
+        self.discard(node_id)
+        return node_id
+
+    def clear(self) -> None:
+        self._check_mutable()
+        self._ids.clear()
+        self._positions = None
+        self._changed()
+
+    def _check_mutable(self) -> None:
+        if self._owner is not None and nx.is_frozen(self._owner):
+            raise nx.NetworkXError("Frozen graph can't be modified")
+
+    def _changed(self) -> None:
+        if self._owner is not None:
+            self._owner._registry_changed(self.kind)
+
+
+class SpaceHooksMixin:
+    """Route node mutations through hooks so subclasses can keep derived state in sync"""
+
+    # NodeRegistry attributes that drop a node when the graph removes it
+    registry_names: Tuple[str, ...] = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Insertion rank reproduces graph node order for index lookups
+        self._node_rank: Dict[str, int] = {}
+        self._next_rank = 0
+
+    def add_node(self, node_id, **attr) -> None:
+        super().add_node(node_id, **attr)
+        self._node_updated(node_id)
+
+    def remove_node(self, node_id) -> None:
+        super().remove_node(node_id)
+        self._node_removed(node_id)
+
+    def remove_nodes_from(self, node_ids) -> None:
+        node_ids = [node_id for node_id in node_ids if node_id in self]
+        super().remove_nodes_from(node_ids)
+        for node_id in node_ids:
+            self._node_removed(node_id)
+
+    def update_node_features(self, node_id: str, features: Dict[str, Any]) -> None:
+        """Merge ``features`` into a node's features and refresh derived state"""
+        if nx.is_frozen(self):
+            raise nx.NetworkXError("Frozen graph can't be modified")
+        self.nodes[node_id]["data"].features.update(features)
+        self._node_updated(node_id)
+
+    def copy(self, *args, **kwargs):
+        graph = super().copy(*args, **kwargs)
+        graph._copy_derived_state(self)
+        return graph
+
+    def reindex(self) -> None:
+        """Reset derived state after a bulk load.
+
+        Indexes over node features are rebuilt on first use, so loading a
+        snapshot does not decode every node's features.
+        """
+        self._node_rank = {node_id: rank for rank, node_id in enumerate(self)}
+        self._next_rank = len(self._node_rank)
+        self._drop_indexes()
+
+    def _in_graph_order(self, node_ids) -> List[str]:
+        return sorted(node_ids, key=self._node_rank.__getitem__)
+
+    def _copy_derived_state(self, source) -> None:
+        """Rebuild registries and indexes on a freshly copied graph"""
+        self._node_rank = dict(source._node_rank)
+        self._next_rank = source._next_rank
+
+    def _node_updated(self, node_id: str) -> None:
+        if node_id not in self._node_rank:
+            self._node_rank[node_id] = self._next_rank
+            self._next_rank += 1
+
+    def _node_removed(self, node_id: str) -> None:
+        self._node_rank.pop(node_id, None)
+        for name in self.registry_names:
+            getattr(self, name).discard(node_id)
+
+    def _drop_indexes(self) -> None:
+        pass
+
+    def _registry_appended(self, kind: str, node_id: str) -> None:
+        pass
+
+    def _registry_changed(self, kind: str) -> None:
+        pass
+
+
+class PerceptionMixin(SpaceHooksMixin):
+    """Market, trend and customer analysis shared by every perception storage backend.
+
+    Each analysis is cached and kept up to date as nodes are registered,
+    added, updated or removed, so repeated analyze calls on an unchanged
+    graph are O(1). Results are handed out as read-only FrozenDicts that
+    are shared between callers; copy one to modify it. Feature changes
+    must go through ``update_node_features`` to be seen.
+    """
+
+    registry_names = ("market_nodes", "trend_nodes", "customer_nodes")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Running aggregates, and the frozen views of them handed to callers
+        self._insights: Dict[str, Dict] = {}
+        self._insight_views: Dict[str, "FrozenDict"] = {}
+        self.market_nodes = NodeRegistry(self, "market")
+        self.trend_nodes = NodeRegistry(self, "trend")
+        self.customer_nodes = NodeRegistry(self, "customer")
 
     def gather_insights(self) -> Dict:
         """Gather all insights from perception nodes"""
@@ -39,51 +274,103 @@ class PerceptionGraph(nx.DiGraph):
 
     def analyze_market(self) -> Dict:
         """Analyze market conditions from perception nodes"""
-        market_data = {
-            "market_size": 0.0,
-            "competition_level": 0.0,
-            "growth_potential": 0.0,
-            "market_trends": []
-        }
-
-        for node in self.market_nodes:
-            if node in self.nodes:
-                node_data = self.nodes[node]["data"]
-                self._update_market_analysis(market_data, node_data)
-
-        return market_data
+        return self._cached_insights("market")
 
     def analyze_trends(self) -> Dict:
         """Analyze fashion trends from perception nodes"""
-        trend_data = {
-            "current_trends": [],
-            "emerging_trends": [],
-            "trend_strength": {},
-            "trend_duration": {}
-        }
-
-        for node in self.trend_nodes:
-            if node in self.nodes:
-                node_data = self.nodes[node]["data"]
-                self._update_trend_analysis(trend_data, node_data)
-
-        return trend_data
+        return self._cached_insights("trend")
 
     def analyze_customers(self) -> Dict:
         """Analyze customer preferences and behaviors"""
-        customer_data = {
+        return self._cached_insights("customer")
+
+    def _cached_insights(self, kind: str) -> "FrozenDict":
+        insights = self._insights.get(kind)
+        if insights is None:
+            insights = self._empty_insights(kind)
+            # Registries only hold live nodes, so no membership check here
+            nodes = self.nodes
+            for node in getattr(self, f"{kind}_nodes"):
+                self._fold_insights(kind, insights, nodes[node]["data"])
+            self._insights[kind] = insights
+            self._insight_views.pop(kind, None)
+        view = self._insight_views.get(kind)
+        if view is None:
+            view = self._insight_views[kind] = freeze_value(insights)
+        return view
+
+    def _empty_insights(self, kind: str) -> Dict:
+        if kind == "market":
+            return {
+                "market_size": 0.0,
+                "competition_level": 0.0,
+                "growth_potential": 0.0,
+                "market_trends": []
+            }
+        if kind == "trend":
+            return {
+                "current_trends": [],
+                "emerging_trends": [],
+                "trend_strength": {},
+                "trend_duration": {}
+            }
+        return {
             "preferences": {},
             "buying_patterns": [],
             "satisfaction_metrics": {},
             "demographic_insights": {}
         }
 
-        for node in self.customer_nodes:
-            if node in self.nodes:
-                node_data = self.nodes[node]["data"]
-                self._update_customer_analysis(customer_data, node_data)
+    def _fold_insights(self, kind: str, insights: Dict, node_data: WisdomNode) -> None:
+        if kind == "market":
+            self._update_market_analysis(insights, node_data)
+        elif kind == "trend":
+            self._update_trend_analysis(insights, node_data)
+        else:
+            self._update_customer_analysis(insights, node_data)
+
+    def _copy_derived_state(self, source) -> None:
+        super()._copy_derived_state(source)
+        # Cached aggregates are folded in place, so copies start without them
+        self._insights = {}
+        self._insight_views = {}
+        self.market_nodes = NodeRegistry(self, "market", source.market_nodes)
+        self.trend_nodes = NodeRegistry(self, "trend", source.trend_nodes)
+        self.customer_nodes = NodeRegistry(
+            self, "customer", source.customer_nodes)
+
+    def _registry_appended(self, kind: str, node_id: str) -> None:
+        # Appending folds the node into the running aggregate in place
+        insights = self._insights.get(kind)
+        if insights is not None:
+            self._fold_insights(kind, insights, self.nodes[node_id]["data"])
+            self._insight_views.pop(kind, None)
+
+    def _registry_changed(self, kind: str) -> None:
+        self._drop_insights(kind)
+
+    def _drop_indexes(self) -> None:
+        self._insights = {}
+        self._insight_views = {}
+
+    def _node_updated(self, node_id: str) -> None:
+        super()._node_updated(node_id)
+        self._invalidate_node(node_id)
 
-        return customer_data
+    def _node_removed(self, node_id: str) -> None:
+        super()._node_removed(node_id)
+        self._invalidate_node(node_id)
+
+    def _invalidate_node(self, node_id: str) -> None:
+        # Replacing or dropping a node can lower a running max or un-merge
+        # dict entries, so affected aggregates are rebuilt on next access
+        for kind in ("market", "trend", "customer"):
+            if node_id in getattr(self, f"{kind}_nodes"):
+                self._drop_insights(kind)
+
+    def _drop_insights(self, kind: str) -> None:
+        self._insights.pop(kind, None)
+        self._insight_views.pop(kind, None)
 
     def _update_market_analysis(self, market_data: Dict, node_data: WisdomNode):
         features = node_data.features
@@ -124,31 +411,396 @@ class PerceptionGraph(nx.DiGraph):
                 features["demographics"])
 
 
-class PlanningGraph(nx.DiGraph):
+class PerceptionGraph(PerceptionMixin, nx.DiGraph):
+    pass
+
+
+class CompactPerceptionGraph(PerceptionMixin, CompactSpace):
     def __init__(self):
-        super().__init__()
-        self.strategy_nodes = []
-        self.task_nodes = []
-
-    def create_strategy(self, perception_data: Dict, tasks: List[str]) -> Dict:
-        """Create main strategy based on perception data and tasks"""
-        strategy = {
-            "objectives": self._define_objectives(tasks),
-            "resource_allocation": self._allocate_resources(tasks),
-            "timeline": self._create_timeline(tasks),
-            "dependencies": self._identify_dependencies(tasks)
+        super().__init__(SpaceType.PERCEPTION)
+
+
+class FrozenDict(dict):
+    """Read-only dict handed out for cached insights and strategy sections"""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("cached results are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list handed out for cached insights and strategy sections"""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("cached results are read-only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+def _parse_include(include) -> Dict[str, Any]:
+    """Turn ``["a", "b.c"]`` into ``{"a": None, "b": {"c"}}`` (None selects everything)"""
+    selection: Dict[str, Any] = {}
+    for path in include:
+        name, _, rest = path.partition(".")
+        if not rest or selection.get(name, ()) is None:
+            selection[name] = None
+        else:
+            selection.setdefault(name, set()).add(rest)
+    return selection
+
+
+class LazyStrategy(Mapping):
+    """Read-only strategy mapping whose sections are built on first access.
+
+    Sections are registered with ``define`` and built once when read; a
+    section may itself be a LazyStrategy. ``include`` restricts the
+    mapping to the named sections, using dotted paths for nested ones
+    (``"market_adaptation.pricing_strategy"``). ``materialize`` builds
+    everything and returns the equivalent FrozenDict; comparisons and
+    pickling go through it.
+    """
+
+    def __init__(self, include=None):
+        self._builders: Dict[str, Callable[[], Any]] = {}
+        self._values: Dict[str, Any] = {}
+        self._include = None if include is None else _parse_include(include)
+
+    def define(self, name: str, build: Callable[[], Any]) -> None:
+        if self._include is None or name in self._include:
+            self._builders[name] = build
+
+    def select(self, include) -> "LazyStrategy":
+        """Return a view restricted to ``include``, sharing built sections"""
+        selected = LazyStrategy(include)
+        for name, build in self._builders.items():
+            selected.define(name, build)
+        selected._values = {name: value for name, value in self._values.items()
+                            if name in selected._builders}
+        return selected
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        value = self._builders[name]()
+        nested = self._include and self._include.get(name)
+        if nested and isinstance(value, LazyStrategy):
+            value = value.select(nested)
+        self._values[name] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._builders)
+
+    def __len__(self) -> int:
+        return len(self._builders)
+
+    def __contains__(self, name) -> bool:
+        return name in self._builders
+
+    def is_built(self, name: str) -> bool:
+        """Whether a section has been computed yet"""
+        return name in self._values
+
+    def materialize(self) -> FrozenDict:
+        return FrozenDict({
+            name: value.materialize() if isinstance(value, LazyStrategy) else value
+            for name, value in self.items()
+        })
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self.materialize()),))
+
+    def __repr__(self) -> str:
+        sections = ", ".join(
+            f"{name!r}: {'...' if name not in self._values else repr(self._values[name])}"
+            for name in self._builders)
+        return f"LazyStrategy({{{sections}}})"
+
+
+def freeze_value(value: Any) -> Any:
+    """Recursively convert dicts and lists into their read-only counterparts"""
+    if isinstance(value, dict) and not isinstance(value, FrozenDict):
+        return FrozenDict({key: freeze_value(item) for key, item in value.items()})
+    if isinstance(value, list) and not isinstance(value, FrozenList):
+        return FrozenList(freeze_value(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def thaw_value(value: Any) -> Any:
+    """Deep, mutable copy of a value, turning read-only dicts and lists back into plain ones"""
+    if isinstance(value, dict):
+        return {key: thaw_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw_value(item) for item in value]
+    return deepcopy(value)
+
+
+def fingerprint(value: Any) -> Any:
+    """Stable, hashable fingerprint of nested perception data"""
+    if isinstance(value, Mapping):
+        return ("dict",) + tuple((key, fingerprint(item))
+                                 for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return ("list",) + tuple(fingerprint(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(fingerprint(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        return ("repr", repr(value))
+    return value
+
+
+class StrategyCache:
+    """Thread-safe LRU cache of frozen strategy sections with hit/miss counters"""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_build(self, key: Tuple, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        value = freeze_value(build())
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize
         }
 
-        # Incorporate perception data into strategy
+
+class PlanningMixin(SpaceHooksMixin):
+    """Strategy construction shared by every planning storage backend"""
+
+    # Strategy sections only depend on their inputs, so every planning graph
+    # shares one cache
+    strategy_cache = StrategyCache()
+
+    # Parallel workers assumed by the timeline; None starts every task as
+    # soon as its prerequisites are done
+    timeline_workers = None
+
+    # Capacity shared by a plan's tasks; None grants every request
+    resource_pool: ResourcePool = None
+
+    registry_names = ("strategy_nodes", "task_nodes")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.strategy_nodes = NodeRegistry(self, "strategy")
+        self.task_nodes = NodeRegistry(self, "task")
+        # Subtask -> planning node ids; nodes whose subtasks are not a
+        # collection (e.g. a string matched by substring) are scanned instead.
+        # None after a bulk load until the first lookup builds it.
+        self._subtask_index: Dict[Any, set] = {}
+        self._node_subtasks: Dict[str, Tuple] = {}
+        self._unindexed_subtasks: set = set()
+        # Task -> ordered prerequisites (the sources of its incoming edges)
+        # and the reverse; None until rebuilt from the edges
+        self._prerequisites: Dict[str, Dict[str, None]] = {}
+        self._dependents: Dict[str, set] = {}
+
+    def add_edge(self, source_id, target_id, **attr) -> None:
+        super().add_edge(source_id, target_id, **attr)
+        if self._prerequisites is not None:
+            self._add_prerequisite(source_id, target_id)
+
+    def remove_edge(self, source_id, target_id) -> None:
+        super().remove_edge(source_id, target_id)
+        if self._prerequisites is not None:
+            self._drop_prerequisite(source_id, target_id)
+
+    def add_edges_from(self, *args, **kwargs) -> None:
+        super().add_edges_from(*args, **kwargs)
+        self._prerequisites = None
+
+    def remove_edges_from(self, *args, **kwargs) -> None:
+        super().remove_edges_from(*args, **kwargs)
+        self._prerequisites = None
+
+    def _add_prerequisite(self, prerequisite: str, task: str) -> None:
+        self._prerequisites.setdefault(task, {})[prerequisite] = None
+        self._dependents.setdefault(prerequisite, set()).add(task)
+
+    def _drop_prerequisite(self, prerequisite: str, task: str) -> None:
+        prerequisites = self._prerequisites.get(task)
+        if prerequisites is not None:
+            prerequisites.pop(prerequisite, None)
+            if not prerequisites:
+                del self._prerequisites[task]
+        dependents = self._dependents.get(prerequisite)
+        if dependents is not None:
+            dependents.discard(task)
+            if not dependents:
+                del self._dependents[prerequisite]
+
+    def nodes_for_subtask(self, subtask: str) -> List[WisdomNode]:
+        """Return planning nodes listing ``subtask`` in their subtasks, in graph order"""
+        if self._subtask_index is None:
+            self._build_subtask_index()
+        node_ids = set(self._subtask_index.get(subtask, ()))
+        for node_id in self._unindexed_subtasks:
+            if subtask in self.nodes[node_id]["data"].features["subtasks"]:
+                node_ids.add(node_id)
+        return [self.nodes[node_id]["data"]
+                for node_id in self._in_graph_order(node_ids)]
+
+    def _copy_derived_state(self, source) -> None:
+        super()._copy_derived_state(source)
+        self.strategy_nodes = NodeRegistry(self, "strategy", source.strategy_nodes)
+        self.task_nodes = NodeRegistry(self, "task", source.task_nodes)
+        if source._subtask_index is None:
+            self._drop_indexes()
+        else:
+            self._subtask_index = {subtask: set(node_ids) for subtask, node_ids
+                                   in source._subtask_index.items()}
+            self._node_subtasks = dict(source._node_subtasks)
+            self._unindexed_subtasks = set(source._unindexed_subtasks)
+        if source._prerequisites is None:
+            self._prerequisites = None
+        else:
+            self._prerequisites = {task: dict(prerequisites) for task, prerequisites
+                                   in source._prerequisites.items()}
+            self._dependents = {prerequisite: set(tasks) for prerequisite, tasks
+                                in source._dependents.items()}
+
+    def _drop_indexes(self) -> None:
+        self._subtask_index = None
+        self._node_subtasks = {}
+        self._unindexed_subtasks = set()
+        self._prerequisites = None
+        self._dependents = {}
+
+    def _build_subtask_index(self) -> None:
+        # Built aside and published last: frozen templates are read by
+        # many threads at once
+        index, node_subtasks, unindexed = {}, {}, set()
+        for node_id in self:
+            self._index_subtasks(node_id, index, node_subtasks, unindexed)
+        self._node_subtasks, self._unindexed_subtasks = node_subtasks, unindexed
+        self._subtask_index = index
+
+    def _node_updated(self, node_id: str) -> None:
+        super()._node_updated(node_id)
+        if self._subtask_index is not None:
+            self._unindex_subtasks(node_id)
+            self._index_subtasks(node_id, self._subtask_index,
+                                 self._node_subtasks, self._unindexed_subtasks)
+
+    def _index_subtasks(self, node_id: str, index: Dict[Any, set],
+                        node_subtasks: Dict[str, Tuple], unindexed: set) -> None:
+        data = self.nodes[node_id].get("data")
+        subtasks = data.features.get("subtasks", ()) if data is not None else ()
+        if isinstance(subtasks, (list, tuple, set, frozenset, dict)):
+            subtasks = tuple(subtask for subtask in subtasks
+                             if isinstance(subtask, Hashable))
+            node_subtasks[node_id] = subtasks
+            for subtask in subtasks:
+                index.setdefault(subtask, set()).add(node_id)
+        else:
+            unindexed.add(node_id)
+
+    def _node_removed(self, node_id: str) -> None:
+        super()._node_removed(node_id)
+        if self._subtask_index is not None:
+            self._unindex_subtasks(node_id)
+        if self._prerequisites is not None:
+            # Removing a node removes its edges in both directions
+            for prerequisite in list(self._prerequisites.get(node_id, ())):
+                self._drop_prerequisite(prerequisite, node_id)
+            for task in list(self._dependents.get(node_id, ())):
+                self._drop_prerequisite(node_id, task)
+
+    def _unindex_subtasks(self, node_id: str) -> None:
+        self._unindexed_subtasks.discard(node_id)
+        for subtask in self._node_subtasks.pop(node_id, ()):
+            node_ids = self._subtask_index[subtask]
+            node_ids.discard(node_id)
+            if not node_ids:
+                del self._subtask_index[subtask]
+
+    def create_strategy(self, perception_data: Dict, tasks: List[str],
+                        include: List[str] = None) -> LazyStrategy:
+        """Create main strategy based on perception data and tasks.
+
+        The strategy is a read-only LazyStrategy: each section is built on
+        first access, and ``include`` limits it to the named sections
+        (dotted paths select nested ones). Sections are memoized in
+        ``strategy_cache`` keyed by the inputs each builder reads. The
+        insights in ``perception_data`` are copied when the strategy is
+        created, so it does not follow later changes to them.
+        """
+        tasks = list(tasks)
+        task_key = tuple(tasks)
+        section = self._strategy_section
+        strategy = LazyStrategy(include)
+        strategy.define("objectives", lambda: section(
+            "objectives", task_key, lambda: self._define_objectives(tasks)))
+        strategy.define("resource_allocation", lambda: section(
+            "resource_allocation", (task_key, self.resource_pool),
+            lambda: self._allocate_resources(tasks)))
+        # Timeline and dependencies also read the prerequisite edges, looked
+        # up only when one of those sections is accessed
+        strategy.define("timeline", lambda: section(
+            "timeline", (task_key, self.task_prerequisites(tasks), self.timeline_workers),
+            lambda: self._create_timeline(tasks)))
+        strategy.define("dependencies", lambda: section(
+            "dependencies", (task_key, self.task_prerequisites(tasks),
+                             self._completed_tasks(tasks)),
+            lambda: self._identify_dependencies(tasks)))
+
+        # Incorporate perception data into strategy. Sections read a frozen
+        # copy taken now, so later changes to the caller's insights cannot
+        # leak into sections that are built afterwards
         self._adapt_to_market(
-            strategy, perception_data.get("market_insights", {}))
+            strategy, freeze_value(perception_data.get("market_insights", {})))
         self._adapt_to_trends(
-            strategy, perception_data.get("trend_insights", {}))
+            strategy, freeze_value(perception_data.get("trend_insights", {})))
         self._adapt_to_customers(
-            strategy, perception_data.get("customer_insights", {}))
+            strategy, freeze_value(perception_data.get("customer_insights", {})))
 
         return strategy
 
+    def _strategy_section(self, name: str, fingerprint: Tuple, build: Callable[[], Any]) -> Any:
+        """Return a cached, frozen strategy section, building it on a miss"""
+        return self.strategy_cache.get_or_build(
+            (type(self), name, fingerprint), build)
+
     def create_support_plan(self, perception_data: Dict, main_plan: Dict, tasks: List[str]) -> Dict:
         """Create support plan aligned with main strategy"""
         return {
@@ -168,39 +820,109 @@ class PlanningGraph(nx.DiGraph):
             }
         return objectives
 
-    def _allocate_resources(self, tasks: List[str]) -> Dict:
-        """Allocate resources for tasks"""
+    def _allocate_resources(self, tasks: List[str], pool: ResourcePool = None) -> Dict:
+        """Allocate resources for tasks.
+
+        Each task requests its estimated resources. Within ``pool`` (default
+        ``resource_pool``) tasks are admitted greedily by throughput, i.e.
+        completions per hour, per unit of the scarcest resource; the rest get
+        an empty allocation and wait for capacity.
+        """
+        tasks = list(dict.fromkeys(tasks))
+        pool = self.resource_pool if pool is None else pool
+        human = [self._estimate_human_resources(task) for task in tasks]
+        material = [self._estimate_material_resources(task) for task in tasks]
+        hours = [self._estimate_time_resources(task) for task in tasks]
+        throughput = [1.0 / max(sum(task_hours.values()), 1e-9) for task_hours in hours]
+        result = allocate(demand_matrix(human, material), throughput, pool)
+        admitted = result["admitted"].tolist()
+        allocations = allocation_rows(result["allocations"])
         resources = {}
-        for task in tasks:
+        for i, task in enumerate(tasks):
             resources[task] = {
-                "human_resources": self._estimate_human_resources(task),
-                "material_resources": self._estimate_material_resources(task),
-                "time_resources": self._estimate_time_resources(task)
+                "human_resources": human[i],
+                "material_resources": material[i],
+                "time_resources": hours[i],
+                "allocation": allocations[i],
+                "admitted": admitted[i]
             }
         return resources
 
-    def _create_timeline(self, tasks: List[str]) -> Dict:
-        """Create timeline for task execution"""
-        timeline = {}
-        current_time = 0
-        for task in tasks:
-            duration = self._estimate_task_duration(task)
-            timeline[task] = {
-                "start_time": current_time,
-                "duration": duration,
-                "end_time": current_time + duration
+    def _create_timeline(self, tasks: List[str], workers: int = None) -> Dict:
+        """Create timeline for task execution.
+
+        Tasks are list-scheduled on ``workers`` parallel workers (default
+        ``timeline_workers``) so that every task starts after its
+        prerequisites in the planning graph, using the allocated time
+        resources as durations. ``slack`` is zero on the critical path.
+        """
+        tasks = list(dict.fromkeys(tasks))
+        durations = [self._estimate_task_duration(task) for task in tasks]
+        plan = schedule(tasks, durations, self.task_prerequisites(tasks),
+                        self.timeline_workers if workers is None else workers)
+        return {
+            task: {
+                "start_time": entry["start_time"],
+                "duration": entry["duration"],
+                "end_time": entry["end_time"],
+                "worker": entry["worker"],
+                "slack": entry["slack"]
             }
-            current_time += duration
-        return timeline
+            for task, entry in plan["tasks"].items()
+        }
+
+    def critical_path(self, tasks: List[str]) -> Dict[str, Any]:
+        """Longest chain of prerequisites through ``tasks`` and its length"""
+        tasks = list(dict.fromkeys(tasks))
+        durations = [self._estimate_task_duration(task) for task in tasks]
+        plan = schedule(tasks, durations, self.task_prerequisites(tasks))
+        return {"tasks": plan["critical_path"], "length": plan["critical_path_length"]}
+
+    def task_prerequisites(self, tasks: List[str]) -> Tuple[Tuple[str, str], ...]:
+        """Planning edges ``(prerequisite, task)`` that point at one of ``tasks``, by task"""
+        # Predecessor lookups are O(E) on compact storage, so the edges are
+        # indexed by target as they are added and removed
+        prerequisites = self._prerequisite_index()
+        return tuple((prerequisite, task) for task in dict.fromkeys(tasks)
+                     for prerequisite in prerequisites.get(task, ()))
+
+    def _prerequisite_index(self) -> Dict[str, Dict[str, None]]:
+        if self._prerequisites is None:
+            # Bulk loads and bulk edge changes rebuild it in one pass, built
+            # aside and published last like the other lazy indexes
+            prerequisites, dependents = {}, {}
+            for source, target in self.edges():
+                prerequisites.setdefault(target, {})[source] = None
+                dependents.setdefault(source, set()).add(target)
+            self._dependents = dependents
+            self._prerequisites = prerequisites
+        return self._prerequisites
+
+    def _completed_tasks(self, tasks: List[str]) -> Tuple[str, ...]:
+        """Prerequisites of ``tasks`` whose planning node is marked completed"""
+        return tuple(sorted({prerequisite for prerequisite, _ in self.task_prerequisites(tasks)
+                             if self._is_completed(prerequisite)}))
+
+    def _is_completed(self, task: str) -> bool:
+        data = self.nodes[task].get("data") if task in self else None
+        return data is not None and data.features.get("status") == "completed"
 
     def _identify_dependencies(self, tasks: List[str]) -> Dict:
         """Identify dependencies between tasks"""
+        # Index the prerequisite edges once instead of querying per task
+        prerequisites = {task: [] for task in tasks}
+        dependents = {}
+        for prerequisite, task in self.task_prerequisites(tasks):
+            prerequisites[task].append(prerequisite)
+            dependents.setdefault(prerequisite, []).append(task)
         dependencies = {}
         for task in tasks:
             dependencies[task] = {
-                "prerequisites": self._find_prerequisites(task),
-                "blockers": self._find_blockers(task),
-                "parallel_tasks": self._find_parallel_tasks(task)
+                "prerequisites": prerequisites[task],
+                "blockers": [prerequisite for prerequisite in prerequisites[task]
+                             if not self._is_completed(prerequisite)],
+                "parallel_tasks": self._siblings(task, prerequisites[task],
+                                                 dependents.get(task, []), dependents)
             }
         return dependencies
 
@@ -259,42 +981,70 @@ class PlanningGraph(nx.DiGraph):
 
     def _find_prerequisites(self, task: str) -> List[str]:
         """Find tasks that must be completed before this task"""
-        # In a real implementation, this would analyze task dependencies
-        return []
+        # Prerequisites are planning edges pointing at the task
+        if task not in self:
+            return []
+        return list(self.predecessors(task))
 
     def _find_blockers(self, task: str) -> List[str]:
         """Find tasks that are blocking this task"""
-        # In a real implementation, this would analyze current blockers
-        return []
+        return [prerequisite for prerequisite in self._find_prerequisites(task)
+                if not self._is_completed(prerequisite)]
 
     def _find_parallel_tasks(self, task: str) -> List[str]:
         """Find tasks that can be executed in parallel with this task"""
-        # In a real implementation, this would analyze task independence
-        return []
+        if task not in self:
+            return []
+        prerequisites = list(self.predecessors(task))
+        dependents = {prerequisite: list(self.successors(prerequisite))
+                      for prerequisite in prerequisites}
+        return self._siblings(task, prerequisites, list(self.successors(task)), dependents)
+
+    @staticmethod
+    def _siblings(task: str, prerequisites: List[str], successors: List[str],
+                  dependents: Dict[str, List[str]]) -> List[str]:
+        """Tasks unlocked by the same prerequisites and not directly ordered with ``task``"""
+        # Listing every unrelated task would make plans quadratic in size
+        excluded = {task, *prerequisites, *successors}
+        siblings = dict.fromkeys(sibling for prerequisite in prerequisites
+                                 for sibling in dependents.get(prerequisite, ())
+                                 if sibling not in excluded)
+        return list(siblings)
 
-    def _adapt_to_market(self, strategy: Dict, market_insights: Dict) -> None:
+    def _adapt_to_market(self, strategy: LazyStrategy, market_insights: Dict) -> None:
         """Adapt strategy based on market insights"""
         if market_insights:
-            market_trends = self._analyze_market_trends(market_insights)
-            pricing_strategy = self._adjust_pricing_strategy(market_insights)
-            resources = self._optimize_resources(market_insights)
-            
-            strategy["market_adaptation"] = {
-                "target_market_size": market_insights.get("market_size", 0),
-                "competition_strategy": self._develop_competition_strategy(
-                    market_insights.get("competition_level", 0)
-                ),
-                "growth_plans": self._develop_growth_plans(
-                    market_insights.get("growth_potential", 0)
-                ),
-                "growth_metrics": self._calculate_growth_metrics(
-                    market_insights.get("market_size", 0),
-                    market_insights.get("growth_potential", 0)
-                ),
-                "market_trends": market_trends,
-                "pricing_strategy": pricing_strategy,
-                "resource_optimization": resources
-            }
+            market_size = market_insights.get("market_size", 0)
+            competition_level = market_insights.get("competition_level", 0)
+            growth_potential = market_insights.get("growth_potential", 0)
+            section = self._strategy_section
+
+            def market_adaptation():
+                adaptation = LazyStrategy()
+                adaptation.define("target_market_size", lambda: market_size)
+                adaptation.define("competition_strategy", lambda: section(
+                    "competition_strategy", (competition_level,),
+                    lambda: self._develop_competition_strategy(competition_level)))
+                adaptation.define("growth_plans", lambda: section(
+                    "growth_plans", (growth_potential,),
+                    lambda: self._develop_growth_plans(growth_potential)))
+                adaptation.define("growth_metrics", lambda: section(
+                    "growth_metrics", (market_size, growth_potential),
+                    lambda: self._calculate_growth_metrics(
+                        market_size, growth_potential)))
+                adaptation.define("market_trends", lambda: section(
+                    "market_trends",
+                    (market_size, competition_level, growth_potential),
+                    lambda: self._analyze_market_trends(market_insights)))
+                adaptation.define("pricing_strategy", lambda: section(
+                    "pricing_strategy", (),
+                    lambda: self._adjust_pricing_strategy(market_insights)))
+                adaptation.define("resource_optimization", lambda: section(
+                    "resource_optimization", (),
+                    lambda: self._optimize_resources(market_insights)))
+                return adaptation
+
+            strategy.define("market_adaptation", market_adaptation)
 
     def _develop_competition_strategy(self, competition_level: float) -> Dict[str, Any]:
         """Develop comprehensive competition strategy"""
@@ -595,45 +1345,312 @@ class PlanningGraph(nx.DiGraph):
                 }
             }
         }
-    def _adapt_to_trends(self, strategy: Dict, trend_insights: Dict) -> None:
+    def _adapt_to_trends(self, strategy: LazyStrategy, trend_insights: Dict) -> None:
         """Adapt strategy based on trend insights"""
         if trend_insights:
-            strategy["trend_adaptation"] = {
-                "current_focus": trend_insights.get("current_trends", []),
-                "future_preparation": trend_insights.get("emerging_trends", []),
-                "trend_alignment": self._align_with_trends(trend_insights)
-            }
+            strategy.define("trend_adaptation", lambda: self._strategy_section(
+                "trend_adaptation", fingerprint(trend_insights), lambda: {
+                    "current_focus": trend_insights.get("current_trends", []),
+                    "future_preparation": trend_insights.get("emerging_trends", []),
+                    "trend_alignment": self._align_with_trends(trend_insights)
+                }))
 
-    def _adapt_to_customers(self, strategy: Dict, customer_insights: Dict) -> None:
+    def _adapt_to_customers(self, strategy: LazyStrategy, customer_insights: Dict) -> None:
         """Adapt strategy based on customer insights"""
         if customer_insights:
-            strategy["customer_adaptation"] = {
-                "target_segments": self._identify_target_segments(customer_insights),
-                "service_improvements": self._plan_service_improvements(customer_insights),
-                "engagement_strategy": self._develop_engagement_strategy(customer_insights)
-            }
+            strategy.define("customer_adaptation", lambda: self._strategy_section(
+                "customer_adaptation", fingerprint(customer_insights), lambda: {
+                    "target_segments": self._identify_target_segments(customer_insights),
+                    "service_improvements": self._plan_service_improvements(customer_insights),
+                    "engagement_strategy": self._develop_engagement_strategy(customer_insights)
+                }))
 
 
-class WisdomGraph:
+class PlanningGraph(PlanningMixin, nx.DiGraph):
+    pass
+
+
+class CompactPlanningGraph(PlanningMixin, CompactSpace):
     def __init__(self):
+        super().__init__(SpaceType.PLANNING)
+
+
+def support_keywords(features: Dict[str, Any]) -> frozenset:
+    """Keywords an action node offers for support matching"""
+    return frozenset(str(features).split("_"))
+
+
+class ActionMixin(SpaceHooksMixin):
+    """Action space with an inverted keyword index for capability lookup.
+
+    The index maps every ``support_keywords`` token to the nodes carrying
+    it and follows node adds, ``update_node_features`` calls and removals.
+    After a bulk load it is built by the first lookup.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._keyword_index: Dict[str, set] = {}
+        self._node_keywords: Dict[str, frozenset] = {}
+
+    def nodes_matching_keywords(self, keywords) -> List[WisdomNode]:
+        """Return nodes sharing any of ``keywords``, in graph order"""
+        if self._keyword_index is None:
+            self._build_keyword_index()
+        matches = set()
+        for keyword in keywords:
+            matches.update(self._keyword_index.get(keyword, ()))
+        return [self.nodes[node_id]["data"]
+                for node_id in self._in_graph_order(matches)]
+
+    def _copy_derived_state(self, source) -> None:
+        super()._copy_derived_state(source)
+        if source._keyword_index is None:
+            self._drop_indexes()
+        else:
+            self._keyword_index = {keyword: set(node_ids) for keyword, node_ids
+                                   in source._keyword_index.items()}
+            self._node_keywords = dict(source._node_keywords)
+
+    def _drop_indexes(self) -> None:
+        self._keyword_index = None
+        self._node_keywords = {}
+
+    def _build_keyword_index(self) -> None:
+        # Published last, as frozen templates are read by many threads
+        index, node_keywords = {}, {}
+        for node_id in self:
+            self._index_keywords(node_id, index, node_keywords)
+        self._node_keywords = node_keywords
+        self._keyword_index = index
+
+    def _node_updated(self, node_id: str) -> None:
+        super()._node_updated(node_id)
+        if self._keyword_index is not None:
+            self._unindex(node_id)
+            self._index_keywords(node_id, self._keyword_index, self._node_keywords)
+
+    def _index_keywords(self, node_id: str, index: Dict[str, set],
+                        node_keywords: Dict[str, frozenset]) -> None:
+        data = self.nodes[node_id].get("data")
+        keywords = support_keywords(data.features) if data is not None else frozenset()
+        node_keywords[node_id] = keywords
+        for keyword in keywords:
+            index.setdefault(keyword, set()).add(node_id)
+
+    def _node_removed(self, node_id: str) -> None:
+        super()._node_removed(node_id)
+        if self._keyword_index is not None:
+            self._unindex(node_id)
+
+    def _unindex(self, node_id: str) -> None:
+        for keyword in self._node_keywords.pop(node_id, ()):
+            node_ids = self._keyword_index[keyword]
+            node_ids.discard(node_id)
+            if not node_ids:
+                del self._keyword_index[keyword]
+
+
+class ActionGraph(ActionMixin, nx.DiGraph):
+    pass
+
+
+class CompactActionGraph(ActionMixin, CompactSpace):
+    def __init__(self):
+        super().__init__(SpaceType.ACTION)
+
+
+STORAGE_BACKENDS = ("networkx", "compact")
+
+_GRAPH_ATTRIBUTES = ("perception_graph", "planning_graph", "reasoning_graph",
+                     "action_graph", "cross_space_edges")
+
+
+def _node_column(graph, name: str) -> Tuple[Sequence, np.ndarray]:
+    """Return node ids and one numeric WisdomNode attribute as an array"""
+    if isinstance(graph, CompactSpace):
+        return graph.column(name)
+    node_ids = list(graph)
+    values = np.fromiter(
+        (getattr(data, name) for _, data in graph.nodes(data="data")),
+        dtype=np.float64, count=len(node_ids))
+    return node_ids, values
+
+
+def _node_features(graph) -> Tuple[Sequence, Sequence]:
+    """Return node ids and their feature dicts in graph order"""
+    if isinstance(graph, CompactSpace):
+        return graph.feature_list()
+    node_ids = list(graph)
+    return node_ids, [data.features for _, data in graph.nodes(data="data")]
+
+
+def _space_value(space) -> str:
+    """The value of a SpaceType given as a member or as its value"""
+    return space.value if isinstance(space, SpaceType) else SpaceType(space).value
+
+
+class WisdomGraph:
+    def __init__(self, storage: str = "networkx"):
+        if storage not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage backend: {storage}")
+        self.storage = storage
+
         # Separate graphs for each space for optimized processing
-        self.perception_graph = PerceptionGraph()
-        self.planning_graph = PlanningGraph()
-        self.reasoning_graph = nx.DiGraph()
-        self.action_graph = nx.DiGraph()
+        if storage == "compact":
+            # Array-backed spaces: numeric columns plus CSR adjacency
+            self.perception_graph = CompactPerceptionGraph()
+            self.planning_graph = CompactPlanningGraph()
+            self.reasoning_graph = CompactSpace(SpaceType.REASONING)
+            self.action_graph = CompactActionGraph()
+        else:
+            self.perception_graph = PerceptionGraph()
+            self.planning_graph = PlanningGraph()
+            self.reasoning_graph = nx.DiGraph()
+            self.action_graph = ActionGraph()
 
         # Mapping between spaces
         self.cross_space_edges = nx.DiGraph()
 
-    def add_perception_node(self, node_id: str, features: Dict[str, Any], level: int) -> None:
-        """Add a node in perception space (e.g., visual or audio features)"""
+        # Copy-on-write bookkeeping: graph attributes still shared with a
+        # frozen template, and per-space nodes already copied out of it
+        self._shared = set()
+        self._owned_nodes: Dict[str, set] = {}
+
+        # Name of the shared-memory segment the spaces were attached from
+        self.shared_segment = None
+
+        # Belief propagation over the reasoning space, built on first use and
+        # stamped with the version of the reasoning space it reflects
+        self._beliefs = None
+        self._reasoning_version = 0
+
+        # Per space-pair adjacency over cross_space_edges, built on first use
+        self._cross_index = None
+
+    def __reduce_ex__(self, protocol):
+        if self.shared_segment is not None and self._shared == set(_GRAPH_ATTRIBUTES):
+            # Untouched attachment: other processes re-attach by name
+            # instead of receiving a pickled copy of every space
+            from shared import attach_wisdom
+            return attach_wisdom, (self.shared_segment,)
+        return super().__reduce_ex__(protocol)
+
+    def freeze(self) -> "WisdomGraph":
+        """Make every space read-only so it can be shared between graphs.
+
+        Later mutations through the WisdomGraph API copy the affected space
+        (and node) first, so the frozen graphs themselves never change. Node
+        data becomes read-only as well (feature dicts and lists included), so
+        writing to a node directly raises TypeError rather than changing
+        every graph that shares it.
+        """
+        for name in _GRAPH_ATTRIBUTES:
+            graph = getattr(self, name)
+            if isinstance(graph, CompactSpace):
+                # Settle staged edges and tombstones before sharing the arrays
+                graph.to_csr()
+                graph.map_features(freeze_value)
+            else:
+                nodes = graph.nodes
+                for node_id, data in nodes(data="data"):
+                    if isinstance(data, WisdomNode) and not isinstance(data, FrozenWisdomNode):
+                        nodes[node_id]["data"] = FrozenWisdomNode.of(data)
+            nx.freeze(graph)
+        self._shared = set(_GRAPH_ATTRIBUTES)
+        self._owned_nodes = {}
+        return self
+
+    def fork(self) -> "WisdomGraph":
+        """Return a copy-on-write WisdomGraph sharing all spaces with this one"""
+        if self._shared != set(_GRAPH_ATTRIBUTES):
+            self.freeze()
+        wisdom = WisdomGraph.__new__(WisdomGraph)
+        wisdom.storage = self.storage
+        for name in _GRAPH_ATTRIBUTES:
+            setattr(wisdom, name, getattr(self, name))
+        wisdom._shared = set(_GRAPH_ATTRIBUTES)
+        wisdom._owned_nodes = {}
+        wisdom.shared_segment = self.shared_segment
+        wisdom._beliefs = None
+        wisdom._reasoning_version = self._reasoning_version
+        wisdom._cross_index = None
+        return wisdom
+
+    def save(self, path: str) -> None:
+        """Write the graph to ``path`` in the binary snapshot format"""
+        from snapshot import save_wisdom
+        save_wisdom(self, path)
+
+    @staticmethod
+    def load(path: str, storage: str = "compact", mmap: bool = True) -> "WisdomGraph":
+        """Load a snapshot written by ``save``, memory-mapping it by default"""
+        from snapshot import load_wisdom
+        return load_wisdom(path, storage=storage, mmap=mmap)
+
+    def own_space(self, space_type: SpaceType):
+        """Return a private, mutable graph for a space, copying it if shared"""
+        if space_type == SpaceType.REASONING:
+            # The caller may edit the graph directly
+            self._reasoning_changed()
+        return self._own(f"{space_type.value}_graph")
+
+    def _own(self, name: str):
+        graph = getattr(self, name)
+        if name in self._shared:
+            # Nodes keep pointing at the template's data until they change
+            graph = graph.copy()
+            setattr(self, name, graph)
+            self._shared.discard(name)
+            self._owned_nodes[name] = set()
+        return graph
+
+    def _own_node(self, space_type: SpaceType, node_id: str):
+        """Return a node's data, first copying it out of a shared template"""
+        name = f"{space_type.value}_graph"
+        graph = self._own(name)
+        owned = self._owned_nodes.get(name)
+        data = graph.nodes[node_id]["data"]
+        if owned is not None and node_id not in owned:
+            if isinstance(graph, CompactSpace):
+                data.features = thaw_value(data.features)
+            else:
+                data = (data.thaw() if isinstance(data, FrozenWisdomNode)
+                        else replace(data, features=thaw_value(data.features)))
+                graph.nodes[node_id]["data"] = data
+            owned.add(node_id)
+        return data
+
+    def _add_node(self, space_type: SpaceType, node: WisdomNode) -> None:
+        name = f"{space_type.value}_graph"
+        self._own(name).add_node(node.id, data=node)
+        if name in self._owned_nodes:
+            self._owned_nodes[name].add(node.id)
+
+    def add_perception_node(self, node_id: str, features: Dict[str, Any], level: int,
+                            registry: str = None) -> None:
+        """Add a node in perception space (e.g., visual or audio features).
+
+        ``registry`` ("market", "trend" or "customer") also registers the
+        node for the matching analysis.
+        """
         node = WisdomNode(
             id=node_id,
             space_type=SpaceType.PERCEPTION,
             features=features,
             level=level
         )
-        self.perception_graph.add_node(node_id, data=node)
+        self._add_node(SpaceType.PERCEPTION, node)
+        if registry is not None:
+            self.register_perception_node(node_id, registry)
+
+    def register_perception_node(self, node_id: str, registry: str) -> None:
+        """Register an existing perception node for market, trend or customer analysis"""
+        nodes = getattr(self.own_space(SpaceType.PERCEPTION), f"{registry}_nodes", None)
+        if not isinstance(nodes, NodeRegistry):
+            raise ValueError(f"Unknown perception registry: {registry}")
+        if node_id not in nodes:
+            nodes.append(node_id)
 
     def add_planning_node(self, node_id: str, task_info: Dict[str, Any], level: int) -> None:
         """Add a node in planning space (task hierarchies)"""
@@ -643,7 +1660,7 @@ class WisdomGraph:
             features=task_info,
             level=level
         )
-        self.planning_graph.add_node(node_id, data=node)
+        self._add_node(SpaceType.PLANNING, node)
 
     def add_reasoning_node(self, node_id: str, variables: Dict[str, Any],
                            probability: float, level: int) -> None:
@@ -655,7 +1672,8 @@ class WisdomGraph:
             level=level,
             probability=probability
         )
-        self.reasoning_graph.add_node(node_id, data=node)
+        self._add_node(SpaceType.REASONING, node)
+        self._reasoning_changed()
 
     def add_action_node(self, node_id: str, state_info: Dict[str, Any],
                         reward: float, level: int) -> None:
@@ -667,65 +1685,282 @@ class WisdomGraph:
             level=level,
             reward=reward
         )
-        self.action_graph.add_node(node_id, data=node)
+        self._add_node(SpaceType.ACTION, node)
+
+    def update_node_features(self, space_type: SpaceType, node_id: str,
+                             features: Dict[str, Any]) -> None:
+        """Merge new feature values into an existing node of a space"""
+        self._own_node(space_type, node_id)
+        graph = getattr(self, f"{space_type.value}_graph")
+        if hasattr(graph, "update_node_features"):
+            graph.update_node_features(node_id, features)
+        else:
+            graph.nodes[node_id]["data"].features.update(features)
+        if space_type == SpaceType.REASONING:
+            engine = self._beliefs
+            current = engine is not None and engine.matches(self._reasoning_version)
+            self._reasoning_changed()
+            if current:
+                # Re-propagate from the changed node instead of starting over
+                engine.graph = graph
+                engine.update_node(node_id)
+                engine.version = self._reasoning_version
+
+    def add_task_prerequisite(self, task: str, prerequisite: str) -> None:
+        """Record in planning space that ``prerequisite`` must finish before ``task``"""
+        for node_id in (prerequisite, task):
+            if node_id not in self.planning_graph:
+                self.add_planning_node(node_id, {"type": "task", "subtasks": []}, level=2)
+                self.own_space(SpaceType.PLANNING).task_nodes.append(node_id)
+        self.add_edge_within_space(SpaceType.PLANNING, prerequisite, task)
 
     def add_edge_within_space(self, space_type: SpaceType, source_id: str,
                               target_id: str, weight: float = 1.0) -> None:
         """Add an edge within a specific space"""
         graph = getattr(self, f"{space_type.value}_graph")
         if source_id in graph and target_id in graph:
+            graph = self.own_space(space_type)
             graph.add_edge(source_id, target_id, weight=weight)
+            if space_type == SpaceType.REASONING:
+                self._reasoning_changed()
 
     def add_cross_space_edge(self, source_id: str, target_id: str,
                              source_space: SpaceType, target_space: SpaceType) -> None:
         """Connect nodes across different spaces"""
-        self.cross_space_edges.add_edge(
+        self._own("cross_space_edges").add_edge(
             source_id,
             target_id,
             source_space=source_space,
             target_space=target_space
         )
+        if self._cross_index is not None:
+            self._cross_index.add_edge(source_id, target_id, _space_value(source_space),
+                                       _space_value(target_space))
+
+    def remove_cross_space_edge(self, source_id: str, target_id: str) -> None:
+        """Disconnect two nodes of different spaces"""
+        if self.cross_space_edges.has_edge(source_id, target_id):
+            self._own("cross_space_edges").remove_edge(source_id, target_id)
+            if self._cross_index is not None:
+                self._cross_index.remove_edge(source_id, target_id)
+
+    def cross_space_index(self) -> CrossSpaceIndex:
+        """Traversal index over cross_space_edges.
+
+        Built on first use and kept in sync by add_cross_space_edge and
+        remove_cross_space_edge; call ``invalidate_cross_space_index`` after
+        changing ``cross_space_edges`` directly.
+        """
+        if self._cross_index is None:
+            # Keyed by space value: SpaceType members hash in Python code
+            self._cross_index = CrossSpaceIndex.from_edges(
+                (source, target, _space_value(data["source_space"]),
+                 _space_value(data["target_space"]))
+                for source, target, data in self.cross_space_edges.edges(data=True))
+        return self._cross_index
+
+    def invalidate_cross_space_index(self) -> None:
+        self._cross_index = None
+
+    def reachable(self, source_id: str, path: List[SpaceType],
+                  reverse: bool = False) -> frozenset:
+        """Nodes of ``path[-1]`` reachable from ``source_id`` along cross-space edges.
+
+        ``path`` lists the spaces to pass through, e.g. ``[PERCEPTION,
+        PLANNING, REASONING, ACTION]``. With ``reverse=True`` the walk starts
+        in ``path[-1]`` and returns the nodes of ``path[0]`` that reach it.
+        """
+        return self.cross_space_index().reachable(
+            source_id, [_space_value(space) for space in path], reverse)
+
+    def reachable_many(self, source_ids: List[str], path: List[SpaceType],
+                       reverse: bool = False) -> Dict[str, frozenset]:
+        """``reachable`` for a batch of source nodes"""
+        return self.cross_space_index().reachable_many(
+            source_ids, [_space_value(space) for space in path], reverse)
+
+    def prune(self, thresholds: Dict[Any, float]) -> Dict[str, List[str]]:
+        """Prune all spaces in one vectorized pass.
+
+        ``thresholds`` maps a SpaceType (or its value) to the threshold of that
+        space's criterion: mean numeric feature importance for perception
+        (nodes without numeric features are kept),
+        ``efficiency`` for planning (registered tasks are kept),
+        ``probability`` for reasoning and
+        ``reward`` for actions. Spaces without a threshold are left alone.
+        Returns the removed node ids per space.
+
+        Every space is scored before anything is removed, so an error while
+        scoring leaves the graph untouched; removal then cascades through
+        ``remove_nodes``.
+        """
+        plan = {}
+        for space_type in SpaceType:
+            threshold = thresholds.get(
+                space_type, thresholds.get(space_type.value))
+            if threshold is None:
+                continue
+            graph = getattr(self, f"{space_type.value}_graph")
+            node_ids, scores = self._prune_scores(space_type, graph)
+            plan[space_type] = [node_ids[i]
+                                for i in np.flatnonzero(scores < threshold)]
+        for space_type, removed in plan.items():
+            self.remove_nodes(space_type, removed)
+        return {space_type.value: removed for space_type, removed in plan.items()}
+
+    def remove_nodes(self, space_type: SpaceType, node_ids: List[str]) -> None:
+        """Remove nodes from a space along with everything that refers to them.
+
+        The space's registries drop the ids and every cross-space edge with
+        an endpoint among them is removed, at O(degree) per node.
+        """
+        graph = getattr(self, f"{space_type.value}_graph")
+        node_ids = [node_id for node_id in dict.fromkeys(node_ids) if node_id in graph]
+        if not node_ids:
+            return
+        name = f"{space_type.value}_graph"
+        self._own(name).remove_nodes_from(node_ids)
+        if name in self._owned_nodes:
+            self._owned_nodes[name].difference_update(node_ids)
+        self._remove_cross_space_edges(space_type, node_ids)
+        if space_type == SpaceType.REASONING:
+            self._reasoning_changed()
+
+    def _remove_cross_space_edges(self, space_type: SpaceType, node_ids: List[str]) -> None:
+        edges = self.cross_space_edges
+        space = space_type.value
+        # Ids may repeat across spaces, so only edges whose endpoint lives in
+        # this space are dangling
+        dangling = []
+        for node_id in node_ids:
+            if node_id not in edges:
+                continue
+            dangling += [(node_id, target) for target, data in edges.succ[node_id].items()
+                         if _space_value(data["source_space"]) == space]
+            dangling += [(source, node_id) for source, data in edges.pred[node_id].items()
+                         if _space_value(data["target_space"]) == space]
+        if not dangling:
+            return
+        edges = self._own("cross_space_edges")
+        edges.remove_edges_from(dangling)
+        edges.remove_nodes_from([node_id for node_id in node_ids
+                                 if node_id in edges and not edges.degree(node_id)])
+        if self._cross_index is not None:
+            for source, target in dangling:
+                self._cross_index.remove_edge(source, target)
+
+    def _prune_scores(self, space_type: SpaceType, graph) -> Tuple[List[str], np.ndarray]:
+        """Compute the pruning criterion of every node in a space as one array"""
+        if space_type == SpaceType.REASONING:
+            return _node_column(graph, "probability")
+        if space_type == SpaceType.ACTION:
+            return _node_column(graph, "reward")
+
+        node_ids, features = _node_features(graph)
+        if space_type == SpaceType.PLANNING:
+            # Scheduled tasks are structure, not strategies: they carry no
+            # efficiency and are never pruned, so they score +inf
+            tasks = graph.task_nodes
+            return node_ids, np.fromiter(
+                (np.inf if node_id in tasks else f.get("efficiency", 0)
+                 for node_id, f in zip(node_ids, features)),
+                dtype=np.float64, count=len(features))
+
+        # Feature importance is the mean of a node's numeric feature values.
+        # Nodes without any (lists, labels, empty features) carry no
+        # importance signal and are kept on purpose: they score +inf
+        numeric = [[value for value in f.values()
+                    if isinstance(value, (int, float, np.number))]
+                   for f in features]
+        lengths = np.fromiter(map(len, numeric), dtype=np.int64,
+                              count=len(numeric))
+        flat = np.fromiter(chain.from_iterable(numeric), dtype=np.float64,
+                           count=int(lengths.sum()))
+        totals = np.bincount(np.repeat(np.arange(len(numeric)), lengths),
+                             weights=flat, minlength=len(numeric))
+        importance = np.full(len(numeric), np.inf)
+        np.divide(totals, lengths, out=importance, where=lengths > 0)
+        return node_ids, importance
 
     def prune_perception_space(self, feature_threshold: float) -> None:
-        """Prune nodes in perception space based on feature importance"""
-        nodes_to_remove = []
-        for node_id, data in self.perception_graph.nodes(data=True):
-            feature_importance = np.mean(list(data['data'].features.values()))
-            if feature_importance < feature_threshold:
-                nodes_to_remove.append(node_id)
-        self.perception_graph.remove_nodes_from(nodes_to_remove)
+        """Prune nodes in perception space based on feature importance.
+
+        Importance is the mean of a node's numeric feature values; other
+        values (strings, lists, nested dicts) are ignored rather than
+        failing the mean, and nodes with no numeric features are never
+        pruned.
+        """
+        self.prune({SpaceType.PERCEPTION: feature_threshold})
 
     def prune_planning_space(self, efficiency_threshold: float) -> None:
-        """Prune inefficient subtasks in planning space"""
-        nodes_to_remove = []
-        for node_id, data in self.planning_graph.nodes(data=True):
-            if data['data'].features.get('efficiency', 0) < efficiency_threshold:
-                nodes_to_remove.append(node_id)
-        self.planning_graph.remove_nodes_from(nodes_to_remove)
-
-    def prune_reasoning_space(self, probability_threshold: float) -> None:
-        """Prune less influential nodes in reasoning space"""
-        nodes_to_remove = []
-        for node_id, data in self.reasoning_graph.nodes(data=True):
-            if data['data'].probability < probability_threshold:
-                nodes_to_remove.append(node_id)
-        self.reasoning_graph.remove_nodes_from(nodes_to_remove)
+        """Prune inefficient subtasks in planning space.
+
+        Nodes registered in ``task_nodes`` (e.g. by add_task_prerequisite)
+        are kept regardless of the threshold.
+        """
+        self.prune({SpaceType.PLANNING: efficiency_threshold})
+
+    def prune_reasoning_space(self, probability_threshold: float,
+                              posterior: bool = False) -> None:
+        """Prune less influential nodes in reasoning space.
+
+        With ``posterior=True`` nodes are scored by their posterior
+        probability given the evidence and their neighbors rather than by
+        their static prior.
+        """
+        if not posterior:
+            self.prune({SpaceType.REASONING: probability_threshold})
+            return
+        engine = self.belief_engine()
+        self.remove_nodes(SpaceType.REASONING, [
+            engine.node_ids[i]
+            for i in np.flatnonzero(engine.marginals < probability_threshold)])
+
+    def belief_engine(self):
+        """Inference engine over the reasoning space, kept in sync with updates.
+
+        Every change made through the WisdomGraph API (or after ``own_space``)
+        bumps a version counter; the engine is rebuilt when its version is
+        behind, except for feature updates, which re-propagate incrementally.
+        """
+        from inference import BeliefEngine
+        graph = self.reasoning_graph
+        if self._beliefs is None or not self._beliefs.matches(self._reasoning_version):
+            self._beliefs = BeliefEngine(graph, version=self._reasoning_version)
+            self._beliefs.run()
+        self._beliefs.graph = graph
+        return self._beliefs
+
+    def _reasoning_changed(self) -> None:
+        self._reasoning_version += 1
+
+    def reasoning_posteriors(self) -> Dict[str, float]:
+        """Posterior probability of every reasoning node"""
+        return self.belief_engine().posteriors()
 
     def prune_action_space(self, reward_threshold: float) -> None:
         """Prune low-reward actions"""
-        nodes_to_remove = []
-        for node_id, data in self.action_graph.nodes(data=True):
-            if data['data'].reward < reward_threshold:
-                nodes_to_remove.append(node_id)
-        self.action_graph.remove_nodes_from(nodes_to_remove)
+        self.prune({SpaceType.ACTION: reward_threshold})
 
     def update_q_value(self, state_id: str, action_id: str, reward: float,
                        learning_rate: float = 0.1) -> None:
         """Update Q-values in action space"""
         if state_id in self.action_graph and action_id in self.action_graph:
-            current_q = self.action_graph.nodes[state_id]['data'].reward
+            node = self._own_node(SpaceType.ACTION, state_id)
+            current_q = node.reward
             new_q = current_q + learning_rate * (reward - current_q)
-            self.action_graph.nodes[state_id]['data'].reward = new_q
+            node.reward = new_q
+
+    def q_table(self) -> QTable:
+        """Snapshot the action space into a vectorized Q-table"""
+        return QTable.from_graph(self.action_graph)
+
+    def store_q_table(self, table: QTable) -> None:
+        """Copy a Q-table's learned values back into the action nodes' rewards"""
+        graph = self.action_graph
+        for node_id, reward in table.node_rewards().items():
+            if node_id in graph:
+                self._own_node(SpaceType.ACTION, node_id).reward = reward
 
     def get_highest_reward_action(self, state_id: str) -> str:
         """Get the action with highest reward for a given state"""
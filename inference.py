@@ -0,0 +1,320 @@
+"""Belief propagation over the reasoning space.
+
+Each reasoning node is a binary variable ("this consideration holds") in a
+pairwise Markov random field built from ``reasoning_graph``:
+
+* the unary potential combines the node's ``probability`` (its prior) with
+  soft evidence from its ``variables``: the mean of their observed numeric
+  values, read as a score in [0, 1] where 0.5 is neutral (``None`` or NaN
+  means not observed yet), and
+* every edge couples its endpoints with an Ising potential
+  ``exp(J * s_u * s_v)`` (``s = +1`` for true, ``-1`` for false) whose
+  strength ``J`` is ``coupling`` times the edge weight; edge direction
+  does not matter and edges in both directions add up.
+
+``BeliefEngine`` splits the field into connected components. Components
+small and sparse enough (at most ``exact_limit`` nodes and induced width
+``max_width`` under a min-degree order) are solved exactly by variable
+elimination; all others run loopy belief propagation with every message
+of an iteration computed in one set of NumPy operations. When a single
+node's variables change, ``update_node`` only re-propagates from that
+node: exact components are re-solved, and loopy BP resumes from the
+converged messages, recomputing only messages whose inputs moved by more
+than ``tolerance`` (residual propagation).
+"""
+from typing import Dict, List, Tuple, Any, Optional
+from itertools import chain
+import numpy as np
+
+from graph import _node_column, _node_features
+
+
+# Keep log-potentials finite for priors of exactly 0 or 1
+_EPSILON = 1e-9
+# np.einsum names at most 52 distinct axes, one per variable of a component
+_MAX_EXACT = 52
+
+
+def evidence_scores(features: List[Dict[str, Any]]) -> np.ndarray:
+    """Mean observed numeric variable value per node in [0, 1]; 0.5 when there are none"""
+    # value == value drops NaN, which like None marks an unobserved variable
+    numeric = [[value for value in f.values()
+                if isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+                and value == value]
+               for f in features]
+    lengths = np.fromiter(map(len, numeric), dtype=np.int64, count=len(numeric))
+    flat = np.fromiter(chain.from_iterable(numeric), dtype=np.float64,
+                       count=int(lengths.sum()))
+    totals = np.bincount(np.repeat(np.arange(len(numeric)), lengths),
+                         weights=flat, minlength=len(numeric))
+    scores = np.full(len(numeric), 0.5)
+    np.divide(totals, lengths, out=scores, where=lengths > 0)
+    return np.clip(scores, 0.0, 1.0)
+
+
+def log_unary(probabilities: np.ndarray, evidence: np.ndarray,
+              evidence_weight: float) -> np.ndarray:
+    """``(N, 2)`` log-potentials for (false, true) from priors and evidence"""
+    prior = np.clip(np.asarray(probabilities, dtype=np.float64), _EPSILON, 1 - _EPSILON)
+    likelihood = 0.5 + evidence_weight * (np.asarray(evidence, dtype=np.float64) - 0.5)
+    likelihood = np.clip(likelihood, _EPSILON, 1 - _EPSILON)
+    return np.stack([np.log1p(-prior) + np.log1p(-likelihood),
+                     np.log(prior) + np.log(likelihood)], axis=1)
+
+
+def _components(count: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Connected component label of every node (hook and shortcut)"""
+    labels = np.arange(count)
+    while True:
+        low = np.minimum(labels[sources], labels[targets])
+        high = np.maximum(labels[sources], labels[targets])
+        merge = low < high
+        if not merge.any():
+            return labels
+        np.minimum.at(labels, high[merge], low[merge])
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def _elimination_width(count: int, pairs: List[Tuple[int, int]]) -> int:
+    """Induced width of a min-degree elimination order"""
+    neighbors = [set() for _ in range(count)]
+    for u, v in pairs:
+        neighbors[u].add(v)
+        neighbors[v].add(u)
+    remaining = set(range(count))
+    width = 0
+    while remaining:
+        node = min(remaining, key=lambda i: (len(neighbors[i]), i))
+        around = neighbors[node]
+        width = max(width, len(around))
+        for u in around:
+            neighbors[u].discard(node)
+            neighbors[u].update(around - {u})
+        remaining.discard(node)
+    return width
+
+
+def variable_elimination(unary: np.ndarray, pairs: List[Tuple[int, int]],
+                         couplings: List[float]) -> np.ndarray:
+    """Exact P(true) of every variable of a small binary pairwise MRF"""
+    count = len(unary)
+    base = [((i,), np.exp(unary[i] - unary[i].max())) for i in range(count)]
+    for (u, v), strength in zip(pairs, couplings):
+        base.append(((u, v), np.exp(np.array([[strength, -strength],
+                                                [-strength, strength]]))))
+    marginals = np.empty(count)
+    for query in range(count):
+        factors = list(base)
+        remaining = set(range(count)) - {query}
+        while remaining:
+            # Min-degree: eliminate the variable sharing factors with fewest others
+            def degree(var):
+                return len(set().union(*(scope for scope, _ in factors if var in scope)))
+            var = min(remaining, key=lambda i: (degree(i), i))
+            touching = [factor for factor in factors if var in factor[0]]
+            factors = [factor for factor in factors if var not in factor[0]]
+            scope = tuple(sorted(set().union(*(s for s, _ in touching)) - {var}))
+            operands = []
+            for factor_scope, table in touching:
+                operands += [table, [*factor_scope]]
+            table = np.einsum(*operands, [*scope])
+            factors.append((scope, table / table.max()))
+            remaining.discard(var)
+        belief = np.ones(2)
+        for _, table in factors:
+            belief = belief * table
+        marginals[query] = belief[1] / belief.sum()
+    return marginals
+
+
+class BeliefEngine:
+    """Posterior marginals of the reasoning space.
+
+    Call ``run`` for a full inference pass and ``update_node`` after a
+    node's variables changed; ``posteriors`` returns P(true) per node.
+    ``version`` is an opaque stamp of the graph state the model reflects,
+    compared by ``matches``; the owner bumps it as the graph changes.
+    """
+
+    def __init__(self, graph, coupling: float = 0.5, evidence_weight: float = 0.5,
+                 exact_limit: int = 16, max_width: int = 8, damping: float = 0.5,
+                 tolerance: float = 1e-6, max_iterations: int = 200,
+                 version: Any = None):
+        if exact_limit > _MAX_EXACT:
+            raise ValueError(f"exact_limit cannot exceed {_MAX_EXACT}")
+        self.graph = graph
+        self.version = version
+        self.coupling = coupling
+        self.evidence_weight = evidence_weight
+        self.exact_limit = exact_limit
+        self.max_width = max_width
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self._build()
+
+    # ------------------------------------------------------------------
+    # Model construction
+    # ------------------------------------------------------------------
+    def _build(self) -> None:
+        graph = self.graph
+        self.node_ids, probabilities = _node_column(graph, "probability")
+        _, features = _node_features(graph)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        count = len(self.node_ids)
+        self.unary = log_unary(probabilities, evidence_scores(features), self.evidence_weight)
+
+        # Undirected couplings: u -> v and v -> u add up, self-loops are ignored
+        strengths: Dict[Tuple[int, int], float] = {}
+        for source, target, weight in self._weighted_edges():
+            u, v = self.index[source], self.index[target]
+            if u != v:
+                key = (min(u, v), max(u, v))
+                strengths[key] = strengths.get(key, 0.0) + self.coupling * weight
+        pairs = np.array(list(strengths), dtype=np.int64).reshape(-1, 2)
+        couplings = np.fromiter(strengths.values(), dtype=np.float64, count=len(strengths))
+
+        # Directed message slots: edge e and e + m carry opposite directions
+        edges = len(pairs)
+        self.sources = np.concatenate([pairs[:, 0], pairs[:, 1]])
+        self.targets = np.concatenate([pairs[:, 1], pairs[:, 0]])
+        self.couplings = np.concatenate([couplings, couplings])
+        self.reverse = np.concatenate([np.arange(edges, 2 * edges), np.arange(edges)])
+        self._outgoing = np.argsort(self.sources, kind="stable")
+        self._out_ptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.sources, minlength=count), out=self._out_ptr[1:])
+        # Messages and fields are log-odds, log m(true) - log m(false), so a
+        # binary Ising message is one tanh rule per slot
+        self._tanh = np.tanh(self.couplings)
+        self.messages = np.zeros(2 * edges)
+
+        # Split into exactly solvable components and loopy-BP components
+        labels = _components(count, pairs[:, 0], pairs[:, 1])
+        self.labels = labels
+        self._exact: Dict[int, Tuple[np.ndarray, List[Tuple[int, int]], List[float]]] = {}
+        sizes = np.bincount(labels, minlength=count)
+        members: Dict[int, List[int]] = {}
+        for node in np.flatnonzero(sizes[labels] <= self.exact_limit).tolist():
+            members.setdefault(int(labels[node]), []).append(node)
+        component_pairs: Dict[int, List[int]] = {}
+        for e, u in enumerate(pairs[:, 0].tolist()):
+            if int(labels[u]) in members:
+                component_pairs.setdefault(int(labels[u]), []).append(e)
+        for label, nodes in members.items():
+            local = {node: i for i, node in enumerate(nodes)}
+            edge_ids = component_pairs.get(label, [])
+            local_pairs = [(local[int(pairs[e, 0])], local[int(pairs[e, 1])]) for e in edge_ids]
+            if _elimination_width(len(nodes), local_pairs) <= self.max_width:
+                self._exact[label] = (np.array(nodes, dtype=np.int64), local_pairs,
+                                      couplings[edge_ids].tolist())
+        self.exact_mask = np.isin(labels, list(self._exact))
+        self.marginals = np.full(count, 0.5)
+
+    def _weighted_edges(self):
+        graph = self.graph
+        if hasattr(graph, "to_csr"):
+            return ((source, target, data["weight"])
+                    for source, target, data in graph.edges(data=True))
+        return graph.edges(data="weight", default=1.0)
+
+    def matches(self, version: Any) -> bool:
+        """Whether the model reflects graph state ``version``"""
+        return self.version is not None and version == self.version
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+    def run(self) -> np.ndarray:
+        """Full inference pass; returns P(true) per node in ``node_ids`` order"""
+        for label in self._exact:
+            self._solve_exact(label)
+        self.messages[:] = 0.0
+        self._propagate(np.flatnonzero(~self.exact_mask))
+        return self.marginals
+
+    def update_node(self, node_id: str, variables: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Re-read one node's potential and re-propagate from it.
+
+        ``variables`` defaults to the node's current features. Returns the
+        node ids whose posterior moved by more than ``tolerance``.
+        """
+        node = self.index[node_id]
+        data = self.graph.nodes[node_id]["data"]
+        if variables is None:
+            variables = data.features
+        self.unary[node] = log_unary([data.probability], evidence_scores([variables]),
+                                     self.evidence_weight)[0]
+        before = self.marginals.copy()
+        label = int(self.labels[node])
+        if label in self._exact:
+            self._solve_exact(label)
+        else:
+            self._propagate(np.array([node]))
+        moved = np.flatnonzero(np.abs(self.marginals - before) > self.tolerance)
+        return [self.node_ids[i] for i in moved.tolist()]
+
+    def posteriors(self) -> Dict[str, float]:
+        return dict(zip(self.node_ids, self.marginals.tolist()))
+
+    def _solve_exact(self, label: int) -> None:
+        nodes, pairs, couplings = self._exact[label]
+        self.marginals[nodes] = variable_elimination(self.unary[nodes], pairs, couplings)
+
+    def _outgoing_slots(self, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Message slots leaving ``nodes`` and the position of their sender in ``nodes``"""
+        starts, ends = self._out_ptr[nodes], self._out_ptr[nodes + 1]
+        lengths = ends - starts
+        offsets = np.repeat(ends - lengths.cumsum(), lengths)
+        slots = self._outgoing[offsets + np.arange(lengths.sum())]
+        return slots, np.repeat(np.arange(len(nodes)), lengths)
+
+    def _fields(self, nodes: np.ndarray, slots: np.ndarray, owners: np.ndarray) -> np.ndarray:
+        """Log-odds of ``nodes`` given their prior, evidence and incoming messages"""
+        # Messages into a node travel the reverse of its outgoing slots
+        incoming = np.bincount(owners, weights=self.messages[self.reverse[slots]],
+                               minlength=len(nodes))
+        return self.unary[nodes, 1] - self.unary[nodes, 0] + incoming
+
+    def _propagate(self, active: np.ndarray) -> None:
+        """Residual loopy BP: resend messages from ``active`` nodes until stable.
+
+        Starting from every node this is plain synchronous loopy BP; starting
+        from one changed node only the messages its change reaches are
+        recomputed.
+        """
+        count = len(self.node_ids)
+        touched = np.zeros(count, dtype=bool)
+        touched[active] = True
+        touched &= ~self.exact_mask
+        active = np.flatnonzero(touched)
+        self.iterations = 0
+        while active.size and self.iterations < self.max_iterations:
+            self.iterations += 1
+            slots, owners = self._outgoing_slots(active)
+            if not slots.size:
+                break
+            cavity = (self._fields(active, slots, owners)[owners] -
+                      self.messages[self.reverse[slots]])
+            product = np.clip(self._tanh[slots] * np.tanh(0.5 * cavity), -1 + 1e-15, 1 - 1e-15)
+            new = 2.0 * np.arctanh(product)
+            old = self.messages[slots]
+            if self.damping:
+                new = (1.0 - self.damping) * new + self.damping * old
+            self.messages[slots] = new
+            moved = slots[np.abs(new - old) > self.tolerance]
+            # Receivers see new inputs; with damping the senders themselves
+            # have only moved part of the way and must go again
+            pending = np.zeros(count, dtype=bool)
+            pending[self.targets[moved]] = True
+            pending[self.sources[moved]] = True
+            touched |= pending
+            active = np.flatnonzero(pending)
+        nodes = np.flatnonzero(touched)
+        if nodes.size:
+            slots, owners = self._outgoing_slots(nodes)
+            self.marginals[nodes] = 1.0 / (1.0 + np.exp(-self._fields(nodes, slots, owners)))
@@ -0,0 +1,183 @@
+"""Streaming ingestion of perception events into a WisdomGraph.
+
+Events (market ticks, trend signals, customer signals) arrive from a
+plain or async iterator and are applied in micro-batches: events for the
+same node within a batch are merged first, so each touched node is
+updated and re-analyzed once per batch instead of once per event. The
+async path reads the source through a bounded queue, so a fast producer
+waits for the graph instead of buffering without limit.
+"""
+from typing import Dict, List, Any, Iterable, AsyncIterable, Union
+from dataclasses import dataclass, field
+import asyncio
+import time
+
+from graph import WisdomGraph, SpaceType
+
+
+EVENT_KINDS = ("market", "trend", "customer")
+
+
+@dataclass
+class PerceptionEvent:
+    kind: str  # "market", "trend" or "customer"
+    node_id: str
+    features: Dict[str, Any]
+    level: int = 1
+
+    def __post_init__(self):
+        if self.kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown perception event kind: {self.kind}")
+
+
+@dataclass
+class IngestStats:
+    events: int = 0
+    batches: int = 0
+    nodes_added: int = 0
+    nodes_updated: int = 0
+    seconds: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "events": self.events,
+            "batches": self.batches,
+            "nodes_added": self.nodes_added,
+            "nodes_updated": self.nodes_updated,
+            "seconds": self.seconds,
+            "events_per_second": self.events_per_second
+        }
+
+
+@dataclass
+class _PendingNode:
+    """Events for one node merged within a micro-batch"""
+    features: Dict[str, Any]
+    level: int
+    kinds: Dict[str, None] = field(default_factory=dict)
+
+
+def apply_events(wisdom: WisdomGraph, events: List[PerceptionEvent]) -> Dict[str, int]:
+    """Apply one micro-batch, merging events that target the same node.
+
+    The result does not depend on how a stream is cut into batches: a new
+    node keeps the level of its first event, later features win, and the
+    node is registered for every kind it was sent as.
+    """
+    merged: Dict[str, _PendingNode] = {}
+    for event in events:
+        pending = merged.get(event.node_id)
+        if pending is None:
+            pending = merged[event.node_id] = _PendingNode(dict(event.features), event.level)
+        else:
+            pending.features.update(event.features)
+        pending.kinds[event.kind] = None
+
+    added = updated = 0
+    for node_id, pending in merged.items():
+        if node_id in wisdom.perception_graph:
+            wisdom.update_node_features(SpaceType.PERCEPTION, node_id, pending.features)
+            updated += 1
+        else:
+            wisdom.add_perception_node(node_id, pending.features, pending.level)
+            added += 1
+        for kind in pending.kinds:
+            wisdom.register_perception_node(node_id, kind)
+    return {"nodes_added": added, "nodes_updated": updated}
+
+
+class PerceptionIngestor:
+    """Feed a stream of PerceptionEvents into a WisdomGraph in micro-batches.
+
+    ``batch_size`` caps the events merged into one update. On the async
+    path ``max_pending`` bounds the queue between the source and the
+    graph, and ``max_latency`` (seconds) flushes a partial batch when the
+    source goes quiet.
+    """
+
+    def __init__(self, wisdom: WisdomGraph, batch_size: int = 256,
+                 max_pending: int = 4096, max_latency: float = 0.05):
+        if batch_size < 1 or max_pending < 1:
+            raise ValueError("batch_size and max_pending must be positive")
+        self.wisdom = wisdom
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.max_latency = max_latency
+        self.stats = IngestStats()
+
+    def _apply(self, batch: List[PerceptionEvent]) -> None:
+        counts = apply_events(self.wisdom, batch)
+        self.stats.events += len(batch)
+        self.stats.batches += 1
+        self.stats.nodes_added += counts["nodes_added"]
+        self.stats.nodes_updated += counts["nodes_updated"]
+
+    def ingest(self, events: Iterable[PerceptionEvent]) -> IngestStats:
+        """Consume a synchronous event iterator"""
+        start = time.perf_counter()
+        batch = []
+        for event in events:
+            batch.append(event)
+            if len(batch) >= self.batch_size:
+                self._apply(batch)
+                batch = []
+        if batch:
+            self._apply(batch)
+        self.stats.seconds += time.perf_counter() - start
+        return self.stats
+
+    async def aingest(self, events: Union[AsyncIterable[PerceptionEvent],
+                                          Iterable[PerceptionEvent]]) -> IngestStats:
+        """Consume an async (or plain) event iterator with backpressure"""
+        start = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        done = object()
+
+        async def produce():
+            try:
+                if hasattr(events, "__aiter__"):
+                    async for event in events:
+                        await queue.put(event)
+                else:
+                    for event in events:
+                        await queue.put(event)
+            finally:
+                await queue.put(done)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            finished = False
+            while not finished:
+                event = await queue.get()
+                if event is done:
+                    break
+                batch = [event]
+                deadline = time.perf_counter() + self.max_latency
+                while len(batch) < self.batch_size:
+                    try:
+                        event = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0:
+                            break
+                        try:
+                            event = await asyncio.wait_for(queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    if event is done:
+                        finished = True
+                        break
+                    batch.append(event)
+                self._apply(batch)
+                # Let the producer refill the queue between batches
+                await asyncio.sleep(0)
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+            self.stats.seconds += time.perf_counter() - start
+        return self.stats
@@ -0,0 +1,304 @@
+"""Opt-in instrumentation for the wisdom graph and agent hot paths.
+
+``Instrumentation.enable()`` wraps the target methods in place and
+``disable()`` puts the original functions back, so nothing is measured, and
+nothing costs anything, while it is off. While on, every call records its
+count, latency (cumulative plus a sample reservoir for p50/p99) and, with
+``track_memory=True``, the net bytes it allocated as seen by tracemalloc.
+``export()`` hands a snapshot of the metrics to a sink.
+
+    with Instrumentation(sink=JsonLinesSink("metrics.jsonl")) as metrics:
+        run_product_cycle()
+    metrics.export()
+"""
+from typing import Dict, List, Tuple, Any, Iterable, Optional, TextIO
+from abc import ABC, abstractmethod
+from threading import Lock
+import functools
+import inspect
+import json
+import random
+import time
+import tracemalloc
+import numpy as np
+
+from graph import WisdomGraph, PlanningMixin
+from agent import FashionAgent, EducationAgent
+
+
+# (class, method names) measured by default
+DEFAULT_TARGETS: Tuple[Tuple[type, Tuple[str, ...]], ...] = (
+    (WisdomGraph, (
+        "add_perception_node", "add_planning_node", "add_reasoning_node",
+        "add_action_node", "update_node_features", "add_edge_within_space",
+        "add_cross_space_edge", "update_q_value", "prune",
+        "prune_perception_space", "prune_planning_space",
+        "prune_reasoning_space", "prune_action_space",
+    )),
+    (PlanningMixin, (
+        "create_strategy", "create_support_plan", "_define_objectives",
+        "_allocate_resources", "_create_timeline", "_identify_dependencies",
+        "_adapt_to_market", "_develop_competition_strategy",
+        "_develop_growth_plans", "_identify_growth_opportunities",
+        "_calculate_growth_metrics", "_analyze_market_trends",
+        "_adjust_pricing_strategy", "_optimize_resources",
+        "_adapt_to_trends", "_adapt_to_customers",
+    )),
+    (FashionAgent, (
+        "plan_phase", "support_phase", "process_fashion_item",
+        "process_fashion_items", "aprocess_fashion_item",
+    )),
+    (EducationAgent, ("facilitate_learning", "afacilitate_learning")),
+)
+
+# Only one Instrumentation may have methods patched at a time
+_active_lock = Lock()
+_active: Optional["Instrumentation"] = None
+
+
+class Metric:
+    """Call statistics for one instrumented method"""
+
+    def __init__(self, name: str, max_samples: int):
+        self.name = name
+        self.count = 0
+        self.total_seconds = 0.0
+        self.allocated_bytes = 0
+        self.samples: List[float] = []
+        self._max_samples = max_samples
+        self._random = random.Random(0)
+
+    def record(self, seconds: float, allocated: int) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.allocated_bytes += allocated
+        if len(self.samples) < self._max_samples:
+            self.samples.append(seconds)
+        else:
+            # Reservoir sampling keeps a uniform sample of every call
+            slot = self._random.randrange(self.count)
+            if slot < self._max_samples:
+                self.samples[slot] = seconds
+
+    def summary(self) -> Dict[str, Any]:
+        p50, p99 = (np.percentile(self.samples, [50, 99]).tolist()
+                    if self.samples else (0.0, 0.0))
+        return {
+            "name": self.name,
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "p50_seconds": p50,
+            "p99_seconds": p99,
+            "allocated_bytes": self.allocated_bytes,
+        }
+
+
+class Instrumentation:
+    """Patch target methods to record call metrics while enabled"""
+
+    def __init__(self, targets: Iterable[Tuple[type, Iterable[str]]] = DEFAULT_TARGETS,
+                 sink=None, track_memory: bool = False, max_samples: int = 10_000):
+        self.targets = [(owner, tuple(names)) for owner, names in targets]
+        self.sink = sink
+        self.track_memory = track_memory
+        self.max_samples = max_samples
+        self.metrics: Dict[str, Metric] = {}
+        self._lock = Lock()
+        self._patched: List[Tuple[type, str, Any]] = []
+        self._started_tracemalloc = False
+        self.enabled = False
+
+    def __enter__(self) -> "Instrumentation":
+        return self.enable()
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def enable(self) -> "Instrumentation":
+        global _active
+        with _active_lock:
+            if _active is self:
+                return self
+            if _active is not None:
+                raise RuntimeError("Another Instrumentation is already enabled")
+            _active = self
+        self.enabled = True
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        for owner, names in self.targets:
+            for name in names:
+                self._patch(owner, name)
+        return self
+
+    def disable(self) -> None:
+        global _active
+        # Restore in reverse so stacked patches unwind correctly
+        while self._patched:
+            owner, name, original = self._patched.pop()
+            setattr(owner, name, original)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.enabled = False
+        with _active_lock:
+            if _active is self:
+                _active = None
+
+    def reset(self) -> None:
+        """Drop all recorded metrics"""
+        with self._lock:
+            self.metrics = {}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries of every metric recorded so far, keyed by name"""
+        with self._lock:
+            return {name: metric.summary() for name, metric in self.metrics.items()}
+
+    def export(self, sink=None) -> None:
+        """Send the current summaries to ``sink`` (default: the configured sink)"""
+        sink = sink or self.sink
+        if sink is None:
+            raise ValueError("No sink to export to")
+        sink.write(list(self.stats().values()))
+
+    # ------------------------------------------------------------------
+    def _patch(self, owner: type, name: str) -> None:
+        # Patch the class that defines the method so subclasses keep
+        # inheriting it, and skip methods the tree does not define
+        for cls in owner.__mro__:
+            if name in cls.__dict__:
+                break
+        else:
+            return
+        original = cls.__dict__[name]
+        if not inspect.isfunction(original):
+            return
+        if any((cls, name) == (patched, attr) for patched, attr, _ in self._patched):
+            return
+        setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", original))
+        self._patched.append((cls, name, original))
+
+    def _metric(self, name: str) -> Metric:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Metric(name, self.max_samples)
+        return metric
+
+    def _record(self, name: str, seconds: float, allocated: int) -> None:
+        with self._lock:
+            self._metric(name).record(seconds, allocated)
+
+    def _wrap(self, name: str, function):
+        track_memory = self.track_memory
+
+        def measure_start():
+            memory = tracemalloc.get_traced_memory()[0] if track_memory else 0
+            return time.perf_counter(), memory
+
+        def measure_end(start):
+            seconds = time.perf_counter() - start[0]
+            allocated = (tracemalloc.get_traced_memory()[0] - start[1]
+                         if track_memory else 0)
+            self._record(name, seconds, max(allocated, 0))
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                start = measure_start()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    measure_end(start)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = measure_start()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                measure_end(start)
+        return wrapper
+
+
+# ----------------------------------------------------------------------
+# Sinks
+# ----------------------------------------------------------------------
+class MemorySink:
+    """Keep every export in memory"""
+
+    def __init__(self):
+        self.exports: List[List[Dict[str, Any]]] = []
+
+    def write(self, summaries: List[Dict[str, Any]]) -> None:
+        self.exports.append(summaries)
+
+    @property
+    def latest(self) -> List[Dict[str, Any]]:
+        return self.exports[-1] if self.exports else []
+
+
+class _StreamSink(ABC):
+    """Sink writing to a path or an open text stream; subclasses pick the format"""
+    # File mode used when ``target`` is a path
+    mode = "a"
+
+    def __init__(self, target):
+        # A path is opened per export; an open stream is written to directly
+        self.target = target
+
+    def write(self, summaries: List[Dict[str, Any]]) -> None:
+        if isinstance(self.target, str):
+            with open(self.target, self.mode) as stream:
+                self._render(stream, summaries)
+        else:
+            self._render(self.target, summaries)
+            self.target.flush()
+
+    @abstractmethod
+    def _render(self, stream: TextIO, summaries: List[Dict[str, Any]]) -> None:
+        """Write one export of ``summaries`` to ``stream``"""
+
+
+class JsonLinesSink(_StreamSink):
+    """Append one JSON object per metric, stamped with the export time"""
+    mode = "a"
+
+    def _render(self, stream: TextIO, summaries: List[Dict[str, Any]]) -> None:
+        timestamp = time.time()
+        for summary in summaries:
+            stream.write(json.dumps(dict(summary, timestamp=timestamp)) + "\n")
+
+
+class PrometheusSink(_StreamSink):
+    """Write the metrics in the Prometheus text exposition format"""
+    mode = "w"
+    prefix = "wisdom"
+
+    def _render(self, stream: TextIO, summaries: List[Dict[str, Any]]) -> None:
+        prefix = self.prefix
+        lines = [
+            f"# HELP {prefix}_calls_total Calls of an instrumented method.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        lines += [f'{prefix}_calls_total{{method="{s["name"]}"}} {s["count"]}'
+                  for s in summaries]
+        lines += [
+            f"# HELP {prefix}_latency_seconds Latency of an instrumented method.",
+            f"# TYPE {prefix}_latency_seconds summary",
+        ]
+        for s in summaries:
+            lines += [
+                f'{prefix}_latency_seconds{{method="{s["name"]}",quantile="0.5"}} {s["p50_seconds"]!r}',
+                f'{prefix}_latency_seconds{{method="{s["name"]}",quantile="0.99"}} {s["p99_seconds"]!r}',
+                f'{prefix}_latency_seconds_sum{{method="{s["name"]}"}} {s["total_seconds"]!r}',
+                f'{prefix}_latency_seconds_count{{method="{s["name"]}"}} {s["count"]}',
+            ]
+        lines += [
+            f"# HELP {prefix}_allocated_bytes_total Net bytes allocated by an instrumented method.",
+            f"# TYPE {prefix}_allocated_bytes_total counter",
+        ]
+        lines += [f'{prefix}_allocated_bytes_total{{method="{s["name"]}"}} {s["allocated_bytes"]}'
+                  for s in summaries]
+        stream.write("\n".join(lines) + "\n")
@@ -1,8 +1,9 @@
 from agent import FashionAgent
 from env import FashionRoomEnv
+from runlog import RunRecorder, phase_stats, format_stats
 
 
-def main():
+def main(log_path="log/demo.5.jsonl"):
     # Initialize environment and agents
     fashion_room = FashionRoomEnv()
     fashion_agent_1 = FashionAgent()
@@ -46,49 +47,66 @@ def main():
         ]
     }
 
+    agent_names = {
+        fashion_agent_1: "fashion_agent_1",
+        fashion_agent_2: "fashion_agent_2",
+        fashion_agent_3: "fashion_agent_3",
+        fashion_agent_4: "fashion_agent_4"
+    }
+
     print("Demo 5: Fashion Team Collaboration")
     print("----------------------------------")
 
-    # Process each phase in the product cycle
-    for phase in team_workflow["product_cycle"]:
-        print(f"\nExecuting Phase: {phase['phase']}")
-
-        # 1. Perception Phase - Gather information
-        perception_data = gather_team_perception(
-            phase["lead"],
-            phase["supporters"],
-            fashion_room
-        )
-        print("Perception Phase Complete")
-
-        '''
-        # 2. Planning Phase - Create strategies
-        phase_plans = create_team_plans(
-            phase["lead"],
-            phase["supporters"],
-            perception_data,
-            phase["tasks"]
-        )
-        print("Planning Phase Complete")
-
-        # 3. Reasoning Phase - Make decisions
-        team_decisions = reason_about_execution(
-            phase["lead"],
-            phase["supporters"],
-            phase_plans,
-            perception_data
-        )
-        print("Reasoning Phase Complete")
-
-        # 4. Action Phase - Execute decisions
-        execute_team_actions(
-            phase["lead"],
-            phase["supporters"],
-            team_decisions,
-            fashion_room
-        )
-        print("Action Phase Complete")
-        '''
+    with RunRecorder(log_path) as recorder:
+        recorder.record("demo", name="Fashion Team Collaboration", agents={
+            name: agent.core_task for agent, name in agent_names.items()})
+
+        # Process each phase in the product cycle
+        for phase in team_workflow["product_cycle"]:
+            lead = agent_names[phase["lead"]]
+            supporters = [agent_names[agent] for agent in phase["supporters"]]
+            with recorder.phase(phase["phase"], lead=lead, supporters=supporters,
+                                tasks=phase["tasks"]):
+                # 1. Perception Phase - Gather information
+                with recorder.stage(phase["phase"], "perception", agent=lead) as outputs:
+                    perception_data = gather_team_perception(
+                        phase["lead"],
+                        phase["supporters"],
+                        fashion_room
+                    )
+                    outputs["perception_keys"] = sorted(perception_data)
+
+                '''
+                # 2. Planning Phase - Create strategies
+                phase_plans = create_team_plans(
+                    phase["lead"],
+                    phase["supporters"],
+                    perception_data,
+                    phase["tasks"]
+                )
+                print("Planning Phase Complete")
+
+                # 3. Reasoning Phase - Make decisions
+                team_decisions = reason_about_execution(
+                    phase["lead"],
+                    phase["supporters"],
+                    phase_plans,
+                    perception_data
+                )
+                print("Reasoning Phase Complete")
+
+                # 4. Action Phase - Execute decisions
+                execute_team_actions(
+                    phase["lead"],
+                    phase["supporters"],
+                    team_decisions,
+                    fashion_room
+                )
+                print("Action Phase Complete")
+                '''
+
+    # Summarize the run from the log instead of printing as we go
+    print(format_stats(phase_stats(log_path, run=recorder.run_id)))
 
 
 def gather_team_perception(lead_agent, support_agents, environment):
@@ -179,4 +197,8 @@ def execute_team_actions(lead_agent, support_agents, decisions, environment):
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Demo 5: Fashion Team Collaboration")
+    parser.add_argument("--output", default="log/demo.5.jsonl",
+                        help="JSON Lines file the run is recorded to")
+    main(parser.parse_args().output)
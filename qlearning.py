@@ -0,0 +1,149 @@
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from storage import adjacency_csr
+
+
+Ids = Union[Sequence[str], np.ndarray]
+
+
+class QTable:
+    """Sparse state x action Q-value table over the action graph.
+
+    Every action-space edge ``state -> action`` holds one Q-value, stored in
+    CSR order next to the graph adjacency, so updates and argmax selection
+    run as NumPy operations over whole batches of transitions or states.
+    The table is a snapshot: rebuild it after changing the graph structure,
+    and copy learned values back into the graph with ``write_back`` (or
+    ``WisdomGraph.store_q_table``) before saving it.
+    """
+
+    def __init__(self, node_ids: List[str], indptr: np.ndarray, indices: np.ndarray,
+                 q_values: np.ndarray):
+        self.node_ids = list(node_ids)
+        self.index: Dict[str, int] = {
+            node_id: row for row, node_id in enumerate(self.node_ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.q = np.asarray(q_values, dtype=np.float64)
+
+        # Sorted (state, action) keys locate an edge's Q-value by binary search
+        sources = np.repeat(np.arange(len(self.node_ids), dtype=np.int64),
+                            np.diff(indptr))
+        keys = sources * max(len(self.node_ids), 1) + indices
+        self._edge_order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._edge_order]
+
+    @classmethod
+    def from_graph(cls, action_graph) -> "QTable":
+        """Build a table whose initial Q-values are the action nodes' rewards"""
+        node_ids, indptr, indices, _ = adjacency_csr(action_graph)
+        rewards = np.fromiter(
+            (action_graph.nodes[node_id]["data"].reward for node_id in node_ids),
+            dtype=np.float64, count=len(node_ids))
+        # Compact spaces hand out their live CSR arrays, which edge removal
+        # edits in place
+        return cls(node_ids, indptr.copy(), indices.copy(), rewards[indices])
+
+    def node_rewards(self) -> Dict[str, float]:
+        """Reward of every action node with incoming edges: the mean Q-value of those edges"""
+        size = len(self.node_ids)
+        counts = np.bincount(self.indices, minlength=size)
+        totals = np.bincount(self.indices, weights=self.q, minlength=size)
+        rows = np.flatnonzero(counts)
+        return dict(zip([self.node_ids[row] for row in rows],
+                        (totals[rows] / counts[rows]).tolist()))
+
+    def write_back(self, action_graph) -> None:
+        """Store ``node_rewards`` on the action graph's nodes, skipping removed ones.
+
+        Writes node data in place; graphs forked from a frozen template
+        should use ``WisdomGraph.store_q_table`` instead.
+        """
+        for node_id, reward in self.node_rewards().items():
+            if node_id in action_graph:
+                action_graph.nodes[node_id]["data"].reward = reward
+
+    def rows(self, node_ids: Ids) -> np.ndarray:
+        """Map node ids (or pass through integer rows) to row numbers"""
+        if isinstance(node_ids, np.ndarray) and node_ids.dtype.kind in "iu":
+            return node_ids.astype(np.int64, copy=False)
+        return np.fromiter((self.index[node_id] for node_id in node_ids),
+                           dtype=np.int64)
+
+    def edge_positions(self, states: Ids, actions: Ids) -> np.ndarray:
+        """Locate the Q-value slot of each (state, action) pair"""
+        keys = self.rows(states) * max(len(self.node_ids), 1) + self.rows(actions)
+        found = np.searchsorted(self._sorted_keys, keys)
+        found = np.minimum(found, len(self._sorted_keys) - 1)
+        if len(self._sorted_keys) == 0 or np.any(self._sorted_keys[found] != keys):
+            raise KeyError("Q-table has no entry for some (state, action) pairs")
+        return self._edge_order[found]
+
+    def q_values(self, states: Ids, actions: Ids) -> np.ndarray:
+        return self.q[self.edge_positions(states, actions)]
+
+    def update_q_values(self, states: Ids, actions: Ids, rewards,
+                        learning_rate: float = 0.1, discount: float = 0.0,
+                        next_states: Optional[Ids] = None) -> None:
+        """Apply a batch of transitions ``Q += lr * (target - Q)``.
+
+        Targets are ``reward + discount * max Q(next_state)`` evaluated
+        before the batch. Repeated (state, action) pairs give the same result
+        as applying the transitions one after another in batch order.
+        """
+        positions = self.edge_positions(states, actions)
+        targets = np.asarray(rewards, dtype=np.float64)
+        if discount and next_states is not None:
+            targets = targets + discount * self.max_q(next_states)
+
+        # Group repeats of a slot; the j-th of k updates is weighted by
+        # lr * (1 - lr) ** (k - 1 - j) and the old value by (1 - lr) ** k
+        order = np.argsort(positions, kind="stable")
+        slots, starts, counts = np.unique(
+            positions[order], return_index=True, return_counts=True)
+        group = np.repeat(np.arange(len(slots)), counts)
+        rank = np.arange(len(order)) - starts[group]
+        decay = 1.0 - learning_rate
+        weights = learning_rate * decay ** (counts[group] - 1 - rank)
+        increments = np.bincount(group, weights=weights * targets[order],
+                                 minlength=len(slots))
+        self.q[slots] = self.q[slots] * decay ** counts + increments
+
+    def _segments(self, states: Ids):
+        rows = self.rows(states)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        segment = np.repeat(np.arange(len(rows)), lengths)
+        positions = np.repeat(starts, lengths) + (
+            np.arange(int(lengths.sum())) - offsets[segment])
+        return positions, segment, offsets, lengths
+
+    def max_q(self, states: Ids) -> np.ndarray:
+        """Best Q-value of each state; states without actions score 0"""
+        positions, _, offsets, lengths = self._segments(states)
+        best = np.zeros(len(lengths))
+        nonempty = lengths > 0
+        if positions.size:
+            best[nonempty] = np.maximum.reduceat(
+                self.q[positions], offsets[nonempty])
+        return best
+
+    def best_actions(self, states: Ids) -> np.ndarray:
+        """Row of the highest-Q action per state (first on ties), -1 if none"""
+        positions, segment, offsets, lengths = self._segments(states)
+        best = np.full(len(lengths), -1, dtype=np.int64)
+        if not positions.size:
+            return best
+        values = self.q[positions]
+        nonempty = lengths > 0
+        maxima = np.zeros(len(lengths))
+        maxima[nonempty] = np.maximum.reduceat(values, offsets[nonempty])
+        hits = np.flatnonzero(values == maxima[segment])
+        winners, first = np.unique(segment[hits], return_index=True)
+        best[winners] = self.indices[positions[hits[first]]]
+        return best
+
+    def best_action_ids(self, states: Ids) -> List[Optional[str]]:
+        return [self.node_ids[row] if row >= 0 else None
+                for row in self.best_actions(states)]
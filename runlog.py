@@ -0,0 +1,262 @@
+"""Structured, append-only run logs.
+
+``RunRecorder`` writes one JSON object per line: every record carries the
+run id, the seconds since the run started and an ``event`` name, plus
+whatever fields the caller adds (phase, agent, stage, timings, strategy
+sizes, chosen actions). Records are buffered and written in batches, so
+recording costs a dict and a ``json.dumps`` rather than a system call.
+
+``iter_records`` and ``phase_stats`` read a log back one line at a time,
+so arbitrarily long runs can be summarized in constant memory::
+
+    python runlog.py log/demo.5.jsonl
+"""
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Union
+from collections.abc import Mapping
+from contextlib import contextmanager
+from threading import Lock
+import json
+import math
+import os
+import sys
+import time
+import uuid
+
+
+# Keys every record carries; callers' fields may not reuse them
+RECORD_KEYS = ("run", "t", "event")
+
+
+def _check_fields(fields, reserved) -> None:
+    clashes = [key for key in fields if key in reserved]
+    if clashes:
+        raise ValueError(f"record fields {clashes} clash with reserved keys {list(reserved)}")
+
+
+class _StageOutputs(dict):
+    """Dict yielded by ``stage`` and ``phase``; refuses the record's reserved keys.
+
+    A clashing key fails where it is set, inside the timed block, instead
+    of when the record is written on the way out.
+    """
+
+    def __init__(self, reserved):
+        super().__init__()
+        self.reserved = reserved
+
+    def __setitem__(self, key, value) -> None:
+        _check_fields((key,), self.reserved)
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs) -> None:
+        items = dict(*args, **kwargs)
+        _check_fields(items, self.reserved)
+        super().update(items)
+
+    def setdefault(self, key, default=None):
+        _check_fields((key,), self.reserved)
+        return super().setdefault(key, default)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+class RunRecorder:
+    """Buffered JSON-lines writer for one run.
+
+    The buffer is flushed when it holds ``buffer_size`` records, when a
+    record arrives more than ``flush_interval`` seconds after the last
+    flush, and on ``close``.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 256, flush_interval: float = 1.0,
+                 run_id: Optional[str] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self._stream = open(path, "a", encoding="utf-8")
+        self._buffer: List[str] = []
+        self._lock = Lock()
+        self._start = time.perf_counter()
+        self._last_flush = self._start
+        self.record("run_start", wall_clock=time.time())
+
+    def __enter__(self) -> "RunRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, event: str, /, **fields) -> None:
+        """Append one record; ``fields`` may not reuse ``RECORD_KEYS``"""
+        _check_fields(fields, RECORD_KEYS)
+        now = time.perf_counter()
+        line = json.dumps({"run": self.run_id, "t": now - self._start,
+                           "event": event, **fields}, default=str)
+        with self._lock:
+            self._buffer.append(line)
+            if (len(self._buffer) >= self.buffer_size or
+                    now - self._last_flush >= self.flush_interval):
+                self._flush(now)
+
+    @contextmanager
+    def stage(self, phase: str, stage: str, agent: Optional[str] = None, **fields):
+        """Time a block and record it as one ``stage`` record.
+
+        Yields a dict; keys set on it (e.g. output sizes) are added to the
+        record. Neither ``fields`` nor those keys may reuse the record's own
+        keys (``run``, ``t``, ``event``, ``phase``, ``stage``, ``agent``,
+        ``seconds``); a clash raises ValueError where it is made.
+        """
+        reserved = RECORD_KEYS + ("phase", "stage", "agent", "seconds")
+        _check_fields(fields, reserved)
+        outputs = _StageOutputs(reserved)
+        start = time.perf_counter()
+        try:
+            yield outputs
+        finally:
+            self.record("stage", **{**fields, **outputs}, phase=phase, stage=stage,
+                        agent=agent, seconds=time.perf_counter() - start)
+
+    @contextmanager
+    def phase(self, phase: str, **fields):
+        """Time a whole phase and record it as one ``phase`` record.
+
+        Keys are checked as in ``stage``, against ``run``, ``t``, ``event``,
+        ``phase`` and ``seconds``.
+        """
+        reserved = RECORD_KEYS + ("phase", "seconds")
+        _check_fields(fields, reserved)
+        outputs = _StageOutputs(reserved)
+        start = time.perf_counter()
+        try:
+            yield outputs
+        finally:
+            self.record("phase", **{**fields, **outputs}, phase=phase,
+                        seconds=time.perf_counter() - start)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush(time.perf_counter())
+
+    def close(self) -> None:
+        if self._stream.closed:
+            return
+        self.record("run_end")
+        self.flush()
+        self._stream.close()
+
+    def _flush(self, now: float) -> None:
+        if self._buffer:
+            self._stream.write("\n".join(self._buffer) + "\n")
+            self._stream.flush()
+            self._buffer = []
+        self._last_flush = now
+
+
+def strategy_size(strategy: Any) -> int:
+    """Number of leaf values in a (nested) strategy, for logging its size"""
+    if isinstance(strategy, Mapping):
+        return sum(strategy_size(value) for value in strategy.values())
+    if isinstance(strategy, (list, tuple)):
+        return sum(strategy_size(value) for value in strategy)
+    return 1
+
+
+def iter_records(path: str, event: Optional[str] = None,
+                 run: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream the records of a log, optionally filtered by event and run id.
+
+    A truncated final line (from a run that was killed mid-write) is skipped.
+    """
+    with open(path, encoding="utf-8") as stream:
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event is not None and record.get("event") != event:
+                continue
+            if run is not None and record.get("run") != run:
+                continue
+            yield record
+
+
+class RunningStats:
+    """Count, mean, min, max and standard deviation in one pass (Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.mean * self.count,
+            "mean": self.mean,
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum if self.count else 0.0,
+            "stdev": math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0,
+        }
+
+
+def phase_stats(records: Union[str, Iterable[Dict[str, Any]]],
+                run: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Timing statistics per phase and stage, streamed from a log.
+
+    Returns ``{phase: {stage: stats}}`` where whole-phase records appear
+    under the stage name ``"total"``.
+    """
+    if isinstance(records, str):
+        records = iter_records(records, run=run)
+    stats: Dict[str, Dict[str, RunningStats]] = {}
+    for record in records:
+        if run is not None and record.get("run") != run:
+            continue
+        event = record.get("event")
+        if event == "stage":
+            stage = record["stage"]
+        elif event == "phase":
+            stage = "total"
+        else:
+            continue
+        stats.setdefault(record["phase"], {}).setdefault(
+            stage, RunningStats()).add(record["seconds"])
+    return {phase: {stage: values.as_dict() for stage, values in stages.items()}
+            for phase, stages in stats.items()}
+
+
+def format_stats(stats: Dict[str, Dict[str, Dict[str, float]]]) -> str:
+    lines = [f"{'phase':<22} {'stage':<12} {'count':>6} {'mean ms':>10} "
+             f"{'max ms':>10} {'total ms':>10}"]
+    for phase, stages in stats.items():
+        for stage, values in stages.items():
+            lines.append(
+                f"{phase:<22} {stage:<12} {values['count']:>6} "
+                f"{values['mean'] * 1e3:>10.3f} {values['max'] * 1e3:>10.3f} "
+                f"{values['total'] * 1e3:>10.3f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python runlog.py LOG [RUN_ID]")
+    print(format_stats(phase_stats(sys.argv[1], run=(sys.argv[2:] or [None])[0])))
@@ -0,0 +1,167 @@
+"""Dependency-aware task scheduling for planning timelines.
+
+Tasks form a DAG through prerequisite edges (``prerequisite -> task``).
+``schedule`` computes, in O((V + E) log V):
+
+* the earliest start of every task with unlimited workers and the
+  critical path through the DAG (classic CPM forward/backward pass), and
+* a list schedule on ``workers`` parallel workers, where ready tasks are
+  started in order of their bottom level (longest remaining path to the
+  end of the project), which keeps the critical path busy first.
+"""
+from typing import Dict, List, Tuple, Any, Iterable, Optional, Sequence
+import heapq
+import numpy as np
+
+
+def _index_edges(tasks: List[str], prerequisites: Iterable[Tuple[str, str]]):
+    """CSR successor lists over task indices, ignoring edges leaving the task set"""
+    index = {task: i for i, task in enumerate(tasks)}
+    sources, targets = [], []
+    for prerequisite, task in prerequisites:
+        source, target = index.get(prerequisite), index.get(task)
+        if source is None or target is None or source == target:
+            continue
+        sources.append(source)
+        targets.append(target)
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(len(tasks) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=len(tasks)), out=indptr[1:])
+    in_degree = np.bincount(targets, minlength=len(tasks))
+    return indptr.tolist(), targets[order].tolist(), in_degree.tolist()
+
+
+def topological_order(count: int, indptr: List[int], successors: List[int],
+                      in_degree: List[int]) -> List[int]:
+    """Kahn's algorithm; ties keep input order. Raises ValueError on cycles."""
+    remaining = list(in_degree)
+    ready = [i for i in range(count) if remaining[i] == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        node = heapq.heappop(ready)
+        order.append(node)
+        for successor in successors[indptr[node]:indptr[node + 1]]:
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                heapq.heappush(ready, successor)
+    if len(order) != count:
+        raise ValueError("Task prerequisites contain a cycle")
+    return order
+
+
+def schedule(tasks: Sequence[str], durations: Sequence[float],
+             prerequisites: Iterable[Tuple[str, str]] = (),
+             workers: Optional[int] = None) -> Dict[str, Any]:
+    """Schedule ``tasks`` respecting ``prerequisites`` on ``workers`` workers.
+
+    ``workers=None`` means one worker per task, i.e. every task starts as
+    soon as its prerequisites are done. Returns ``{"tasks": {task: {...}},
+    "makespan", "critical_path", "critical_path_length", "workers"}`` where
+    each task has ``start_time``, ``duration``, ``end_time``, ``worker``,
+    ``earliest_start`` and ``slack``.
+    """
+    tasks = list(dict.fromkeys(tasks))
+    count = len(tasks)
+    if len(durations) != count:
+        raise ValueError("Expected one duration per (distinct) task")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be positive")
+    duration = [float(value) for value in durations]
+    indptr, successors, in_degree = _index_edges(tasks, prerequisites)
+    order = topological_order(count, indptr, successors, in_degree)
+
+    # Forward pass: earliest start with unlimited workers
+    earliest = [0.0] * count
+    for node in order:
+        finish = earliest[node] + duration[node]
+        for successor in successors[indptr[node]:indptr[node + 1]]:
+            if finish > earliest[successor]:
+                earliest[successor] = finish
+    project_end = max((earliest[i] + duration[i] for i in range(count)), default=0.0)
+
+    # Backward pass: latest start and bottom level (remaining path length)
+    latest = [0.0] * count
+    bottom = [0.0] * count
+    for node in reversed(order):
+        latest_finish = project_end
+        longest_tail = 0.0
+        for successor in successors[indptr[node]:indptr[node + 1]]:
+            latest_finish = min(latest_finish, latest[successor])
+            longest_tail = max(longest_tail, bottom[successor])
+        latest[node] = latest_finish - duration[node]
+        bottom[node] = duration[node] + longest_tail
+
+    critical_path = _critical_path(order, indptr, successors, earliest, latest, duration)
+    start, finish, assigned = _list_schedule(
+        count, indptr, successors, in_degree, duration, bottom, workers)
+
+    return {
+        "tasks": {
+            task: {
+                "start_time": start[i],
+                "duration": duration[i],
+                "end_time": finish[i],
+                "worker": assigned[i],
+                "earliest_start": earliest[i],
+                "slack": latest[i] - earliest[i],
+            }
+            for i, task in enumerate(tasks)
+        },
+        "makespan": max(finish, default=0.0),
+        "critical_path": [tasks[i] for i in critical_path],
+        "critical_path_length": project_end,
+        "workers": workers,
+    }
+
+
+def _critical_path(order, indptr, successors, earliest, latest, duration,
+                   tolerance: float = 1e-9) -> List[int]:
+    """Follow zero-slack tasks from the first critical start to the project end"""
+    critical = [abs(latest[i] - earliest[i]) <= tolerance for i in range(len(order))]
+    path = []
+    node = next((i for i in order if critical[i] and earliest[i] <= tolerance), None)
+    while node is not None:
+        path.append(node)
+        finish = earliest[node] + duration[node]
+        node = next((successor for successor in successors[indptr[node]:indptr[node + 1]]
+                     if critical[successor] and abs(earliest[successor] - finish) <= tolerance),
+                    None)
+    return path
+
+
+def _list_schedule(count, indptr, successors, in_degree, duration, priority, workers):
+    """Event-driven list scheduling: start ready tasks by descending priority"""
+    workers = count if workers is None else workers
+    remaining = list(in_degree)
+    ready = [(-priority[i], i) for i in range(count) if remaining[i] == 0]
+    heapq.heapify(ready)
+    free_workers = list(range(min(workers, count)))
+    heapq.heapify(free_workers)
+    running: List[Tuple[float, int, int]] = []  # (finish, task, worker)
+    start = [0.0] * count
+    finish = [0.0] * count
+    assigned = [0] * count
+    now = 0.0
+    done = 0
+    while done < count:
+        while ready and free_workers:
+            _, task = heapq.heappop(ready)
+            worker = heapq.heappop(free_workers)
+            start[task] = now
+            finish[task] = now + duration[task]
+            assigned[task] = worker
+            heapq.heappush(running, (finish[task], task, worker))
+        # Advance to the next completion and release everything finishing then
+        now = running[0][0]
+        while running and running[0][0] <= now:
+            _, task, worker = heapq.heappop(running)
+            done += 1
+            heapq.heappush(free_workers, worker)
+            for successor in successors[indptr[task]:indptr[task + 1]]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    heapq.heappush(ready, (-priority[successor], successor))
+    return start, finish, assigned
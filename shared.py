@@ -0,0 +1,138 @@
+"""Read-mostly WisdomGraph shared between processes.
+
+``SharedWisdom`` writes a snapshot of a WisdomGraph into one
+``multiprocessing.shared_memory`` segment and is the single writer for it:
+numeric node columns (level, reward, probability) are updated in place
+and every attached process sees the new values immediately. Other
+processes call ``attach_wisdom(name)`` to get a frozen, copy-on-write
+WisdomGraph whose columns and adjacency are views of the segment, so
+nothing is pickled or copied per process.
+
+The node and edge structure is fixed for the lifetime of a segment. A
+reader that mutates its graph copies the affected space first and from
+then on no longer sees the writer's updates for that space; structural
+changes are published by creating a new segment.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+from multiprocessing import shared_memory
+from threading import Lock
+import numpy as np
+
+from graph import WisdomGraph, SpaceType
+from snapshot import snapshot_layout, write_snapshot, wisdom_from_buffer
+
+
+COLUMNS = ("level", "reward", "probability")
+
+# Per-process attachments: segment name -> (segment, frozen template)
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, WisdomGraph]] = {}
+_attach_lock = Lock()
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Readers must not unlink the segment when they exit (Python 3.13+)
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _segment_buffer(segment: shared_memory.SharedMemory, writable: bool) -> np.ndarray:
+    buffer = np.ndarray(segment.size, dtype=np.uint8, buffer=segment.buf)
+    if not writable:
+        buffer.flags.writeable = False
+    return buffer
+
+
+def attach_wisdom(name: str) -> WisdomGraph:
+    """Return a copy-on-write WisdomGraph over the shared segment ``name``.
+
+    The segment is mapped once per process; later calls fork the same
+    template, which costs a few attribute copies.
+    """
+    with _attach_lock:
+        if name not in _attached:
+            segment = _open_segment(name)
+            template = wisdom_from_buffer(
+                _segment_buffer(segment, writable=False), storage="compact")
+            template.shared_segment = name
+            _attached[name] = (segment, template.freeze())
+        return _attached[name][1].fork()
+
+
+def detach_wisdom(name: str) -> None:
+    """Drop this process's mapping of ``name`` once no graph uses it"""
+    with _attach_lock:
+        segment, _ = _attached.pop(name, (None, None))
+    if segment is not None:
+        try:
+            segment.close()
+        except BufferError:
+            # Graphs forked from the template still hold views; the mapping
+            # is released when they are garbage collected
+            pass
+
+
+class SharedWisdom:
+    """Owner and single writer of a shared-memory WisdomGraph segment"""
+
+    def __init__(self, wisdom: WisdomGraph, name: Optional[str] = None):
+        _, _, size = snapshot_layout(wisdom)
+        self.segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        write_snapshot(wisdom, self.segment.buf)
+        # Writer view: same arrays the readers map, but writable
+        self._view = wisdom_from_buffer(
+            _segment_buffer(self.segment, writable=True), storage="compact")
+        self._lock = Lock()
+
+    @property
+    def name(self) -> str:
+        return self.segment.name
+
+    def __enter__(self) -> "SharedWisdom":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.unlink()
+
+    def attach(self) -> WisdomGraph:
+        """Copy-on-write reader graph for this process"""
+        return attach_wisdom(self.name)
+
+    def set_values(self, space_type: SpaceType, column: str,
+                   node_ids: Iterable[str], values) -> None:
+        """Write ``values`` into one numeric column for ``node_ids``"""
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column: {column}")
+        graph = getattr(self._view, f"{space_type.value}_graph")
+        rows = graph.rows(node_ids)
+        with self._lock:
+            graph.column(column)[1][rows] = values
+
+    def get_values(self, space_type: SpaceType, column: str,
+                   node_ids: Iterable[str]) -> np.ndarray:
+        """Current values of one numeric column for ``node_ids``"""
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column: {column}")
+        graph = getattr(self._view, f"{space_type.value}_graph")
+        return graph.column(column)[1][graph.rows(node_ids)].copy()
+
+    def update_q_value(self, state_id: str, action_id: str, reward: float,
+                       learning_rate: float = 0.1) -> None:
+        """Shared counterpart of WisdomGraph.update_q_value"""
+        with self._lock:
+            self._view.update_q_value(state_id, action_id, reward, learning_rate)
+
+    def close(self) -> None:
+        """Release the writer's mapping, leaving the segment in place"""
+        self._view = None
+        detach_wisdom(self.name)
+        try:
+            self.segment.close()
+        except BufferError:
+            pass
+
+    def unlink(self) -> None:
+        """Release and destroy the segment"""
+        self.close()
+        self.segment.unlink()
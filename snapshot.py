@@ -0,0 +1,357 @@
+"""Binary snapshot format for WisdomGraph.
+
+A snapshot is one file laid out as::
+
+    MAGIC | header length (uint64) | JSON header | 64-byte aligned array blocks
+
+The header records, per space, where each array block lives together with
+its dtype and shape. Numeric node columns (level, reward, probability)
+and the CSR adjacency are stored as raw little-endian arrays, node ids as
+one UTF-8 string table with offsets, and features as msgpack (JSON when
+msgpack is not installed) with offsets. Loading maps the file and builds
+compact spaces whose columns are views of the mapping, so nothing is
+copied until a value is written; features are decoded on first access.
+"""
+from typing import Dict, List, Tuple, Any, Optional
+import json
+import struct
+import numpy as np
+import networkx as nx
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+from graph import (WisdomGraph, WisdomNode, SpaceType, _node_column, _node_features,
+                   CompactPerceptionGraph, CompactPlanningGraph, CompactActionGraph)
+from storage import CompactSpace, adjacency_csr
+
+
+MAGIC = b"WSDMSNP1"
+ALIGNMENT = 64
+FORMAT_VERSION = 1
+
+# (array name, dtype) written for every space
+_SPACE_ARRAYS = (
+    ("level", "<i4"),
+    ("reward", "<f8"),
+    ("probability", "<f8"),
+    ("indptr", "<i8"),
+    ("indices", "<i8"),
+    ("weights", "<f8"),
+    ("id_offsets", "<i8"),
+    ("id_bytes", "u1"),
+    ("feature_offsets", "<i8"),
+    ("feature_bytes", "u1"),
+)
+
+
+def _to_builtin(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, SpaceType):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} in a snapshot")
+
+
+def _encode_msgpack(value: Any) -> bytes:
+    return msgpack.packb(value, default=_to_builtin)
+
+
+def _decode_msgpack(data) -> Any:
+    return msgpack.unpackb(bytes(data), strict_map_key=False)
+
+
+def _encode_json(value: Any) -> bytes:
+    return json.dumps(value, default=_to_builtin).encode("utf-8")
+
+
+def _decode_json(data) -> Any:
+    return json.loads(bytes(data))
+
+
+def _feature_codec(name: Optional[str] = None):
+    """Return ``(name, encode, decode)`` for the feature encoding"""
+    name = name or ("msgpack" if msgpack is not None else "json")
+    if name == "msgpack":
+        if msgpack is None:
+            raise ImportError("snapshot features are msgpack encoded; install msgpack")
+        return name, _encode_msgpack, _decode_msgpack
+    if name == "json":
+        return name, _encode_json, _decode_json
+    raise ValueError(f"Unknown feature codec: {name}")
+
+
+def _string_table(strings: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in strings], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(strings), dtype=np.uint8)
+
+
+class LazyFeatureList:
+    """Feature dicts decoded from a snapshot buffer on first access"""
+
+    _PENDING = object()
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray, decode):
+        self._offsets = offsets
+        self._data = data
+        self._decode = decode
+        self._convert = None
+        self._items: List[Any] = [self._PENDING] * (len(offsets) - 1)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, row: int):
+        item = self._items[row]
+        if item is self._PENDING:
+            start, end = self._offsets[row], self._offsets[row + 1]
+            item = self._decode(self._data[start:end])
+            if self._convert is not None:
+                item = self._convert(item)
+            self._items[row] = item
+        return item
+
+    def __setitem__(self, row: int, value) -> None:
+        self._items[row] = value
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self._items)))
+
+    def append(self, value) -> None:
+        self._items.append(value)
+
+    def map(self, convert) -> None:
+        """Apply ``convert`` to decoded rows now and to the others once decoded"""
+        self._convert = convert
+        self._items = [item if item is self._PENDING or item is None else convert(item)
+                       for item in self._items]
+
+    def copy(self) -> "LazyFeatureList":
+        clone = LazyFeatureList.__new__(LazyFeatureList)
+        clone._offsets, clone._data, clone._decode = self._offsets, self._data, self._decode
+        clone._convert = self._convert
+        clone._items = list(self._items)
+        return clone
+
+
+def _space_arrays(graph, encode) -> Dict[str, np.ndarray]:
+    node_ids, indptr, indices, weights = adjacency_csr(graph)
+    # Compact spaces leave trailing rows without edges out of indptr
+    rows = np.full(len(node_ids) + 1, indptr[-1] if len(indptr) else 0,
+                   dtype=np.int64)
+    rows[:min(len(indptr), len(rows))] = indptr[:len(rows)]
+    indptr = rows
+    _, features = _node_features(graph)
+    id_offsets, id_bytes = _string_table(
+        [node_id.encode("utf-8") for node_id in node_ids])
+    feature_offsets, feature_bytes = _string_table(
+        [encode(feature) for feature in features])
+    return {
+        "level": _node_column(graph, "level")[1],
+        "reward": _node_column(graph, "reward")[1],
+        "probability": _node_column(graph, "probability")[1],
+        "indptr": indptr,
+        "indices": indices,
+        "weights": weights,
+        "id_offsets": id_offsets,
+        "id_bytes": id_bytes,
+        "feature_offsets": feature_offsets,
+        "feature_bytes": feature_bytes,
+    }
+
+
+def _registries(wisdom: WisdomGraph) -> Dict[str, List[str]]:
+    perception, planning = wisdom.perception_graph, wisdom.planning_graph
+    return {
+        "market_nodes": list(perception.market_nodes),
+        "trend_nodes": list(perception.trend_nodes),
+        "customer_nodes": list(perception.customer_nodes),
+        "strategy_nodes": list(planning.strategy_nodes),
+        "task_nodes": list(planning.task_nodes),
+    }
+
+
+def snapshot_layout(wisdom: WisdomGraph, codec: Optional[str] = None) -> Tuple[bytes, List[Tuple[int, np.ndarray]], int]:
+    """Plan a snapshot: returns ``(prefix, [(offset, array), ...], total_size)``.
+
+    ``prefix`` (magic, header length and header) goes at offset 0 and each
+    array at its offset, which lets callers write into files or shared
+    memory alike.
+    """
+    codec_name, encode, _ = _feature_codec(codec)
+    header = {
+        "version": FORMAT_VERSION,
+        "codec": codec_name,
+        "spaces": {},
+        "registries": _registries(wisdom),
+        "cross_space_edges": [
+            [source, target, data["source_space"].value, data["target_space"].value]
+            for source, target, data in wisdom.cross_space_edges.edges(data=True)
+        ],
+    }
+    blocks = []
+    cursor = 0
+    for space_type in SpaceType:
+        graph = getattr(wisdom, f"{space_type.value}_graph")
+        arrays = _space_arrays(graph, encode)
+        entries = {}
+        for name, dtype in _SPACE_ARRAYS:
+            array = np.ascontiguousarray(arrays[name], dtype=dtype)
+            entries[name] = {"offset": cursor, "dtype": dtype,
+                             "shape": list(array.shape)}
+            blocks.append((cursor, array))
+            cursor += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        header["spaces"][space_type.value] = {"arrays": entries,
+                                              "count": len(graph)}
+
+    # data_start is part of the header, so settle it until the header fits
+    header["data_start"] = 0
+    while True:
+        header_bytes = json.dumps(header).encode("utf-8")
+        prefix_size = len(MAGIC) + 8 + len(header_bytes)
+        data_start = -(-prefix_size // ALIGNMENT) * ALIGNMENT
+        if data_start == header["data_start"]:
+            break
+        header["data_start"] = data_start
+
+    prefix = MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes
+    blocks = [(header["data_start"] + offset, array) for offset, array in blocks]
+    return prefix, blocks, header["data_start"] + cursor
+
+
+def write_snapshot(wisdom: WisdomGraph, buffer: memoryview, codec: Optional[str] = None) -> None:
+    """Write a snapshot into a writable buffer of at least the planned size"""
+    prefix, blocks, total = snapshot_layout(wisdom, codec)
+    buffer = memoryview(buffer).cast("B")
+    if len(buffer) < total:
+        raise ValueError(f"Snapshot needs {total} bytes, buffer has {len(buffer)}")
+    buffer[:len(prefix)] = prefix
+    for offset, array in blocks:
+        buffer[offset:offset + array.nbytes] = array.view(np.uint8).reshape(-1)
+
+
+def save_wisdom(wisdom: WisdomGraph, path: str, codec: Optional[str] = None) -> None:
+    """Write ``wisdom`` to ``path`` in the snapshot format"""
+    prefix, blocks, total = snapshot_layout(wisdom, codec)
+    with open(path, "wb") as stream:
+        stream.write(prefix)
+        for offset, array in blocks:
+            stream.seek(offset)
+            stream.write(array.tobytes())
+        stream.truncate(total)
+
+
+def read_header(buffer: np.ndarray) -> Dict[str, Any]:
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a wisdom graph snapshot")
+    (length,) = struct.unpack("<Q", bytes(buffer[len(MAGIC):len(MAGIC) + 8]))
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[start:start + length]))
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {header['version']}")
+    return header
+
+
+def space_arrays(buffer: np.ndarray, header: Dict[str, Any], space_type: SpaceType) -> Dict[str, np.ndarray]:
+    """Views of one space's arrays inside a snapshot buffer"""
+    arrays = {}
+    for name, entry in header["spaces"][space_type.value]["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"]))
+        start = header["data_start"] + entry["offset"]
+        arrays[name] = buffer[start:start + count * dtype.itemsize].view(
+            dtype).reshape(entry["shape"])
+    return arrays
+
+
+def wisdom_from_buffer(buffer: np.ndarray, storage: str = "compact") -> WisdomGraph:
+    """Build a WisdomGraph over a snapshot held in a uint8 array.
+
+    With compact storage the numeric columns and adjacency are views of
+    ``buffer``; with networkx storage everything is copied into nodes.
+    """
+    header = read_header(buffer)
+    _, _, decode = _feature_codec(header["codec"])
+    wisdom = WisdomGraph(storage=storage)
+    compact_classes = {
+        SpaceType.PERCEPTION: CompactPerceptionGraph,
+        SpaceType.PLANNING: CompactPlanningGraph,
+        SpaceType.REASONING: lambda: CompactSpace(SpaceType.REASONING),
+        SpaceType.ACTION: CompactActionGraph,
+    }
+
+    for space_type in SpaceType:
+        arrays = space_arrays(buffer, header, space_type)
+        id_offsets, id_bytes = arrays["id_offsets"], arrays["id_bytes"]
+        text = id_bytes.tobytes()
+        # Plain ints: indexing a memmap element by element is slow
+        offsets = id_offsets.tolist()
+        node_ids = [text[start:end].decode("utf-8")
+                    for start, end in zip(offsets, offsets[1:])]
+        features = LazyFeatureList(
+            arrays["feature_offsets"], arrays["feature_bytes"], decode)
+        name = f"{space_type.value}_graph"
+
+        if storage == "compact":
+            graph = compact_classes[space_type]()
+            graph.load_columns(node_ids, features, arrays["level"],
+                               arrays["reward"], arrays["probability"],
+                               arrays["indptr"], arrays["indices"],
+                               arrays["weights"])
+            if hasattr(graph, "reindex"):
+                graph.reindex()
+            setattr(wisdom, name, graph)
+        else:
+            graph = getattr(wisdom, name)
+            for row, node_id in enumerate(node_ids):
+                wisdom._add_node(space_type, _snapshot_node(
+                    space_type, node_id, features[row], arrays, row))
+            indptr, indices, weights = (
+                arrays["indptr"], arrays["indices"], arrays["weights"])
+            for row, node_id in enumerate(node_ids):
+                for position in range(indptr[row], indptr[row + 1]):
+                    graph.add_edge(node_id, node_ids[indices[position]],
+                                   weight=float(weights[position]))
+
+    registries = header["registries"]
+    for kind in ("market", "trend", "customer"):
+        getattr(wisdom.perception_graph, f"{kind}_nodes").extend(
+            registries[f"{kind}_nodes"])
+    wisdom.planning_graph.strategy_nodes.extend(registries["strategy_nodes"])
+    wisdom.planning_graph.task_nodes.extend(registries["task_nodes"])
+    for source, target, source_space, target_space in header["cross_space_edges"]:
+        wisdom.add_cross_space_edge(source, target, SpaceType(source_space),
+                                    SpaceType(target_space))
+    return wisdom
+
+
+def _snapshot_node(space_type: SpaceType, node_id: str, features, arrays, row: int):
+    return WisdomNode(
+        id=node_id,
+        space_type=space_type,
+        features=features,
+        level=int(arrays["level"][row]),
+        reward=float(arrays["reward"][row]),
+        probability=float(arrays["probability"][row])
+    )
+
+
+def load_wisdom(path: str, storage: str = "compact", mmap: bool = True) -> WisdomGraph:
+    """Load a snapshot written by ``save_wisdom``.
+
+    With ``mmap`` the file is memory-mapped copy-on-write: reads come
+    straight from the page cache (shared between processes mapping the same
+    file) and writes stay private to this process.
+    """
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode="c")
+    else:
+        buffer = np.fromfile(path, dtype=np.uint8)
+    return wisdom_from_buffer(buffer, storage=storage)
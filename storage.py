@@ -0,0 +1,469 @@
+from typing import Dict, List, Tuple, Any, Iterable, Iterator, Optional, Sequence
+import networkx as nx
+import numpy as np
+
+
+class CompactNode:
+    """Row view onto a CompactSpace that behaves like a WisdomNode"""
+    __slots__ = ("_space", "id")
+
+    def __init__(self, space: "CompactSpace", node_id: str):
+        self._space = space
+        self.id = node_id
+
+    def _row(self) -> int:
+        return self._space._index[self.id]
+
+    def _writable_row(self) -> int:
+        if getattr(self._space, "frozen", False):
+            raise TypeError("nodes of a frozen graph are read-only; "
+                            "use WisdomGraph.update_node_features")
+        return self._row()
+
+    @property
+    def space_type(self):
+        return self._space.space_type
+
+    @property
+    def features(self) -> Dict[str, Any]:
+        return self._space._features[self._row()]
+
+    @features.setter
+    def features(self, value: Dict[str, Any]) -> None:
+        self._space._features[self._writable_row()] = value
+
+    @property
+    def level(self) -> int:
+        return int(self._space._level[self._row()])
+
+    @level.setter
+    def level(self, value: int) -> None:
+        self._space._level[self._writable_row()] = value
+
+    @property
+    def reward(self) -> float:
+        return float(self._space._reward[self._row()])
+
+    @reward.setter
+    def reward(self, value: float) -> None:
+        self._space._reward[self._writable_row()] = value
+
+    @property
+    def probability(self) -> float:
+        return float(self._space._probability[self._row()])
+
+    @probability.setter
+    def probability(self, value: float) -> None:
+        self._space._probability[self._writable_row()] = value
+
+    def __repr__(self) -> str:
+        return (f"CompactNode(id={self.id!r}, space_type={self.space_type}, "
+                f"level={self.level}, reward={self.reward}, "
+                f"probability={self.probability})")
+
+
+class CompactNodeView:
+    """Subset of the networkx NodeView API over a CompactSpace"""
+
+    def __init__(self, space: "CompactSpace"):
+        self._space = space
+
+    def __getitem__(self, node_id: str) -> Dict[str, CompactNode]:
+        if node_id not in self._space._index:
+            raise KeyError(node_id)
+        return {"data": CompactNode(self._space, node_id)}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._space)
+
+    def __len__(self) -> int:
+        return len(self._space)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._space
+
+    def __call__(self, data=False):
+        if not data:
+            return iter(self._space)
+        if data is True:
+            return ((node_id, {"data": CompactNode(self._space, node_id)})
+                    for node_id in self._space)
+        if data == "data":
+            return ((node_id, CompactNode(self._space, node_id))
+                    for node_id in self._space)
+        return ((node_id, None) for node_id in self._space)
+
+
+class RowsView(Sequence):
+    """Read-only sequence over a CompactSpace row list, without copying it.
+
+    Rows are read from the list the space held when the view was made, so
+    a view should not be kept across changes to the space.
+    """
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self._rows[i] for i in range(*row.indices(len(self._rows)))]
+        return self._rows[row]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class CompactSpace:
+    """Array-backed storage for the nodes and edges of one wisdom space.
+
+    Node ids map to integer rows through a single index dict, ``level``,
+    ``reward`` and ``probability`` live in contiguous NumPy columns and the
+    adjacency is kept in CSR form. Newly added edges are staged and merged
+    into the CSR arrays on the next read. Removed rows are tombstoned and
+    compacted away once they make up half of the table.
+    """
+
+    def __init__(self, space_type, capacity: int = 8):
+        self.space_type = space_type
+        self._index: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._features: List[Optional[Dict[str, Any]]] = []
+        self._level = np.zeros(capacity, dtype=np.int32)
+        self._reward = np.zeros(capacity, dtype=np.float64)
+        self._probability = np.ones(capacity, dtype=np.float64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._tombstones = 0
+
+        # CSR adjacency over rows plus staged (source, target, weight) edges
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int64)
+        self._weights = np.zeros(0, dtype=np.float64)
+        self._staged: List[Tuple[int, int, float]] = []
+        self._csr_dirty = False
+
+    # ------------------------------------------------------------------
+    # Node API (networkx compatible subset)
+    # ------------------------------------------------------------------
+    @property
+    def nodes(self) -> CompactNodeView:
+        return CompactNodeView(self)
+
+    def __contains__(self, node_id) -> bool:
+        try:
+            return node_id in self._index
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        return (node_id for node_id in self._ids if node_id is not None)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def has_node(self, node_id) -> bool:
+        return node_id in self
+
+    def number_of_nodes(self) -> int:
+        return len(self._index)
+
+    def add_node(self, node_id: str, data=None, **attr) -> None:
+        """Insert or overwrite a node from a WisdomNode-like object"""
+        row = self._index.get(node_id)
+        if row is None:
+            row = len(self._ids)
+            self._reserve(row + 1)
+            self._index[node_id] = row
+            self._ids.append(node_id)
+            self._features.append({})
+            self._alive[row] = True
+            self._level[row] = 0
+            self._reward[row] = 0.0
+            self._probability[row] = 1.0
+        if data is not None:
+            self._features[row] = data.features
+            self._level[row] = data.level
+            self._reward[row] = data.reward
+            self._probability[row] = data.probability
+
+    def remove_node(self, node_id: str) -> None:
+        if node_id not in self._index:
+            raise nx.NetworkXError(f"The node {node_id} is not in the graph.")
+        self._drop_nodes([node_id])
+
+    def remove_nodes_from(self, node_ids: Iterable[str]) -> None:
+        self._drop_nodes(node_ids)
+
+    def _drop_nodes(self, node_ids: Iterable[str]) -> None:
+        rows = [self._index.pop(node_id) for node_id in list(node_ids)
+                if node_id in self._index]
+        if not rows:
+            return
+        for row in rows:
+            self._ids[row] = None
+            self._features[row] = None
+        self._alive[rows] = False
+        self._tombstones += len(rows)
+        self._csr_dirty = True
+        if self._tombstones > 64 and self._tombstones * 2 > len(self._ids):
+            self._compact()
+
+    def column(self, name: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """Return live node ids with the matching ``level``/``reward``/``probability`` values.
+
+        The ids are a copy. The values are a view of the column itself, so
+        writes to it update the nodes (SharedWisdom.set_values relies on
+        this); the view is only valid until the next node is added or
+        removed.
+        """
+        if self._tombstones:
+            self._compact()
+        return tuple(self._ids), getattr(self, f"_{name}")[:len(self._ids)]
+
+    def rows(self, node_ids: Iterable[str]) -> np.ndarray:
+        """Return the column rows of ``node_ids`` (KeyError for unknown ids)"""
+        if self._tombstones:
+            self._compact()
+        node_ids = list(node_ids)
+        return np.fromiter((self._index[node_id] for node_id in node_ids),
+                           dtype=np.int64, count=len(node_ids))
+
+    def feature_list(self) -> Tuple[Tuple[str, ...], Sequence[Dict[str, Any]]]:
+        """Return live node ids with their feature dicts.
+
+        The ids are a copy and the feature dicts come through a read-only
+        RowsView, which leaves lazily decoded snapshot rows undecoded until
+        they are read.
+        """
+        if self._tombstones:
+            self._compact()
+        return tuple(self._ids), RowsView(self._features)
+
+    def map_features(self, convert) -> None:
+        """Replace every feature dict with ``convert(features)``.
+
+        Feature sequences with their own ``map`` (lazily decoded snapshot
+        rows) convert rows as they are decoded instead of all at once.
+        """
+        if hasattr(self._features, "map"):
+            self._features.map(convert)
+        else:
+            self._features = [None if features is None else convert(features)
+                              for features in self._features]
+
+    # ------------------------------------------------------------------
+    # Edge API (networkx compatible subset)
+    # ------------------------------------------------------------------
+    def add_edge(self, source_id: str, target_id: str, weight: float = 1.0, **attr) -> None:
+        for node_id in (source_id, target_id):
+            if node_id not in self._index:
+                self.add_node(node_id)
+        self._staged.append(
+            (self._index[source_id], self._index[target_id], float(weight)))
+        self._csr_dirty = True
+
+    def remove_edge(self, source_id: str, target_id: str) -> None:
+        if not self.has_edge(source_id, target_id):
+            raise nx.NetworkXError(
+                f"The edge {source_id}-{target_id} not in graph.")
+        source, target = self._index[source_id], self._index[target_id]
+        start, end = self._edge_range(source)
+        keep = np.ones(len(self._indices), dtype=bool)
+        keep[start:end] = self._indices[start:end] != target
+        self._indices = self._indices[keep]
+        self._weights = self._weights[keep]
+        self._indptr[source + 1:] -= 1
+
+    def has_edge(self, source_id: str, target_id: str) -> bool:
+        if source_id not in self._index or target_id not in self._index:
+            return False
+        self._compile()
+        source, target = self._index[source_id], self._index[target_id]
+        start, end = self._edge_range(source)
+        return bool(np.any(self._indices[start:end] == target))
+
+    def successors(self, node_id: str) -> Iterator[str]:
+        if node_id not in self._index:
+            raise nx.NetworkXError(f"The node {node_id} is not in the digraph.")
+        self._compile()
+        start, end = self._edge_range(self._index[node_id])
+        targets = self._indices[start:end]
+        return iter([self._ids[target] for target in targets])
+
+    neighbors = successors
+
+    def predecessors(self, node_id: str) -> Iterator[str]:
+        if node_id not in self._index:
+            raise nx.NetworkXError(f"The node {node_id} is not in the digraph.")
+        self._compile()
+        positions = np.flatnonzero(self._indices == self._index[node_id])
+        sources = np.searchsorted(self._indptr, positions, side="right") - 1
+        return iter([self._ids[source] for source in sources])
+
+    def edges(self, data=False):
+        self._compile()
+        sources = np.repeat(np.arange(len(self._indptr) - 1),
+                            np.diff(self._indptr))
+        for source, target, weight in zip(sources, self._indices, self._weights):
+            if data:
+                yield self._ids[source], self._ids[target], {"weight": float(weight)}
+            else:
+                yield self._ids[source], self._ids[target]
+
+    def number_of_edges(self) -> int:
+        self._compile()
+        return len(self._indices)
+
+    def copy(self) -> "CompactSpace":
+        """Return an independent copy; feature dicts are shared like networkx copies"""
+        graph = type(self).__new__(type(self))
+        self._compile()
+        graph.space_type = self.space_type
+        graph._index = dict(self._index)
+        graph._ids = list(self._ids)
+        graph._features = self._features.copy()
+        for name in ("_level", "_reward", "_probability", "_alive",
+                     "_indptr", "_indices", "_weights"):
+            setattr(graph, name, getattr(self, name).copy())
+        graph._tombstones = self._tombstones
+        graph._staged = []
+        graph._csr_dirty = False
+        return graph
+
+    def load_columns(self, node_ids: List[str], features, level: np.ndarray,
+                     reward: np.ndarray, probability: np.ndarray, indptr: np.ndarray,
+                     indices: np.ndarray, weights: np.ndarray) -> None:
+        """Replace the contents with prebuilt columns, adopting the arrays without copying.
+
+        ``features`` may be any sequence supporting indexing, item
+        assignment, ``append``, ``copy`` and iteration, and optionally
+        ``map`` (see ``map_features``).
+        """
+        self._index = {node_id: row for row, node_id in enumerate(node_ids)}
+        self._ids = list(node_ids)
+        self._features = features
+        self._level = level
+        self._reward = reward
+        self._probability = probability
+        self._alive = np.ones(len(node_ids), dtype=bool)
+        self._tombstones = 0
+        self._indptr = indptr
+        self._indices = indices
+        self._weights = weights
+        self._staged = []
+        self._csr_dirty = False
+
+    def to_csr(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(ids, indptr, indices, weights)`` over live nodes"""
+        if self._tombstones:
+            self._compact()
+        self._compile()
+        return self._ids, self._indptr, self._indices, self._weights
+
+    # ------------------------------------------------------------------
+    # Internal storage management
+    # ------------------------------------------------------------------
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._alive)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name in ("_level", "_reward", "_probability", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _edge_range(self, row: int) -> Tuple[int, int]:
+        """Slice of the CSR arrays holding the out-edges of ``row``"""
+        if row + 1 >= len(self._indptr):
+            return 0, 0
+        return int(self._indptr[row]), int(self._indptr[row + 1])
+
+    def _compile(self) -> None:
+        """Merge staged edges into the CSR arrays and drop edges of removed rows"""
+        if not self._csr_dirty:
+            return
+        rows = len(self._ids)
+        counts = np.diff(self._indptr)
+        sources = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+        targets = self._indices
+        weights = self._weights
+        if self._staged:
+            staged = np.array(self._staged, dtype=np.float64).reshape(-1, 3)
+            sources = np.concatenate([sources, staged[:, 0].astype(np.int64)])
+            targets = np.concatenate([targets, staged[:, 1].astype(np.int64)])
+            weights = np.concatenate([weights, staged[:, 2]])
+            self._staged = []
+
+        alive = self._alive[:rows]
+        keep = alive[sources] & alive[targets]
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+        # Re-adding an edge overwrites its weight but keeps its position,
+        # matching networkx successor order
+        keys = sources * max(rows, 1) + targets
+        _, first, inverse = np.unique(
+            keys, return_index=True, return_inverse=True)
+        last = np.full(len(first), -1, dtype=np.int64)
+        np.maximum.at(last, inverse, np.arange(len(keys)))
+        by_position = np.argsort(first)
+        sources = sources[first[by_position]]
+        targets = targets[first[by_position]]
+        weights = weights[last[by_position]]
+
+        order = np.argsort(sources, kind="stable")
+        self._indices = targets[order]
+        self._weights = weights[order]
+        self._indptr = np.zeros(rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=rows), out=self._indptr[1:])
+        self._csr_dirty = False
+
+    def _compact(self) -> None:
+        """Drop tombstoned rows and renumber the remaining ones"""
+        self._compile()
+        rows = len(self._ids)
+        alive = self._alive[:rows]
+        new_rows = np.cumsum(alive) - 1
+        size = int(alive.sum())
+
+        counts = np.diff(self._indptr)
+        sources = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+        self._indices = new_rows[self._indices]
+        self._indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(new_rows[sources], minlength=size),
+                  out=self._indptr[1:])
+
+        for name in ("_level", "_reward", "_probability", "_alive"):
+            column = getattr(self, name)
+            compacted = np.zeros(max(size, 8), dtype=column.dtype)
+            compacted[:size] = column[:rows][alive]
+            setattr(self, name, compacted)
+        self._ids = [node_id for node_id in self._ids if node_id is not None]
+        self._features = [features for features, keep
+                          in zip(self._features, alive) if keep]
+        self._index = {node_id: row for row, node_id in enumerate(self._ids)}
+        self._tombstones = 0
+
+
+def adjacency_csr(graph) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(ids, indptr, indices, weights)`` for a CompactSpace or networkx digraph.
+
+    Rows follow graph node order and each row keeps successor order.
+    """
+    if isinstance(graph, CompactSpace):
+        return graph.to_csr()
+    node_ids = list(graph)
+    index = {node_id: row for row, node_id in enumerate(node_ids)}
+    indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+    indices, weights = [], []
+    for row, node_id in enumerate(node_ids):
+        for target, attrs in graph.adj[node_id].items():
+            indices.append(index[target])
+            weights.append(attrs.get("weight", 1.0))
+        indptr[row + 1] = len(indices)
+    return (node_ids, indptr, np.array(indices, dtype=np.int64),
+            np.array(weights, dtype=np.float64))
@@ -0,0 +1,93 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from allocator import RESOURCES, ResourcePool, allocate, allocation_rows, greedy_knapsack
+from graph import WisdomGraph
+
+
+def sequential_greedy(demands, values, capacity):
+    """One task at a time, as greedy_knapsack is documented to behave"""
+    finite = np.isfinite(capacity)
+    sizes = [max((demand / cap if cap > 0 else (math.inf if demand > 0 else 0.0))
+                 for demand, cap, bounded in zip(row, capacity, finite) if bounded)
+             if finite.any() else 0.0 for row in demands]
+    density = [value / size if size > 0 else math.inf for value, size in zip(values, sizes)]
+    remaining = capacity.copy()
+    admitted = np.zeros(len(values), dtype=bool)
+    for task in sorted(range(len(values)), key=lambda task: -density[task]):
+        if (demands[task] <= remaining + 1e-9).all():
+            admitted[task] = True
+            remaining = remaining - demands[task]
+    feasible = [task for task in range(len(values)) if (demands[task] <= capacity).all()]
+    if feasible:
+        best = max(feasible, key=lambda task: (values[task], -task))
+        if values[best] > values[admitted].sum():
+            admitted[:] = False
+            admitted[best] = True
+    return admitted
+
+
+def test_greedy_knapsack_matches_the_sequential_greedy():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        count = int(rng.integers(1, 40))
+        demands = rng.integers(0, 10, (count, 4)).astype(float)
+        values = rng.uniform(0.5, 10, count)
+        capacity = rng.integers(0, 60, 4).astype(float)
+        capacity[rng.random(4) < 0.2] = np.inf
+
+        admitted = greedy_knapsack(demands, values, capacity)
+
+        assert np.array_equal(admitted, sequential_greedy(demands, values, capacity))
+        assert (demands[admitted].sum(axis=0) <= capacity).all()
+
+
+def test_greedy_knapsack_stays_close_to_optimal_on_small_instances():
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        demands = rng.integers(1, 10, (10, 4)).astype(float)
+        values = rng.uniform(1, 10, 10)
+        capacity = rng.integers(10, 30, 4).astype(float)
+        best = max(values[list(subset)].sum()
+                   for size in range(11) for subset in itertools.combinations(range(10), size)
+                   if (demands[list(subset)].sum(axis=0) <= capacity).all())
+        assert values[greedy_knapsack(demands, values, capacity)].sum() >= best / 5
+
+
+def test_capacity_edge_cases():
+    demands = np.ones((3, 4))
+    assert greedy_knapsack(demands, np.ones(3), np.full(4, np.inf)).all()
+    assert not greedy_knapsack(demands, np.ones(3), np.zeros(4)).any()
+    assert not greedy_knapsack(np.zeros((0, 4)), np.zeros(0), np.ones(4)).any()
+    with pytest.raises(ValueError, match="non-negative"):
+        ResourcePool(cpu_cores=-1)
+
+
+def test_allocate_reports_admissions_and_utilization():
+    demands = np.array([[4, 16, 0, 2], [4, 16, 0, 2], [8, 8, 0, 1]], dtype=float)
+    report = allocate(demands, np.array([3.0, 2.0, 1.0]), ResourcePool(cpu_cores=8))
+
+    assert report["admitted"].tolist() == [True, True, False]
+    assert report["throughput"] == 5.0
+    assert report["utilization"]["cpu_cores"] == 1.0
+    assert report["utilization"]["memory"] == 0.0
+    assert allocation_rows(report["allocations"])[2] == dict.fromkeys(RESOURCES, 0.0)
+    assert allocate(demands, np.ones(3))["admitted"].all()
+
+
+def test_planning_allocates_within_the_resource_pool():
+    planning = WisdomGraph().planning_graph
+    tasks = ["market_research", "photo_shooting", "trend_analysis"]
+
+    unlimited = planning._allocate_resources(tasks)
+    assert all(allocation["admitted"] for allocation in unlimited.values())
+
+    limited = planning._allocate_resources(tasks, ResourcePool(cpu_cores=8))
+    admitted = [task for task in tasks if limited[task]["admitted"]]
+    assert len(admitted) == 2
+    assert sum(limited[task]["allocation"]["cpu_cores"] for task in tasks) <= 8
+    for task in set(tasks) - set(admitted):
+        assert limited[task]["allocation"] == dict.fromkeys(RESOURCES, 0.0)
@@ -0,0 +1,89 @@
+import numpy as np
+
+from env import EducationRoom, EducationRoomVecEnv, FashionRoomEnv, FashionRoomVecEnv
+
+
+def room_state(vec, index):
+    environment = vec.environment[index]
+    return (
+        {category: {field: float(environment[category][field])
+                    for field in environment[category].dtype.names}
+         for category in vec.ENVIRONMENT_DTYPE.names},
+        {field: float(vec.metrics[field][index]) for field in vec.METRICS_DTYPE.names},
+        {space: vec.LAYOUTS[code] for space, code in zip(vec.SPACES, vec.layouts[index])},
+    )
+
+
+def single_state(room):
+    return (room.environment, room.metrics,
+            {space: values["layout"] for space, values in room.learning_spaces.items()})
+
+
+def test_education_vec_env_matches_single_rooms():
+    rng = np.random.default_rng(0)
+    activities = ["lecture", "workshop", "discussion", "recess"]
+    vec = EducationRoomVecEnv(6)
+    rooms = [EducationRoom() for _ in range(6)]
+
+    for _ in range(5):
+        chosen = rng.choice(activities, size=6)
+        vec.adjust_environment(chosen)
+        data = {"engagement": rng.random(6), "retention": rng.random(6)}
+        vec.update_metrics(data)
+        for index, room in enumerate(rooms):
+            room.adjust_environment(chosen[index])
+            room.update_metrics({key: values[index] for key, values in data.items()})
+
+    for index, room in enumerate(rooms):
+        assert room_state(vec, index) == single_state(room)
+
+
+def test_education_vec_env_updates_selected_rooms_only():
+    vec = EducationRoomVecEnv(4)
+    layouts = vec.layouts.copy()
+
+    vec.adjust_environment("workshop", rooms=[1, 3])
+    vec.update_metrics({"engagement": 0.5}, rooms=np.array([True, False, False, True]))
+
+    assert vec.environment["lighting"]["brightness"].tolist() == [0.8, 0.9, 0.8, 0.9]
+    assert vec.metrics["engagement_level"].tolist() == [0.5, 0.0, 0.0, 0.5]
+    assert np.array_equal(vec.layouts, layouts)
+
+    vec.reset(rooms=[3])
+    assert vec.environment["lighting"]["brightness"].tolist() == [0.8, 0.9, 0.8, 0.8]
+
+
+def test_education_vec_env_rewards():
+    vec = EducationRoomVecEnv(3)
+    outcomes = ["concept_mastery", "unknown", "peer_collaboration"]
+    assert vec.reward(outcomes).tolist() == [EducationRoom().reward(o) for o in outcomes]
+    assert vec.reward([0, 9, -1]).tolist() == [10.0, 0.0, 0.0]
+
+
+def test_fashion_vec_env_rewards_match_single_rooms():
+    vec = FashionRoomVecEnv(5)
+    results = ["successful_styling", "aesthetic_display", "unknown", "customer_satisfaction",
+               "efficient_organization"]
+    assert vec.reward(results).tolist() == [FashionRoomEnv().reward(r) for r in results]
+    assert vec.reward([0, 3, 4, -1, 7]).tolist() == [10.0, 4.0, 0.0, 0.0, 0.0]
+
+
+def test_fashion_vec_env_steps_and_resets_rooms():
+    vec = FashionRoomVecEnv(3)
+    single = FashionRoomEnv().get_current_state()
+    state = vec.get_current_state()
+    assert state["lighting"].tolist() == [list(single["lighting"].values())] * 3
+    assert state["temperature"].tolist() == [single["ambiance"]["temperature"]] * 3
+
+    vec.step(["successful_styling", "unknown", "customer_satisfaction"])
+    state, rewards = vec.step(["successful_styling"] * 3,
+                              lighting=np.array([[2.0, 0.5, -1.0]] * 3))
+    assert rewards.tolist() == [10.0, 10.0, 10.0]
+    assert vec.returns.tolist() == [20.0, 10.0, 18.0]
+    assert vec.steps.tolist() == [2, 2, 2]
+    assert state["lighting"][0].tolist() == [1.0, 0.5, 0.0]
+
+    vec.reset(rooms=np.array([False, True, False]))
+    assert vec.returns.tolist() == [20.0, 0.0, 18.0]
+    assert vec.steps.tolist() == [2, 0, 2]
+    assert vec.lighting[1].tolist() == list(FashionRoomVecEnv.DEFAULT_LIGHTING)
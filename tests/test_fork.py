@@ -0,0 +1,49 @@
+import pickle
+
+import pytest
+
+from graph import WisdomGraph, SpaceType
+
+
+def template(storage):
+    wisdom = WisdomGraph(storage=storage)
+    wisdom.add_perception_node(
+        "market", {"market_size": 10, "trends": ["denim"]}, level=1, registry="market")
+    wisdom.add_action_node("state", {"context": "launch"}, reward=0.5, level=1)
+    return wisdom
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_direct_writes_to_a_fork_leave_the_template_unchanged(storage):
+    base = template(storage)
+    fork = base.fork()
+    node = fork.perception_graph.nodes["market"]["data"]
+
+    with pytest.raises(TypeError):
+        node.features["market_size"] = 99
+    with pytest.raises(TypeError):
+        node.features["trends"].append("linen")
+    with pytest.raises(TypeError):
+        fork.action_graph.nodes["state"]["data"].reward = 1.0
+
+    assert base.perception_graph.nodes["market"]["data"].features == {
+        "market_size": 10, "trends": ["denim"]}
+    assert base.action_graph.nodes["state"]["data"].reward == 0.5
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_fork_updates_copy_nodes_out_of_the_template(storage):
+    base = template(storage)
+    fork = base.fork()
+    fork.update_node_features(SpaceType.PERCEPTION, "market", {"market_size": 99})
+    fork.update_q_value("state", "state", reward=1.0)
+
+    features = fork.perception_graph.nodes["market"]["data"].features
+    assert features["market_size"] == 99
+    features["trends"].append("linen")
+    assert fork.perception_graph.analyze_market()["market_size"] == 99
+    assert base.perception_graph.nodes["market"]["data"].features == {
+        "market_size": 10, "trends": ["denim"]}
+    assert base.action_graph.nodes["state"]["data"].reward == 0.5
+    assert pickle.loads(pickle.dumps(base)).perception_graph.nodes["market"][
+        "data"].features["market_size"] == 10
@@ -0,0 +1,54 @@
+import pytest
+
+from agent import FashionAgent
+from graph import WisdomGraph, SpaceType
+from inference import BeliefEngine, evidence_scores
+
+
+def reasoning(storage):
+    wisdom = WisdomGraph(storage=storage)
+    for node_id, probability in [("a", 0.9), ("b", 0.5), ("c", 0.2)]:
+        wisdom.add_reasoning_node(node_id, {}, probability=probability, level=1)
+    wisdom.add_edge_within_space(SpaceType.REASONING, "a", "b")
+    return wisdom
+
+
+def fresh_posteriors(wisdom):
+    engine = BeliefEngine(wisdom.reasoning_graph)
+    engine.run()
+    return engine.posteriors()
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_posteriors_follow_reweighted_and_swapped_edges(storage):
+    wisdom = reasoning(storage)
+    before = wisdom.reasoning_posteriors()
+
+    wisdom.add_edge_within_space(SpaceType.REASONING, "a", "b", weight=4.0)
+    reweighted = wisdom.reasoning_posteriors()
+    assert reweighted == pytest.approx(fresh_posteriors(wisdom))
+    assert reweighted["b"] != pytest.approx(before["b"])
+
+    wisdom.own_space(SpaceType.REASONING).remove_edge("a", "b")
+    wisdom.add_edge_within_space(SpaceType.REASONING, "c", "b")
+    assert wisdom.reasoning_posteriors() == pytest.approx(fresh_posteriors(wisdom))
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_feature_updates_keep_the_engine_incremental(storage):
+    wisdom = reasoning(storage)
+    engine = wisdom.belief_engine()
+    wisdom.update_node_features(SpaceType.REASONING, "c", {"signal": 0.9})
+
+    assert wisdom.belief_engine() is engine
+    assert wisdom.reasoning_posteriors() == pytest.approx(fresh_posteriors(wisdom))
+
+
+def test_unobserved_variables_are_neutral_evidence():
+    assert evidence_scores([{"x": None, "y": float("nan")}, {"x": None, "y": 0.9}]).tolist() == [0.5, 0.9]
+
+    agent = FashionAgent(shared_wisdom=False)
+    posteriors = agent.wisdom.reasoning_posteriors()
+    for node_id, posterior in posteriors.items():
+        prior = agent.wisdom.reasoning_graph.nodes[node_id]["data"].probability
+        assert posterior == pytest.approx(prior)
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from graph import WisdomGraph
+from ingest import PerceptionEvent, PerceptionIngestor
+
+
+def stream():
+    return [
+        PerceptionEvent("market", "denim", {"demand": 0.4}, level=1),
+        PerceptionEvent("trend", "denim", {"momentum": 0.7}, level=2),
+        PerceptionEvent("customer", "reviews", {"rating": 4.5}),
+        PerceptionEvent("market", "denim", {"demand": 0.6}),
+    ]
+
+
+def ingested(storage, batch_size):
+    wisdom = WisdomGraph(storage=storage)
+    stats = PerceptionIngestor(wisdom, batch_size=batch_size).ingest(stream())
+    return wisdom, stats
+
+
+def state(wisdom):
+    perception = wisdom.perception_graph
+    nodes = {node_id: (perception.nodes[node_id]["data"].level,
+                       dict(perception.nodes[node_id]["data"].features))
+             for node_id in perception}
+    registries = {name: list(getattr(perception, name))
+                  for name in ("market_nodes", "trend_nodes", "customer_nodes")}
+    return nodes, registries
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_ingested_state_does_not_depend_on_batch_size(storage):
+    expected = (
+        {"denim": (1, {"demand": 0.6, "momentum": 0.7}), "reviews": (1, {"rating": 4.5})},
+        {"market_nodes": ["denim"], "trend_nodes": ["denim"], "customer_nodes": ["reviews"]},
+    )
+    for batch_size in (1, 2, 3, 256):
+        wisdom, stats = ingested(storage, batch_size)
+        assert state(wisdom) == expected
+        assert stats.events == 4
+
+
+def test_batches_merge_events_per_node():
+    _, stats = ingested("networkx", 256)
+    assert (stats.batches, stats.nodes_added, stats.nodes_updated) == (1, 2, 0)
+
+    _, stats = ingested("networkx", 1)
+    assert (stats.batches, stats.nodes_added, stats.nodes_updated) == (4, 2, 2)
+
+
+def test_async_ingest_matches_sync_ingest():
+    async def events():
+        for event in stream():
+            yield event
+
+    wisdom = WisdomGraph()
+    stats = asyncio.run(PerceptionIngestor(wisdom, batch_size=2, max_pending=1).aingest(events()))
+
+    assert stats.events == 4
+    assert state(wisdom) == state(ingested("networkx", 2)[0])
+
+
+def test_unknown_event_kind_is_rejected():
+    with pytest.raises(ValueError, match="Unknown perception event kind"):
+        PerceptionEvent("weather", "rain", {})
@@ -0,0 +1,75 @@
+import asyncio
+import io
+import json
+
+import numpy as np
+import pytest
+
+from agent import FashionAgent
+from graph import PlanningMixin, WisdomGraph
+from instrument import (Instrumentation, JsonLinesSink, MemorySink, PrometheusSink,
+                        _StreamSink)
+
+
+def test_methods_are_patched_only_while_enabled():
+    original = PlanningMixin.create_strategy
+    with Instrumentation() as metrics:
+        assert PlanningMixin.create_strategy is not original
+        assert PlanningMixin.create_strategy.__name__ == "create_strategy"
+        with pytest.raises(RuntimeError, match="already enabled"):
+            Instrumentation().enable()
+    assert PlanningMixin.create_strategy is original
+    assert not metrics.enabled
+
+    WisdomGraph().add_perception_node("after", {"signal": 1.0}, level=1)
+    assert "WisdomGraph.add_perception_node" not in metrics.stats()
+
+
+def test_calls_are_counted_with_latency_and_memory():
+    with Instrumentation(track_memory=True, max_samples=5) as metrics:
+        wisdom = WisdomGraph()
+        for i in range(20):
+            wisdom.add_perception_node(f"p{i}", {"signal": float(i)}, level=1)
+        wisdom.prune_perception_space(5.0)
+        added = metrics.stats()["WisdomGraph.add_perception_node"]
+        FashionAgent().process_fashion_items(np.zeros((2, 8, 8, 3), np.uint8))
+        asyncio.run(FashionAgent().aprocess_fashion_item(np.zeros((8, 8, 3), np.uint8)))
+
+    stats = metrics.stats()
+    assert added["count"] == 20
+    assert 0 <= added["p50_seconds"] <= added["p99_seconds"] <= added["total_seconds"]
+    assert added["allocated_bytes"] > 0
+    # Nested calls are measured too: prune_perception_space calls prune
+    assert stats["WisdomGraph.prune"]["count"] == 1
+    assert stats["FashionAgent.process_fashion_items"]["count"] == 1
+    assert stats["FashionAgent.aprocess_fashion_item"]["count"] == 1
+    assert len(metrics.metrics["WisdomGraph.add_perception_node"].samples) == 5
+
+    metrics.reset()
+    assert metrics.stats() == {}
+
+
+def test_sinks_render_exports(tmp_path):
+    memory = MemorySink()
+    with Instrumentation(sink=memory) as metrics:
+        WisdomGraph().add_perception_node("p", {"signal": 1.0}, level=1)
+    metrics.export()
+    summary, = [s for s in memory.latest if s["name"] == "WisdomGraph.add_perception_node"]
+    assert summary["count"] == 1
+
+    path = str(tmp_path / "metrics.jsonl")
+    metrics.export(JsonLinesSink(path))
+    metrics.export(JsonLinesSink(path))
+    lines = [json.loads(line) for line in open(path)]
+    assert len(lines) == 2 * len(memory.latest) and "timestamp" in lines[0]
+
+    stream = io.StringIO()
+    PrometheusSink(stream).write(memory.latest)
+    text = stream.getvalue()
+    assert 'wisdom_calls_total{method="WisdomGraph.add_perception_node"} 1' in text
+    assert "# TYPE wisdom_latency_seconds summary" in text
+
+    with pytest.raises(TypeError):
+        _StreamSink(stream)
+    with pytest.raises(ValueError, match="No sink"):
+        Instrumentation().export()
@@ -0,0 +1,33 @@
+import pytest
+
+from graph import WisdomGraph
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_cached_insights_are_read_only(storage):
+    wisdom = WisdomGraph(storage=storage)
+    wisdom.add_perception_node(
+        "market", {"market_size": 10, "trends": ["denim"]}, level=1, registry="market")
+    perception = wisdom.perception_graph
+
+    insights = perception.analyze_market()
+    with pytest.raises(TypeError):
+        insights["market_size"] = 0
+    with pytest.raises(TypeError):
+        insights["market_trends"].append("linen")
+
+    copy = dict(insights)
+    copy["market_size"] = 0
+    assert perception.analyze_market()["market_size"] == 10
+    assert perception.analyze_market() is insights
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_cached_insights_follow_new_nodes(storage):
+    wisdom = WisdomGraph(storage=storage)
+    wisdom.add_perception_node("a", {"trends": ["denim"]}, level=1, registry="market")
+    before = wisdom.perception_graph.analyze_market()
+    wisdom.add_perception_node("b", {"trends": ["linen"]}, level=1, registry="market")
+
+    assert before["market_trends"] == ["denim"]
+    assert wisdom.perception_graph.analyze_market()["market_trends"] == ["denim", "linen"]
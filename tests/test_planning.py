@@ -0,0 +1,90 @@
+from copy import deepcopy
+
+import pytest
+
+from graph import PlanningGraph, WisdomGraph, SpaceType
+
+
+def planned(storage):
+    wisdom = WisdomGraph(storage=storage)
+    wisdom.add_task_prerequisite("shoot", "select")
+    wisdom.add_task_prerequisite("edit", "shoot")
+    wisdom.add_task_prerequisite("post", "edit")
+    return wisdom
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_task_prerequisites_follow_edge_and_node_changes(storage):
+    wisdom = planned(storage)
+    planning = wisdom.planning_graph
+    tasks = ["select", "shoot", "edit", "post"]
+    assert planning.task_prerequisites(tasks) == (
+        ("select", "shoot"), ("shoot", "edit"), ("edit", "post"))
+
+    planning.remove_edge("shoot", "edit")
+    assert planning.task_prerequisites(tasks) == (("select", "shoot"), ("edit", "post"))
+
+    wisdom.remove_nodes(SpaceType.PLANNING, ["select"])
+    assert planning.task_prerequisites(tasks) == (("edit", "post"),)
+    assert planning.task_prerequisites(tasks) == tuple(
+        (source, target) for source, target in planning.edges() if target in tasks)
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_strategy_sections_see_new_prerequisites(storage):
+    wisdom = planned(storage)
+    tasks = ["select", "shoot", "edit", "post"]
+    strategy = wisdom.planning_graph.create_strategy({}, tasks)
+    timeline = strategy["timeline"]
+    assert [timeline[task]["start_time"] for task in tasks] == sorted(
+        timeline[task]["start_time"] for task in tasks)
+    assert timeline["shoot"]["start_time"] == timeline["select"]["end_time"]
+
+    wisdom.add_task_prerequisite("post", "shoot")
+    dependencies = wisdom.planning_graph.create_strategy({}, tasks)["dependencies"]
+    assert dependencies["post"]["prerequisites"] == ["edit", "shoot"]
+
+
+def test_loaded_snapshot_rebuilds_prerequisites(tmp_path):
+    wisdom = planned("compact")
+    wisdom.save(str(tmp_path / "wisdom.bin"))
+    loaded = WisdomGraph.load(str(tmp_path / "wisdom.bin"))
+
+    assert loaded.planning_graph.task_prerequisites(["post", "edit"]) == (
+        ("edit", "post"), ("shoot", "edit"))
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_efficiency_pruning_keeps_scheduled_tasks(storage):
+    wisdom = planned(storage)
+    wisdom.add_planning_node("weak_strategy", {"efficiency": 0.1}, level=1)
+
+    removed = wisdom.prune({SpaceType.PLANNING: 0.5})
+
+    assert removed == {"planning": ["weak_strategy"]}
+    assert wisdom.planning_graph.task_prerequisites(["shoot"]) == (("select", "shoot"),)
+
+
+class TrendPlanningGraph(PlanningGraph):
+    # The trend alignment builder is not implemented upstream
+    def _align_with_trends(self, trend_insights):
+        return {"aligned": list(trend_insights["current_trends"])}
+
+
+def test_strategy_ignores_later_changes_to_the_insights():
+    planning = TrendPlanningGraph()
+    perception = {
+        "market_insights": {"market_size": 100, "competition_level": 0.3,
+                            "growth_potential": 0.2},
+        "trend_insights": {"current_trends": ["denim"], "emerging_trends": []},
+    }
+    expected = planning.create_strategy(deepcopy(perception), ["select"]).materialize()
+
+    strategy = planning.create_strategy(perception, ["select"])
+    perception["market_insights"]["market_size"] = 5
+    perception["trend_insights"]["current_trends"].append("linen")
+    perception["trend_insights"]["emerging_trends"] = ["linen"]
+
+    built = strategy.materialize()
+    assert built == expected
+    assert built["trend_adaptation"]["trend_alignment"] == {"aligned": ["denim"]}
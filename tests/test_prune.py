@@ -0,0 +1,17 @@
+import pytest
+
+from graph import WisdomGraph, SpaceType
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_perception_prune_keeps_nodes_without_numeric_features(storage):
+    wisdom = WisdomGraph(storage=storage)
+    wisdom.add_perception_node("low", {"score": 0.1}, level=1)
+    wisdom.add_perception_node("mixed", {"score": 0.9, "label": "denim"}, level=1)
+    wisdom.add_perception_node("tags", {"tags": ["denim", "linen"]}, level=1)
+    wisdom.add_perception_node("empty", {}, level=1)
+
+    removed = wisdom.prune({SpaceType.PERCEPTION: 0.5})
+
+    assert removed == {"perception": ["low"]}
+    assert set(wisdom.perception_graph) == {"mixed", "tags", "empty"}
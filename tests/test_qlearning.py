@@ -0,0 +1,39 @@
+import pytest
+
+from graph import WisdomGraph, SpaceType
+
+
+def action_space(storage):
+    wisdom = WisdomGraph(storage=storage)
+    for node_id, reward in [("idle", 0.0), ("post", 0.2), ("promote", 0.4)]:
+        wisdom.add_action_node(node_id, {"channel": "social"}, reward=reward, level=1)
+    wisdom.add_edge_within_space(SpaceType.ACTION, "idle", "post")
+    wisdom.add_edge_within_space(SpaceType.ACTION, "idle", "promote")
+    return wisdom
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_learned_q_values_survive_a_save(storage, tmp_path):
+    wisdom = action_space(storage)
+    table = wisdom.q_table()
+    table.update_q_values(["idle"] * 3, ["post"] * 3, [1.0] * 3, learning_rate=0.5)
+    learned = float(table.q_values(["idle"], ["post"])[0])
+
+    fork = wisdom.fork()
+    fork.store_q_table(table)
+    fork.save(str(tmp_path / "wisdom.bin"))
+    loaded = WisdomGraph.load(str(tmp_path / "wisdom.bin"), storage=storage)
+
+    assert loaded.action_graph.nodes["post"]["data"].reward == pytest.approx(learned)
+    assert loaded.get_highest_reward_action("idle") == "post"
+    assert wisdom.action_graph.nodes["post"]["data"].reward == 0.2
+    assert loaded.q_table().q_values(["idle"], ["post"])[0] == pytest.approx(learned)
+
+
+def test_table_does_not_alias_compact_adjacency():
+    wisdom = action_space("compact")
+    table = wisdom.q_table()
+    wisdom.action_graph.remove_edge("idle", "post")
+
+    assert table.best_action_ids(["idle"]) == ["promote"]
+    assert table.indptr.tolist() == [0, 2, 2, 2]
@@ -0,0 +1,56 @@
+import pickle
+import random
+
+import pytest
+
+from graph import WisdomGraph, SpaceType
+
+
+@pytest.mark.parametrize("storage", ["networkx", "compact"])
+def test_registry_behaves_like_an_ordered_list(storage):
+    wisdom = WisdomGraph(storage=storage)
+    for i in range(30):
+        wisdom.add_perception_node(f"p{i}", {"signal": i}, level=1)
+    registry = wisdom.perception_graph.market_nodes
+    model = []
+    rng = random.Random(0)
+
+    for _ in range(300):
+        operation = rng.choice(["append", "discard", "pop", "pop_front", "index"])
+        node_id = f"p{rng.randrange(30)}"
+        if operation == "append":
+            registry.append(node_id)
+            if node_id not in model:
+                model.append(node_id)
+        elif operation == "discard":
+            registry.discard(node_id)
+            if node_id in model:
+                model.remove(node_id)
+        elif model and operation == "pop":
+            assert registry.pop() == model.pop()
+        elif model and operation == "pop_front":
+            assert registry.pop(0) == model.pop(0)
+        elif model:
+            position = rng.randrange(-len(model), len(model))
+            assert registry[position] == model[position]
+        assert registry == model
+        assert len(registry) == len(model)
+
+    assert list(reversed(registry)) == model[::-1]
+    assert registry[1:3] == model[1:3]
+
+
+def test_registry_follows_node_removal_and_pickling():
+    wisdom = WisdomGraph()
+    for node_id in ("a", "b", "c"):
+        wisdom.add_perception_node(node_id, {"signal": 1.0}, level=1, registry="trend")
+    registry = wisdom.perception_graph.trend_nodes
+    assert registry[-1] == "c"
+
+    wisdom.remove_nodes(SpaceType.PERCEPTION, ["b"])
+    assert registry == ["a", "c"] and registry[1] == "c"
+
+    copy = pickle.loads(pickle.dumps(wisdom)).perception_graph.trend_nodes
+    assert copy == ["a", "c"] and copy[0] == "a"
+    with pytest.raises(ValueError, match="not in the graph"):
+        registry.append("missing")
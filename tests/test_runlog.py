@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from runlog import RunRecorder, iter_records, phase_stats, strategy_size
+
+
+def test_records_are_buffered_and_read_back(tmp_path):
+    path = str(tmp_path / "log" / "run.jsonl")
+    with RunRecorder(path, buffer_size=100, flush_interval=60) as recorder:
+        recorder.record("demo", name="collaboration")
+        assert list(iter_records(path)) == []
+        with recorder.phase("selection", lead="seller") as phase:
+            with recorder.stage("selection", "perception", agent="seller") as outputs:
+                outputs["keys"] = ["market"]
+            phase.update(stages=1)
+
+    records = list(iter_records(path, run=recorder.run_id))
+    assert [record["event"] for record in records] == [
+        "run_start", "demo", "stage", "phase", "run_end"]
+    stage, phase = records[2], records[3]
+    assert (stage["phase"], stage["stage"], stage["agent"], stage["keys"]) == (
+        "selection", "perception", "seller", ["market"])
+    assert (phase["lead"], phase["stages"]) == ("seller", 1)
+    assert phase["seconds"] >= stage["seconds"] >= 0
+
+    stats = phase_stats(path)
+    assert set(stats["selection"]) == {"perception", "total"}
+    assert stats["selection"]["perception"]["count"] == 1
+
+
+def test_truncated_lines_and_other_runs_are_skipped(tmp_path):
+    path = tmp_path / "run.jsonl"
+    with RunRecorder(str(path), run_id="a") as recorder:
+        with recorder.stage("selection", "perception"):
+            pass
+    with open(path, "a") as stream:
+        stream.write(json.dumps({"run": "b", "event": "stage", "phase": "selection",
+                                 "stage": "perception", "seconds": 5.0}) + "\n")
+        stream.write('{"run": "a", "event": "sta')
+
+    assert phase_stats(str(path), run="a")["selection"]["perception"]["count"] == 1
+    assert phase_stats(str(path))["selection"]["perception"]["max"] == 5.0
+
+
+@pytest.mark.parametrize("key", ["seconds", "phase", "agent", "event", "run"])
+def test_outputs_cannot_clobber_reserved_keys(tmp_path, key):
+    with RunRecorder(str(tmp_path / "run.jsonl")) as recorder:
+        with pytest.raises(ValueError, match="reserved"):
+            with recorder.stage("selection", "perception") as outputs:
+                outputs[key] = 1
+
+
+@pytest.mark.parametrize("key", ["run", "t", "event"])
+def test_record_fields_cannot_clobber_record_keys(tmp_path, key):
+    with RunRecorder(str(tmp_path / "run.jsonl")) as recorder:
+        with pytest.raises(ValueError, match="reserved"):
+            recorder.record("demo", **{key: 1})
+
+
+def test_stage_keeps_the_body_exception(tmp_path):
+    with RunRecorder(str(tmp_path / "run.jsonl")) as recorder:
+        with pytest.raises(KeyError):
+            with recorder.stage("selection", "perception") as outputs:
+                outputs["keys"] = 1
+                raise KeyError("perception failed")
+
+    stage, = iter_records(str(tmp_path / "run.jsonl"), event="stage")
+    assert stage["keys"] == 1
+
+
+def test_strategy_size_counts_leaves():
+    assert strategy_size({"a": [1, 2], "b": {"c": 3}, "d": "x"}) == 4
@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+import pickle
+
+import pytest
+
+from agent import FashionAgent
+from graph import SpaceType
+from shared import SharedWisdom
+
+
+def read_reward(wisdom, node_id):
+    return wisdom.action_graph.nodes[node_id]["data"].reward
+
+
+def insights(wisdom):
+    return wisdom.perception_graph.gather_insights()
+
+
+def update_locally(wisdom, state_id, action_id):
+    wisdom.update_q_value(state_id, action_id, 100.0)
+    return read_reward(wisdom, state_id)
+
+
+@pytest.fixture
+def shared():
+    agent = FashionAgent(storage="compact", shared_wisdom=False)
+    with SharedWisdom(agent.wisdom) as shared:
+        yield agent.wisdom, shared
+
+
+def test_attached_graph_mirrors_the_source_and_sees_writes(shared):
+    source, shared = shared
+    wisdom = shared.attach()
+    actions = list(wisdom.action_graph)
+
+    assert list(wisdom.action_graph) == list(source.action_graph)
+    assert insights(wisdom) == insights(source)
+
+    shared.set_values(SpaceType.ACTION, "reward", actions[:2], [1.5, 2.5])
+    assert [read_reward(wisdom, node_id) for node_id in actions[:2]] == [1.5, 2.5]
+    assert shared.get_values(SpaceType.ACTION, "reward", actions[:2]).tolist() == [1.5, 2.5]
+    with pytest.raises(ValueError, match="Unknown column"):
+        shared.set_values(SpaceType.ACTION, "features", actions[:1], [0.0])
+
+
+def test_reader_writes_are_copy_on_write(shared):
+    _, shared = shared
+    wisdom = shared.attach()
+    state, action = list(wisdom.action_graph)[:2]
+    shared.set_values(SpaceType.ACTION, "reward", [state], [1.5])
+
+    wisdom.update_q_value(state, action, 100.0)
+
+    assert read_reward(wisdom, state) != 1.5
+    assert shared.get_values(SpaceType.ACTION, "reward", [state])[0] == 1.5
+    assert read_reward(shared.attach(), state) == 1.5
+    # A touched attachment pickles its own copy instead of re-attaching
+    assert read_reward(pickle.loads(pickle.dumps(wisdom)), state) == read_reward(wisdom, state)
+
+
+def test_untouched_attachment_pickles_by_segment_name(shared):
+    source, shared = shared
+    wisdom = shared.attach()
+    assert len(pickle.dumps(wisdom)) < len(pickle.dumps(source)) // 10
+    assert list(pickle.loads(pickle.dumps(wisdom)).action_graph) == list(source.action_graph)
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_worker_processes_attach_to_the_segment(shared, method):
+    source, shared = shared
+    wisdom = shared.attach()
+    state, action = list(wisdom.action_graph)[:2]
+    shared.set_values(SpaceType.ACTION, "reward", [state], [2.5])
+
+    with ProcessPoolExecutor(1, mp_context=mp.get_context(method)) as pool:
+        assert pool.submit(read_reward, wisdom, state).result() == 2.5
+        assert pool.submit(insights, wisdom).result() == insights(source)
+        shared.update_q_value(state, action, 10.0)
+        assert pool.submit(read_reward, wisdom, state).result() == pytest.approx(2.5 + 0.1 * 7.5)
+        assert pool.submit(update_locally, wisdom, state, action).result() != read_reward(wisdom, state)
+
+    assert shared.get_values(SpaceType.ACTION, "reward", [state])[0] == pytest.approx(3.25)
@@ -0,0 +1,42 @@
+from graph import WisdomGraph, SpaceType, support_keywords
+from snapshot import LazyFeatureList
+
+
+def pending_rows(graph):
+    features = graph._features
+    assert isinstance(features, LazyFeatureList)
+    return sum(item is LazyFeatureList._PENDING for item in features._items)
+
+
+def test_load_leaves_feature_rows_undecoded(tmp_path):
+    wisdom = WisdomGraph(storage="compact")
+    for i in range(20):
+        wisdom.add_perception_node(f"p{i}", {"score": i}, level=1)
+        wisdom.add_planning_node(f"t{i}", {"type": "task", "subtasks": [f"s{i % 4}"]}, level=2)
+        wisdom.add_action_node(f"a{i}", {"skill": f"photo_{i}"}, reward=0.1, level=1)
+    wisdom.save(str(tmp_path / "wisdom.bin"))
+
+    loaded = WisdomGraph.load(str(tmp_path / "wisdom.bin"))
+
+    for space_type in SpaceType:
+        graph = getattr(loaded, f"{space_type.value}_graph")
+        assert pending_rows(graph) == len(graph)
+
+    planning = loaded.planning_graph
+    assert [node.id for node in planning.nodes_for_subtask("s1")] == ["t1", "t5", "t9", "t13", "t17"]
+    keywords = support_keywords({"skill": "photo_3"}) - support_keywords({"skill": "photo_4"})
+    assert [node.id for node in loaded.action_graph.nodes_matching_keywords(keywords)] == ["a3"]
+    assert pending_rows(loaded.perception_graph) == 20
+
+
+def test_lazy_indexes_follow_updates_after_load(tmp_path):
+    wisdom = WisdomGraph(storage="compact")
+    wisdom.add_planning_node("t0", {"type": "task", "subtasks": ["shoot"]}, level=2)
+    wisdom.save(str(tmp_path / "wisdom.bin"))
+
+    loaded = WisdomGraph.load(str(tmp_path / "wisdom.bin"))
+    loaded.update_node_features(SpaceType.PLANNING, "t0", {"subtasks": ["edit"]})
+    loaded.add_planning_node("t1", {"type": "task", "subtasks": ["shoot"]}, level=2)
+
+    assert [node.id for node in loaded.planning_graph.nodes_for_subtask("shoot")] == ["t1"]
+    assert [node.id for node in loaded.planning_graph.nodes_for_subtask("edit")] == ["t0"]
@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+import pytest
+
+from agent import EducationAgent, FashionAgent
+from graph import WisdomGraph, SpaceType
+
+
+def build(storage):
+    wisdom = WisdomGraph(storage=storage)
+    rng = random.Random(0)
+    for i in range(200):
+        wisdom.add_perception_node(f"perception_{i}", {"signal": rng.random()}, level=1,
+                                   registry="market")
+        wisdom.add_planning_node(f"planning_{i}", {"efficiency": rng.random(),
+                                                   "subtasks": [f"task_{i % 7}"]}, level=2)
+        wisdom.add_reasoning_node(f"reasoning_{i}", {"belief": i},
+                                  probability=rng.random(), level=1)
+        wisdom.add_action_node(f"action_{i}", {"capability": f"support_task_{i % 5}_team"},
+                               reward=rng.random(), level=1)
+    for space_type in SpaceType:
+        prefix = space_type.value
+        for _ in range(600):
+            wisdom.add_edge_within_space(space_type, f"{prefix}_{rng.randrange(200)}",
+                                         f"{prefix}_{rng.randrange(200)}", weight=rng.random())
+    for _ in range(50):
+        wisdom.update_q_value(f"action_{rng.randrange(200)}", f"action_{rng.randrange(200)}", 1.0)
+    wisdom.remove_nodes(SpaceType.PLANNING, [f"planning_{i}" for i in range(0, 200, 3)])
+    return wisdom
+
+
+def contents(wisdom):
+    spaces = {}
+    for space_type in SpaceType:
+        graph = getattr(wisdom, f"{space_type.value}_graph")
+        nodes = {node_id: (dict(data.features), data.level, data.reward, data.probability)
+                 for node_id, data in graph.nodes(data="data")}
+        edges = sorted((u, v, round(d["weight"], 12)) for u, v, d in graph.edges(data=True))
+        spaces[space_type] = (list(graph), nodes, edges)
+    return spaces
+
+
+def test_compact_storage_matches_networkx():
+    networkx, compact = build("networkx"), build("compact")
+    assert contents(compact) == contents(networkx)
+
+    for task in ("task_2", "task_3"):
+        assert ([node.id for node in compact.planning_graph.nodes_for_subtask(task)] ==
+                [node.id for node in networkx.planning_graph.nodes_for_subtask(task)])
+    keywords = {"task", "3"}
+    assert ([node.id for node in compact.action_graph.nodes_matching_keywords(keywords)] ==
+            [node.id for node in networkx.action_graph.nodes_matching_keywords(keywords)])
+    thresholds = {SpaceType.PERCEPTION: 0.3, SpaceType.PLANNING: 0.4,
+                  SpaceType.REASONING: 0.5, SpaceType.ACTION: 0.2}
+    assert compact.prune(thresholds) == networkx.prune(thresholds)
+    assert contents(compact) == contents(networkx)
+
+
+@pytest.mark.parametrize("agent_class", [FashionAgent, EducationAgent])
+def test_agents_build_the_same_graph_on_both_backends(agent_class):
+    compact = agent_class(storage="compact", shared_wisdom=False).wisdom
+    networkx = agent_class(storage="networkx", shared_wisdom=False).wisdom
+    assert contents(compact) == contents(networkx)
+    assert (compact.perception_graph.gather_insights() ==
+            networkx.perception_graph.gather_insights())
+
+
+def test_column_and_feature_list_do_not_alias_the_index():
+    space = build("compact").perception_graph
+    node_ids, values = space.column("reward")
+    _, features = space.feature_list()
+
+    with pytest.raises(AttributeError):
+        node_ids.append("intruder")
+    with pytest.raises(TypeError):
+        features[0] = {}
+    assert sorted(node_ids) == sorted(space)
+
+    # The values are a live view of the column by contract
+    values[0] = 5.0
+    assert space.nodes[node_ids[0]]["data"].reward == 5.0
+    assert np.array_equal(space.column("reward")[1], values)
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from graph import WisdomGraph, SpaceType
+from traversal import CrossSpaceIndex
+
+PATH = [SpaceType.PERCEPTION, SpaceType.PLANNING, SpaceType.REASONING, SpaceType.ACTION]
+PREFIX = {SpaceType.PERCEPTION: "p", SpaceType.PLANNING: "t",
+          SpaceType.REASONING: "r", SpaceType.ACTION: "a"}
+
+
+def brute_force(wisdom, source_id, path, reverse=False):
+    edges = wisdom.cross_space_edges
+    hops = list(zip(path, path[1:]))
+    if reverse:
+        hops = [(target, source) for source, target in reversed(hops)]
+    frontier = {source_id}
+    for here, there in hops:
+        reached = set()
+        for node_id in frontier:
+            if reverse:
+                for source, _, data in edges.in_edges(node_id, data=True):
+                    if (data["target_space"], data["source_space"]) == (here, there):
+                        reached.add(source)
+            else:
+                for _, target, data in edges.out_edges(node_id, data=True):
+                    if (data["source_space"], data["target_space"]) == (here, there):
+                        reached.add(target)
+        frontier = reached
+    return frozenset(frontier)
+
+
+def add_random_edges(wisdom, rng, count, size=60):
+    for _ in range(count):
+        hop = rng.randrange(3)
+        source_space, target_space = PATH[hop], PATH[hop + 1]
+        if rng.random() < 0.1:
+            source_space, target_space = rng.sample(PATH, 2)
+        wisdom.add_cross_space_edge(
+            f"{PREFIX[source_space]}{rng.randrange(size)}",
+            f"{PREFIX[target_space]}{rng.randrange(size)}", source_space, target_space)
+
+
+def check(wisdom, sources, path, reverse=False):
+    assert wisdom.reachable_many(sources, path, reverse) == {
+        source: brute_force(wisdom, source, path, reverse) for source in sources}
+
+
+def test_walks_match_brute_force():
+    wisdom = WisdomGraph()
+    add_random_edges(wisdom, random.Random(0), 400)
+    perception = [f"p{i}" for i in range(60)] + ["missing"]
+    actions = [f"a{i}" for i in range(60)]
+
+    check(wisdom, perception, PATH)
+    check(wisdom, actions, PATH, reverse=True)
+    check(wisdom, perception, PATH[:2])
+    assert wisdom.reachable("p0", PATH) == brute_force(wisdom, "p0", PATH)
+    assert wisdom.reachable("missing", PATH) == frozenset()
+
+
+def test_cache_follows_edge_changes():
+    wisdom = WisdomGraph()
+    rng = random.Random(1)
+    add_random_edges(wisdom, rng, 300)
+    sources = [f"p{i}" for i in range(60)]
+    check(wisdom, sources, PATH)
+    index = wisdom.cross_space_index()
+    version = index.version
+
+    add_random_edges(wisdom, rng, 50)
+    assert index.version > version
+    check(wisdom, sources, PATH)
+
+    for source, target in list(wisdom.cross_space_edges.edges())[:40]:
+        wisdom.remove_cross_space_edge(source, target)
+    check(wisdom, sources, PATH)
+
+    # Re-typing an edge moves it to the other space pair
+    source, target = next(iter(wisdom.cross_space_edges.edges()))
+    wisdom.add_cross_space_edge(source, target, SpaceType.PERCEPTION, SpaceType.ACTION)
+    check(wisdom, [source], [SpaceType.PERCEPTION, SpaceType.ACTION])
+    assert wisdom.cross_space_index() is index
+
+
+def test_node_removal_drops_cross_space_edges_in_place():
+    wisdom = WisdomGraph()
+    for node_id in ("t1", "t2"):
+        wisdom.add_planning_node(node_id, {"efficiency": 1.0}, level=1)
+    wisdom.add_cross_space_edge("p1", "t1", SpaceType.PERCEPTION, SpaceType.PLANNING)
+    wisdom.add_cross_space_edge("p1", "t2", SpaceType.PERCEPTION, SpaceType.PLANNING)
+    index = wisdom.cross_space_index()
+    assert wisdom.reachable("p1", PATH[:2]) == {"t1", "t2"}
+
+    wisdom.remove_nodes(SpaceType.PLANNING, ["t1"])
+
+    assert wisdom.cross_space_index() is index
+    assert wisdom.reachable("p1", PATH[:2]) == {"t2"}
+    assert wisdom.reachable("t2", PATH[:2], reverse=True) == {"p1"}
+
+
+def test_direct_edits_need_an_explicit_invalidation_and_forks_are_isolated():
+    wisdom = WisdomGraph()
+    wisdom.add_cross_space_edge("p1", "t1", SpaceType.PERCEPTION, SpaceType.PLANNING)
+    assert wisdom.reachable("p1", PATH[:2]) == {"t1"}
+
+    wisdom.cross_space_edges.add_edge("p1", "t2", source_space=SpaceType.PERCEPTION,
+                                      target_space=SpaceType.PLANNING)
+    wisdom.invalidate_cross_space_index()
+    assert wisdom.reachable("p1", PATH[:2]) == {"t1", "t2"}
+
+    fork = wisdom.fork()
+    fork.add_cross_space_edge("p1", "t3", SpaceType.PERCEPTION, SpaceType.PLANNING)
+    assert fork.reachable("p1", PATH[:2]) == {"t1", "t2", "t3"}
+    assert wisdom.reachable("p1", PATH[:2]) == {"t1", "t2"}
+
+
+def test_index_on_its_own():
+    index = CrossSpaceIndex.from_edges([("x", "y", "A", "B"), ("y", "z", "B", "C")])
+    assert len(index) == 2 and index.has_edge("x", "y")
+    assert index.neighbors("x", "A", "B") == {"y"}
+    assert index.reachable("z", ("A", "B", "C"), reverse=True) == {"x"}
+    index.remove_edge("y", "z")
+    assert index.pairs() == [("A", "B")]
+    with pytest.raises(ValueError, match="at least two spaces"):
+        index.reachable("x", ("A",))
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from vision import as_image_batch, color_histograms
+
+
+def test_integer_lists_are_narrowed_to_uint8():
+    pixels = [[[0, 128, 255], [255, 255, 255]]]
+    batch = as_image_batch(pixels)
+
+    assert batch.dtype == np.uint8
+    assert np.array_equal(color_histograms(batch),
+                          color_histograms(np.asarray(pixels, dtype=np.uint8)[None]))
+
+
+@pytest.mark.parametrize("image", [
+    np.full((2, 2, 3), 1000, dtype=np.uint16),
+    np.full((2, 2, 3), -1, dtype=np.int64),
+])
+def test_out_of_range_integer_images_are_rejected(image):
+    with pytest.raises(ValueError, match="0-255"):
+        as_image_batch(image)
@@ -0,0 +1,93 @@
+from pathlib import Path
+import asyncio
+
+import numpy as np
+import pytest
+
+from agent import EducationAgent, FashionAgent
+from env import FashionRoomEnv
+from runlog import strategy_size
+from workflow import STRATEGY_SECTIONS, AsyncPhaseRunner, PhaseExecutor, aload_image
+
+
+def product_cycle():
+    seller, photographer = FashionAgent(), FashionAgent()
+    return [
+        {"phase": "product_selection", "lead": seller, "supporters": [photographer],
+         "tasks": ["market_research", "trend_analysis"]},
+        {"phase": "content_creation", "lead": photographer, "supporters": [seller],
+         "tasks": ["photo_shooting"], "depends_on": ["product_selection"]},
+    ]
+
+
+def check_results(results):
+    assert set(results) == {"product_selection", "content_creation"}
+    for result in results.values():
+        assert {"market", "trends", "customer_needs", "environment"} <= set(result["perception"])
+        main_plan = result["plans"]["main_plan"]
+        assert set(main_plan) == set(STRATEGY_SECTIONS)
+        assert set(main_plan["objectives"]) <= {
+            "market_research", "trend_analysis", "photo_shooting"}
+        # Walking every leaf builds every section
+        assert strategy_size(main_plan) > 0
+        assert result["timing"]["wall_time"] >= result["timing"]["planning"]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_phase_executor_runs_with_its_defaults(executor):
+    with PhaseExecutor(max_workers=2, executor=executor) as phase_executor:
+        check_results(phase_executor.run(product_cycle(), FashionRoomEnv()))
+
+
+def test_async_phase_runner_runs_with_its_defaults():
+    check_results(asyncio.run(AsyncPhaseRunner().run(product_cycle(), FashionRoomEnv())))
+
+
+def test_perception_only_stages():
+    results = asyncio.run(AsyncPhaseRunner(stages=["perception"]).run(
+        product_cycle(), FashionRoomEnv()))
+    assert all("plans" not in result for result in results.values())
+    with pytest.raises(ValueError, match="Unknown stage"):
+        PhaseExecutor(stages=["reasoning"])
+
+
+def test_aload_image_reads_arrays_and_rejects_unknown_formats(tmp_path):
+    image = np.zeros((4, 4, 3), dtype=np.uint8)
+    np.save(tmp_path / "look.npy", image)
+    (tmp_path / "look.txt").write_text("not an image")
+
+    assert np.array_equal(asyncio.run(aload_image(tmp_path / "look.npy")), image)
+    with pytest.raises(ValueError):
+        asyncio.run(aload_image(str(tmp_path / "look.txt")))
+
+
+def test_aload_image_decodes_showcase_images():
+    pytest.importorskip("PIL")
+    showcase = Path(__file__).resolve().parent.parent / "showcase" / "1.png"
+    image = asyncio.run(aload_image(showcase))
+
+    assert image.ndim == 3 and image.shape[-1] == 3 and image.dtype == np.uint8
+
+
+def test_aprocess_fashion_item_updates_vision_perception():
+    agent = FashionAgent()
+    image = np.full((8, 8, 3), 200, dtype=np.uint8)
+
+    features = asyncio.run(agent.aprocess_fashion_item(image))
+
+    assert set(features) == {"vision_colors", "vision_patterns", "vision_style"}
+    assert features["vision_colors"]["images"] == 1
+
+
+def test_afacilitate_learning_updates_tracked_metrics():
+    agent = EducationAgent()
+
+    async def fetch():
+        return {"students": [], "environment_metrics": {"noise_level": 0.4, "unknown": 1}}
+
+    assert asyncio.run(agent.afacilitate_learning({"students": []})) == {}
+    features = asyncio.run(agent.afacilitate_learning(fetch))
+
+    assert set(features) == {"environment_state"}
+    assert features["environment_state"]["noise_level"] == 0.4
+    assert "unknown" not in features["environment_state"]
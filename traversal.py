@@ -0,0 +1,202 @@
+"""Typed multi-hop traversal over cross-space edges.
+
+``CrossSpaceIndex`` keeps one adjacency per (source space, target space)
+pair, e.g. perception -> planning and planning -> reasoning, in both
+directions. A traversal follows a path of spaces one hop at a time, so
+"action nodes reachable from perception node X through planning and
+reasoning" is three CSR lookups rather than a scan of every edge.
+
+Batch queries walk all sources together: the frontier is a pair of
+arrays (query row, node), expanded through the CSR arrays and
+de-duplicated with one ``np.unique`` per hop. Results are cached per
+(path, direction, source) and the cache is dropped whenever an edge is
+added or removed, which also bumps ``version``.
+"""
+from typing import Dict, List, Tuple, Any, Hashable, Iterable, Sequence
+import numpy as np
+
+
+class CrossSpaceIndex:
+    """Per space-pair forward and reverse adjacency with cached reachability"""
+
+    def __init__(self, cache_size: int = 65536):
+        # Spaces are any hashable labels; WisdomGraph uses SpaceType values
+        self.version = 0
+        self.cache_size = cache_size
+        self._ids: Dict[Hashable, List[str]] = {}
+        self._positions: Dict[Hashable, Dict[str, int]] = {}
+        # (source space, target space) -> ordered {(source row, target row)}
+        self._edges: Dict[Tuple[Hashable, Hashable], Dict[Tuple[int, int], None]] = {}
+        self._spaces: Dict[Tuple[str, str], Tuple[Hashable, Hashable]] = {}
+        self._csr: Dict[Tuple[Hashable, Hashable, bool], Tuple[np.ndarray, np.ndarray]] = {}
+        self._cache: Dict[Tuple, frozenset] = {}
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str, Hashable, Hashable]]) -> "CrossSpaceIndex":
+        """Bulk-build from unique ``(source, target, source space, target space)`` edges"""
+        index = cls()
+        buckets: Dict[Tuple[Hashable, Hashable], Tuple[List[str], List[str]]] = {}
+        spaces = index._spaces
+        for source_id, target_id, source_space, target_space in edges:
+            pair = (source_space, target_space)
+            bucket = buckets.get(pair)
+            if bucket is None:
+                bucket = buckets[pair] = ([], [])
+            bucket[0].append(source_id)
+            bucket[1].append(target_id)
+            spaces[(source_id, target_id)] = pair
+        for (source_space, target_space), (source_ids, target_ids) in buckets.items():
+            index._edges[(source_space, target_space)] = dict.fromkeys(zip(
+                index._positions_of(source_space, source_ids),
+                index._positions_of(target_space, target_ids)))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._spaces)
+
+    def pairs(self) -> List[Tuple[Hashable, Hashable]]:
+        """Space pairs that have at least one edge"""
+        return [pair for pair, edges in self._edges.items() if edges]
+
+    def has_edge(self, source_id: str, target_id: str) -> bool:
+        return (source_id, target_id) in self._spaces
+
+    def add_edge(self, source_id: str, target_id: str,
+                 source_space: Hashable, target_space: Hashable) -> None:
+        previous = self._spaces.get((source_id, target_id))
+        if previous == (source_space, target_space):
+            return
+        if previous is not None:
+            # Re-typed edge, as when a DiGraph edge's attributes are overwritten
+            self.remove_edge(source_id, target_id)
+        self._spaces[(source_id, target_id)] = (source_space, target_space)
+        edges = self._edges.setdefault((source_space, target_space), {})
+        edges[(self._position(source_space, source_id),
+               self._position(target_space, target_id))] = None
+        self._changed(source_space, target_space)
+
+    def remove_edge(self, source_id: str, target_id: str) -> None:
+        spaces = self._spaces.pop((source_id, target_id), None)
+        if spaces is None:
+            return
+        source_space, target_space = spaces
+        del self._edges[spaces][(self._positions[source_space][source_id],
+                                 self._positions[target_space][target_id])]
+        self._changed(source_space, target_space)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def neighbors(self, node_id: str, source_space: Hashable, target_space: Hashable,
+                  reverse: bool = False) -> frozenset:
+        """Nodes one hop away in ``target_space`` (``source_space`` with reverse)"""
+        return self.reachable(node_id, (source_space, target_space), reverse)
+
+    def reachable(self, source_id: str, path: Sequence[Hashable],
+                  reverse: bool = False) -> frozenset:
+        """Nodes in ``path[-1]`` reachable from ``source_id`` in ``path[0]``.
+
+        With ``reverse=True`` ``source_id`` lives in ``path[-1]`` and edges
+        are followed backwards, returning the nodes of ``path[0]`` that
+        reach it.
+        """
+        return self.reachable_many([source_id], path, reverse)[source_id]
+
+    def reachable_many(self, source_ids: Iterable[str], path: Sequence[Hashable],
+                       reverse: bool = False) -> Dict[str, frozenset]:
+        """``reachable`` for many sources at once"""
+        path = tuple(path)
+        if len(path) < 2:
+            raise ValueError("A traversal path needs at least two spaces")
+        results: Dict[str, frozenset] = {}
+        misses = []
+        for source_id in dict.fromkeys(source_ids):
+            cached = self._cache.get((path, reverse, source_id))
+            if cached is None:
+                misses.append(source_id)
+            else:
+                results[source_id] = cached
+        if misses:
+            for source_id, reached in zip(misses, self._walk(misses, path, reverse)):
+                results[source_id] = reached
+                if len(self._cache) >= self.cache_size:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[(path, reverse, source_id)] = reached
+        return results
+
+    def _walk(self, source_ids: List[str], path: Tuple, reverse: bool) -> List[frozenset]:
+        hops = list(zip(path, path[1:]))
+        if reverse:
+            hops = [(target, source) for source, target in reversed(hops)]
+        start = hops[0][0]
+        positions = self._positions.get(start, {})
+        rows = np.fromiter((positions.get(source_id, -1) for source_id in source_ids),
+                           dtype=np.int64, count=len(source_ids))
+        owners = np.flatnonzero(rows >= 0)
+        nodes = rows[owners]
+        for here, there in hops:
+            indptr, indices = self._adjacency(here, there, reverse)
+            starts, ends = indptr[nodes], indptr[nodes + 1]
+            lengths = ends - starts
+            offsets = np.repeat(ends - lengths.cumsum(), lengths)
+            nodes = indices[offsets + np.arange(lengths.sum())]
+            owners = np.repeat(owners, lengths)
+            # One (query, node) pair per reached node
+            width = max(len(self._ids.get(there, ())), 1)
+            keys = np.unique(owners * width + nodes)
+            owners, nodes = keys // width, keys % width
+        end_ids = self._ids.get(hops[-1][1], [])
+        bounds = np.searchsorted(owners, np.arange(len(source_ids) + 1))
+        node_list = nodes.tolist()
+        return [frozenset(end_ids[node] for node in node_list[bounds[i]:bounds[i + 1]])
+                for i in range(len(source_ids))]
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+    def _position(self, space: Hashable, node_id: str) -> int:
+        positions = self._positions.setdefault(space, {})
+        row = positions.get(node_id)
+        if row is None:
+            row = positions[node_id] = len(positions)
+            self._ids.setdefault(space, []).append(node_id)
+        return row
+
+    def _positions_of(self, space: Hashable, node_ids: List[str]) -> List[int]:
+        positions = self._positions.setdefault(space, {})
+        ids = self._ids.setdefault(space, [])
+        rows = []
+        for node_id in node_ids:
+            row = positions.get(node_id)
+            if row is None:
+                row = positions[node_id] = len(ids)
+                ids.append(node_id)
+            rows.append(row)
+        return rows
+
+    def _changed(self, source_space: Hashable, target_space: Hashable) -> None:
+        self.version += 1
+        self._csr.pop((source_space, target_space, False), None)
+        self._csr.pop((source_space, target_space, True), None)
+        self._cache.clear()
+
+    def _adjacency(self, here: Hashable, there: Hashable,
+                   reverse: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR rows of ``here`` pointing into ``there``, compiled on demand"""
+        pair = (there, here) if reverse else (here, there)
+        key = pair + (reverse,)
+        rows = len(self._ids.get(here, ()))
+        compiled = self._csr.get(key)
+        if compiled is None:
+            edges = np.array(list(self._edges.get(pair, ())), dtype=np.int64).reshape(-1, 2)
+            origin, destination = (edges[:, 1], edges[:, 0]) if reverse else (edges[:, 0], edges[:, 1])
+            order = np.argsort(origin, kind="stable")
+            indptr = np.zeros(rows + 1, dtype=np.int64)
+            np.cumsum(np.bincount(origin, minlength=rows), out=indptr[1:])
+            compiled = self._csr[key] = (indptr, destination[order])
+        indptr, indices = compiled
+        if len(indptr) < rows + 1:
+            # Nodes first seen through another space pair have no edges here
+            indptr = np.concatenate([indptr, np.full(rows + 1 - len(indptr), indptr[-1])])
+            compiled = self._csr[key] = (indptr, indices)
+        return compiled
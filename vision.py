@@ -0,0 +1,166 @@
+"""Vectorized visual features for batches of fashion images.
+
+Every function takes a stacked batch of shape ``(N, H, W, 3)`` (uint8 in
+0-255 or floats in 0-1) and returns one row of statistics per image, so a
+whole catalog chunk is analyzed with a handful of NumPy passes. The
+``fold_*`` helpers merge per-image statistics into the running averages
+kept on the ``vision_colors``, ``vision_patterns`` and ``vision_style``
+perception nodes.
+"""
+from typing import Dict, List, Any
+import numpy as np
+
+
+CHANNELS = ("red", "green", "blue")
+COLOR_BINS = 8
+EDGE_THRESHOLD = 0.1
+
+# ITU-R BT.601 luma weights
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def as_image_batch(images) -> np.ndarray:
+    """Return ``images`` as an ``(N, H, W, 3)`` array, adding axes as needed.
+
+    Integer images must hold 0-255 values; other integer dtypes (e.g. int64
+    from nested lists) are narrowed to uint8 and anything out of range
+    raises ValueError.
+    """
+    batch = np.asarray(images)
+    if np.issubdtype(batch.dtype, np.integer) and batch.dtype != np.uint8:
+        if batch.size and (batch.min() < 0 or batch.max() > 255):
+            raise ValueError(
+                f"Integer images must hold 0-255 values, got {batch.dtype} values in "
+                f"[{batch.min()}, {batch.max()}]; pass floats in [0, 1] instead")
+        batch = batch.astype(np.uint8)
+    if batch.ndim == 2:  # one grayscale image
+        batch = batch[None]
+    if batch.ndim == 3:
+        # Either one color image or a stack of grayscale images
+        batch = batch[None] if batch.shape[-1] == 3 else batch[..., None]
+    if batch.ndim != 4:
+        raise ValueError(f"Expected images of shape (N, H, W, 3), got {batch.shape}")
+    if batch.shape[-1] == 1:
+        batch = np.broadcast_to(batch, batch.shape[:3] + (3,))
+    if batch.shape[-1] != 3:
+        raise ValueError(f"Expected 3 color channels, got {batch.shape[-1]}")
+    return batch
+
+
+def _unit_scale(batch: np.ndarray) -> np.ndarray:
+    """Pixel values as float32 in [0, 1]; integer batches are uint8 (see as_image_batch)"""
+    if np.issubdtype(batch.dtype, np.integer):
+        return batch.astype(np.float32) / 255.0
+    return np.clip(batch.astype(np.float32, copy=False), 0.0, 1.0)
+
+
+def color_histograms(batch: np.ndarray, bins: int = COLOR_BINS) -> np.ndarray:
+    """Per-channel color histograms, ``(N, 3, bins)`` normalized per channel"""
+    count, height, width, _ = batch.shape
+    if np.issubdtype(batch.dtype, np.integer):
+        levels = (batch.astype(np.int64) * bins) >> 8
+    else:
+        levels = np.minimum((_unit_scale(batch) * bins).astype(np.int64), bins - 1)
+    # One bincount over the whole batch: offset every (image, channel) pair
+    offsets = (np.arange(count)[:, None] * 3 + np.arange(3)[None, :]) * bins
+    flat = levels.reshape(count, -1, 3) + offsets[:, None, :]
+    histograms = np.bincount(flat.ravel(), minlength=count * 3 * bins)
+    return histograms.reshape(count, 3, bins) / float(height * width)
+
+
+def _luminance(pixels: np.ndarray) -> np.ndarray:
+    return pixels @ _LUMA
+
+
+def pattern_statistics(batch: np.ndarray) -> Dict[str, np.ndarray]:
+    """Edge density, gradient strength, orientation and texture per image"""
+    luma = _luminance(_unit_scale(batch))
+    dx = np.abs(np.diff(luma, axis=2))
+    dy = np.abs(np.diff(luma, axis=1))
+    horizontal = dx.sum(axis=(1, 2))
+    vertical = dy.sum(axis=(1, 2))
+    total = horizontal + vertical
+    samples = dx[0].size + dy[0].size
+    return {
+        "edge_density": ((dx > EDGE_THRESHOLD).sum(axis=(1, 2)) +
+                         (dy > EDGE_THRESHOLD).sum(axis=(1, 2))) / max(samples, 1),
+        "gradient_strength": total / max(samples, 1),
+        # Share of gradient energy across columns: 1.0 means vertical stripes
+        "orientation": np.divide(horizontal, total, out=np.full_like(total, 0.5),
+                                 where=total > 0),
+        "texture": luma.std(axis=(1, 2)),
+    }
+
+
+def style_features(batch: np.ndarray) -> Dict[str, np.ndarray]:
+    """Brightness, saturation, contrast and warmth per image"""
+    pixels = _unit_scale(batch)
+    luma = _luminance(pixels)
+    red, green, blue = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    # Elementwise over channel planes; reducing the length-3 axis is far slower
+    high = np.maximum(np.maximum(red, green), blue)
+    low = np.minimum(np.minimum(red, green), blue)
+    saturation = np.divide(high - low, high, out=np.zeros_like(high), where=high > 0)
+    return {
+        "brightness": luma.mean(axis=(1, 2)),
+        "saturation": saturation.mean(axis=(1, 2)),
+        "contrast": luma.std(axis=(1, 2)),
+        "warmth": (red - blue).mean(axis=(1, 2)),
+    }
+
+
+def _running_mean(features: Dict[str, Any], key: str, total: np.ndarray,
+                  seen: int, added: int) -> Any:
+    previous = np.asarray(features.get(key, 0.0), dtype=np.float64)
+    return ((previous * seen + total) / (seen + added)).tolist()
+
+
+def fold_colors(features: Dict[str, Any], histograms: np.ndarray) -> Dict[str, Any]:
+    """Merge a batch of histograms into vision_colors features"""
+    seen, added = features.get("images", 0), len(histograms)
+    if not added:
+        return {}
+    histogram = _running_mean(features, "histogram", histograms.sum(axis=0), seen, added)
+    # Channel whose mass sits highest on the intensity scale
+    centers = (np.arange(histograms.shape[-1]) + 0.5) / histograms.shape[-1]
+    channel_means = np.asarray(histogram) @ centers
+    return {
+        "images": seen + added,
+        "histogram": histogram,
+        "channel_means": dict(zip(CHANNELS, channel_means.tolist())),
+        "dominant_channel": CHANNELS[int(np.argmax(channel_means))],
+    }
+
+
+def fold_statistics(features: Dict[str, Any], statistics: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Merge per-image scalar statistics into running averages"""
+    added = len(next(iter(statistics.values())))
+    if not added:
+        return {}
+    seen = features.get("images", 0)
+    folded = {"images": seen + added}
+    for key, values in statistics.items():
+        folded[key] = _running_mean(features, key, values.sum(dtype=np.float64),
+                                    seen, added)
+    return folded
+
+
+def analyze_batch(images, bins: int = COLOR_BINS) -> Dict[str, Any]:
+    """Colors, patterns and style for every image in a batch"""
+    batch = as_image_batch(images)
+    return {
+        "colors": color_histograms(batch, bins),
+        "patterns": pattern_statistics(batch),
+        "style": style_features(batch),
+    }
+
+
+def concat_analyses(analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Join per-chunk results from analyze_batch into one"""
+    return {
+        "colors": np.concatenate([item["colors"] for item in analyses]),
+        "patterns": {key: np.concatenate([item["patterns"][key] for item in analyses])
+                     for key in analyses[0]["patterns"]},
+        "style": {key: np.concatenate([item["style"][key] for item in analyses])
+                  for key in analyses[0]["style"]},
+    }
@@ -0,0 +1,312 @@
+from typing import Dict, List, Any, Awaitable, Callable, Iterable, Optional
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import asyncio
+import inspect
+import os
+import time
+
+
+STAGES = ("perception", "planning")
+
+# Suffixes aload_image decodes with Pillow; .npy arrays are read with NumPy
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".webp")
+
+# Strategy sections the planning stage builds. The trend and customer
+# adaptations and supporters' plans (create_support_plan) rely on builders
+# the planning space does not implement yet
+STRATEGY_SECTIONS = ("objectives", "resource_allocation", "timeline",
+                     "dependencies", "market_adaptation")
+
+
+def perceive(agent) -> Dict:
+    """Collect one agent's perception insights"""
+    return agent.wisdom.perception_graph.gather_insights()
+
+
+def plan_main(agent, perception_data: Dict, tasks: List[str]) -> Dict:
+    """Create the lead agent's main strategy"""
+    return agent.wisdom.planning_graph.create_strategy(
+        perception_data, tasks, include=STRATEGY_SECTIONS)
+
+
+def phase_order(phases: Iterable[Dict]) -> List[Dict]:
+    """Order phase descriptors so every phase follows its ``depends_on`` phases"""
+    phases = list(phases)
+    by_name = {phase["phase"]: phase for phase in phases}
+    for phase in phases:
+        for dependency in phase.get("depends_on", ()):
+            if dependency not in by_name:
+                raise ValueError(
+                    f"Phase {phase['phase']} depends on unknown phase {dependency}")
+
+    ordered, state = [], {}
+
+    def visit(phase):
+        name = phase["phase"]
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Circular dependency through phase {name}")
+        state[name] = "visiting"
+        for dependency in phase.get("depends_on", ()):
+            visit(by_name[dependency])
+        state[name] = "done"
+        ordered.append(phase)
+
+    for phase in phases:
+        visit(phase)
+    return ordered
+
+
+class PhaseExecutor:
+    """Run product-cycle phases with agents working concurrently.
+
+    Takes the same phase descriptors as ``team_workflow["product_cycle"]``
+    (``phase``, ``lead``, ``supporters``, ``tasks``) plus an optional
+    ``depends_on`` list of phase names. Phases without a dependency path
+    between them run at the same time. Within a phase, every agent's
+    perception runs in parallel, then the lead's strategy is planned
+    (limited to ``STRATEGY_SECTIONS``).
+
+    With ``executor="process"`` agents are pickled into worker processes, so
+    only read-only stages (perception, planning) should be run that way.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, executor: str = "thread",
+                 stages: Iterable[str] = STAGES):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.stages = tuple(stages)
+        for stage in self.stages:
+            if stage not in STAGES:
+                raise ValueError(f"Unknown stage: {stage}")
+        self.max_workers = max_workers
+        self.executor = executor
+        self._pool: Optional[Executor] = None
+
+    def __enter__(self) -> "PhaseExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @property
+    def pool(self) -> Executor:
+        # Kept alive between runs so repeated product cycles skip pool startup
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def run(self, phases: Iterable[Dict], environment) -> Dict[str, Dict]:
+        """Execute all phases and return their outputs keyed by phase name.
+
+        Each result holds ``perception``, ``plans`` (when planning runs) and
+        ``timing`` with the wall time of each stage and of the whole phase.
+        """
+        ordered = phase_order(phases)
+        if not ordered:
+            return {}
+
+        # Phase coordinators only wait on futures, so they get their own
+        # threads and never hold a worker slot
+        with ThreadPoolExecutor(max_workers=len(ordered)) as coordinators:
+            futures: Dict[str, Future] = {}
+            for phase in ordered:
+                dependencies = [futures[name]
+                                for name in phase.get("depends_on", ())]
+                futures[phase["phase"]] = coordinators.submit(
+                    self._run_phase, phase, environment, dependencies)
+            return {name: future.result() for name, future in futures.items()}
+
+    def _run_phase(self, phase: Dict, environment, dependencies: List[Future]) -> Dict:
+        for dependency in dependencies:
+            dependency.result()
+
+        result = {"phase": phase["phase"], "timing": {}}
+        phase_start = time.perf_counter()
+
+        stage_start = time.perf_counter()
+        perception_data = self._gather_perception(phase, environment)
+        result["perception"] = perception_data
+        result["timing"]["perception"] = time.perf_counter() - stage_start
+
+        if "planning" in self.stages:
+            stage_start = time.perf_counter()
+            result["plans"] = self._create_plans(phase, perception_data)
+            result["timing"]["planning"] = time.perf_counter() - stage_start
+
+        result["timing"]["wall_time"] = time.perf_counter() - phase_start
+        return result
+
+    def _gather_perception(self, phase: Dict, environment) -> Dict[str, Any]:
+        """Concurrent counterpart of gather_team_perception in play.demo.5.py"""
+        lead = self.pool.submit(perceive, phase["lead"])
+        supporters = [self.pool.submit(perceive, supporter)
+                      for supporter in phase["supporters"]]
+
+        lead_insights = lead.result()
+        perception_data = {
+            "market": lead_insights["market_insights"],
+            "trends": lead_insights["trend_insights"],
+            "customer_needs": lead_insights["customer_insights"]
+        }
+        for supporter in supporters:
+            perception_data.update(supporter.result())
+        perception_data["environment"] = environment.get_current_state()
+        return perception_data
+
+    def _create_plans(self, phase: Dict, perception_data: Dict) -> Dict[str, Any]:
+        """Concurrent counterpart of create_team_plans in play.demo.5.py.
+
+        Only the lead's main strategy is planned; supporters' plans need
+        builders that do not exist yet.
+        """
+        main_plan = self.pool.submit(
+            plan_main, phase["lead"], perception_data, phase["tasks"]).result()
+        return {"main_plan": main_plan}
+
+
+async def run_io(func: Callable, *args) -> Any:
+    """Run an I/O-bound call without blocking the event loop.
+
+    Coroutine functions are awaited directly; plain callables run in the
+    default thread pool.
+    """
+    if inspect.iscoroutinefunction(func):
+        return await func(*args)
+    result = await asyncio.to_thread(func, *args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def resolve(source: Any) -> Any:
+    """Resolve a value that may be awaitable or a zero-argument loader"""
+    if inspect.isawaitable(source):
+        return await source
+    if callable(source):
+        return await run_io(source)
+    return source
+
+
+def read_image(path: Path):
+    """Read an image file into an ``(H, W, 3)`` array (or the stored array for ``.npy``)"""
+    import numpy as np
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        return np.load(path)
+    if suffix not in IMAGE_SUFFIXES:
+        raise ValueError(f"Unsupported image format: {path.name}")
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError(f"decoding {suffix} images needs Pillow; install pillow") from None
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+async def aload_image(source: Any) -> Any:
+    """Load image data off the event loop.
+
+    Paths are decoded in a worker thread by ``read_image`` (``.npy`` with
+    NumPy, common image formats with Pillow; anything else raises
+    ValueError); awaitables and loader callables are resolved; in-memory
+    image data is returned unchanged.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return await asyncio.to_thread(read_image, Path(source))
+    return await resolve(source)
+
+
+async def aget_state(environment) -> Dict:
+    """Fetch an environment's current state without blocking the event loop"""
+    return await run_io(environment.get_current_state)
+
+
+async def run_sessions(sessions: Iterable[Awaitable], max_concurrency: Optional[int] = None) -> List[Any]:
+    """Await many agent sessions on one loop, at most ``max_concurrency`` at a time"""
+    if max_concurrency is None:
+        return await asyncio.gather(*sessions)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited(session):
+        async with semaphore:
+            return await session
+
+    return await asyncio.gather(*(limited(session) for session in sessions))
+
+
+class AsyncPhaseRunner:
+    """Asyncio counterpart of PhaseExecutor.
+
+    Takes the same phase descriptors and returns the same results, but runs
+    on the caller's event loop: graph work for each agent runs inline and
+    environment state fetches go through ``aget_state``, so many phases and
+    agent sessions can share one loop without threads per agent.
+    """
+
+    def __init__(self, stages: Iterable[str] = STAGES):
+        self.stages = tuple(stages)
+        for stage in self.stages:
+            if stage not in STAGES:
+                raise ValueError(f"Unknown stage: {stage}")
+
+    async def run(self, phases: Iterable[Dict], environment) -> Dict[str, Dict]:
+        """Execute all phases and return their outputs keyed by phase name"""
+        tasks: Dict[str, asyncio.Task] = {}
+        for phase in phase_order(phases):
+            dependencies = [tasks[name] for name in phase.get("depends_on", ())]
+            tasks[phase["phase"]] = asyncio.ensure_future(
+                self._run_phase(phase, environment, dependencies))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_phase(self, phase: Dict, environment, dependencies: List[asyncio.Task]) -> Dict:
+        for dependency in dependencies:
+            await asyncio.shield(dependency)
+
+        result = {"phase": phase["phase"], "timing": {}}
+        phase_start = time.perf_counter()
+
+        stage_start = time.perf_counter()
+        perception_data = await self._gather_perception(phase, environment)
+        result["perception"] = perception_data
+        result["timing"]["perception"] = time.perf_counter() - stage_start
+
+        if "planning" in self.stages:
+            stage_start = time.perf_counter()
+            result["plans"] = self._create_plans(phase, perception_data)
+            result["timing"]["planning"] = time.perf_counter() - stage_start
+
+        result["timing"]["wall_time"] = time.perf_counter() - phase_start
+        return result
+
+    async def _gather_perception(self, phase: Dict, environment) -> Dict[str, Any]:
+        state = asyncio.ensure_future(aget_state(environment))
+        lead_insights = perceive(phase["lead"])
+        perception_data = {
+            "market": lead_insights["market_insights"],
+            "trends": lead_insights["trend_insights"],
+            "customer_needs": lead_insights["customer_insights"]
+        }
+        for supporter in phase["supporters"]:
+            perception_data.update(perceive(supporter))
+        perception_data["environment"] = await state
+        return perception_data
+
+    def _create_plans(self, phase: Dict, perception_data: Dict) -> Dict[str, Any]:
+        return {"main_plan": plan_main(phase["lead"], perception_data, phase["tasks"])}